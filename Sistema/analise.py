@@ -0,0 +1,96 @@
+import numpy as np
+
+try:
+    from Sistema.sorteios import contar_bits, mascara_de_numeros
+except ImportError:
+    from sorteios import contar_bits, mascara_de_numeros
+
+# Motor vetorizado de padrões por grupo (sem dependência do Streamlit)
+
+NOMES_GRUPOS = ['melhores_g1', 'melhores_g2', 'melhores_g3', 'piores_g1', 'piores_g2']
+COLUNAS_PADROES = ['concurso'] + NOMES_GRUPOS + ['total_melhores', 'total_piores']
+
+def ranking_por_frequencia(contagens):
+    """Números do mais ao menos sorteado (empate: menor número primeiro)"""
+    return np.argsort(-np.asarray(contagens, dtype=np.int64), kind='stable') + 1
+
+def dividir_grupos(numeros_ordenados):
+    """Divide o ranking em 3 grupos de melhores e 2 de piores (5 números cada)"""
+    numeros = [int(num) for num in numeros_ordenados]
+    grupos_melhores = [numeros[0:5], numeros[5:10], numeros[10:15]]
+    grupos_piores = [numeros[15:20], numeros[20:25]]
+    return grupos_melhores, grupos_piores
+
+def matriz_grupos(grupos_melhores, grupos_piores):
+    """Matriz 25 x 5 de pertinência: linha = número, coluna = grupo G1..G5"""
+    matriz = np.zeros((25, 5), dtype=np.uint8)
+    for j, grupo in enumerate(list(grupos_melhores) + list(grupos_piores)):
+        matriz[np.asarray(grupo, dtype=np.int64) - 1, j] = 1
+    return matriz
+
+def contar_grupos(mascaras, grupos):
+    """Matriz N x 5 (uint8) com quantos números de cada grupo há em cada máscara
+
+    Equivale a incidencia @ matriz_grupos(...), mas é calculado com
+    AND + popcount sobre as máscaras, sem materializar a matriz N x 25.
+    """
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    contagens = np.empty((len(mascaras), len(grupos)), dtype=np.uint8)
+    for j, grupo in enumerate(grupos):
+        contagens[:, j] = contar_bits(mascaras & mascara_de_numeros(grupo))
+    return contagens
+
+def padroes_de_contagens(concursos, contagens):
+    """Monta o dicionário de arrays de padrões a partir da matriz N x 5"""
+    padroes = {'concurso': concursos}
+    for j, nome in enumerate(NOMES_GRUPOS):
+        padroes[nome] = contagens[:, j]
+    padroes['total_melhores'] = contagens[:, :3].sum(axis=1, dtype=np.uint8)
+    padroes['total_piores'] = contagens[:, 3:].sum(axis=1, dtype=np.uint8)
+    return padroes
+
+def calcular_padroes(base, grupos_melhores, grupos_piores):
+    """Conta quantos números de cada grupo saíram em cada concurso da base
+
+    Retorna um dicionário de arrays (uint8 para as contagens).
+    """
+    grupos = list(grupos_melhores) + list(grupos_piores)
+    return padroes_de_contagens(base.concursos, contar_grupos(base.mascaras, grupos))
+
+def padroes_para_lista(padroes):
+    """Converte os arrays de padrões na lista de dicionários usada pelas tabelas"""
+    valores = [padroes[coluna].tolist() for coluna in COLUNAS_PADROES]
+    rotulos = {}
+    chaves = COLUNAS_PADROES + ['distribuicao']
+    lista = []
+    for linha in zip(*valores):
+        total = linha[-2:]
+        if total not in rotulos:
+            rotulos[total] = f"{total[0]}m x {total[1]}p"
+        lista.append(dict(zip(chaves, linha + (rotulos[total],))))
+    return lista
+
+def alvos_por_distribuicao(total_melhores, total_piores=None):
+    """Quantidade de números de cada grupo (G1, G2, G3, P1, P2) para uma distribuição M x P"""
+    m_count = int(total_melhores)
+    p_count = 15 - m_count if total_piores is None else int(total_piores)
+
+    # Distribuição inteligente baseada na experiência
+    if m_count == 10 and p_count == 5:
+        return (4, 3, 3, 3, 2)  # 10M x 5P: distribuição mais comum
+    elif m_count == 9 and p_count == 6:
+        return (3, 3, 3, 3, 3)  # 9M x 6P: distribuição equilibrada
+    elif m_count == 8 and p_count == 7:
+        return (3, 3, 2, 4, 3)  # 8M x 7P: mais números dos piores
+    elif m_count == 11 and p_count == 4:
+        return (4, 4, 3, 2, 2)  # 11M x 4P: mais números dos melhores
+    elif m_count == 7 and p_count == 8:
+        return (3, 2, 2, 4, 4)  # 7M x 8P: predominância dos piores
+    # Distribuição genérica para outros casos
+    return (
+        max(1, min(5, (m_count + 1) // 3)),
+        max(1, min(5, m_count // 3)),
+        max(1, min(5, m_count - ((m_count + 1) // 3) - (m_count // 3))),
+        max(1, min(5, (p_count + 1) // 2)),
+        max(1, min(5, p_count - ((p_count + 1) // 2)))
+    )
@@ -0,0 +1,263 @@
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    from Sistema.sorteios import COLUNAS, COLUNAS_BOLAS, FORMATO_DATA
+    from Sistema.validacao import converter_datas
+except ImportError:
+    from sorteios import COLUNAS, COLUNAS_BOLAS, FORMATO_DATA
+    from validacao import converter_datas
+
+# Armazenamento do histórico (sem dependência do Streamlit).
+# LOTOFACIL_FORMATO=parquet (padrão) guarda os dados em Parquet ao lado do CSV;
+# LOTOFACIL_FORMATO=csv mantém o CSV como arquivo principal.
+# Concursos avulsos vão para um diário só de acréscimo (lotofacil.diario.csv),
+# mesclado na leitura e compactado no arquivo principal em segundo plano
+# (ao passar de LOTOFACIL_LIMITE_DIARIO bytes) ou sob demanda.
+#
+# Fonte da verdade: arquivo principal + diário. No modo Parquet, o CSV
+# versionado (dados/lotofacil.csv) é a exportação do Parquet: é regravado a
+# cada gravação do arquivo principal (salvar, compactação), antes do Parquet,
+# e só fica atrás dele pelos concursos ainda no diário. O CSV continua sendo o
+# formato de importação: se ficar mais novo que o Parquet (upload, edição
+# manual), é migrado de novo.
+
+CSV_PATH = 'dados/lotofacil.csv'
+FORMATO = os.environ.get('LOTOFACIL_FORMATO', 'parquet').strip().lower()
+LIMITE_DIARIO_BYTES = int(os.environ.get('LOTOFACIL_LIMITE_DIARIO', 64 * 1024))
+
+_trava_compactacao = threading.Lock()
+
+def usa_parquet():
+    return FORMATO == 'parquet' and pq is not None
+
+def caminho_parquet(csv_path=CSV_PATH):
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+def substituir_atomico(destino, escrever):
+    """Escreve em arquivo temporário e troca pelo destino com os.replace"""
+    pasta = os.path.dirname(destino)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    temporario = f"{destino}.tmp"
+    try:
+        escrever(temporario)
+        os.replace(temporario, destino)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def caminho_diario(csv_path=CSV_PATH):
+    return os.path.splitext(csv_path)[0] + '.diario.csv'
+
+def caminhos_diario(csv_path=CSV_PATH):
+    """Diário em compactação (se houver) seguido do diário corrente"""
+    return [caminho_diario(csv_path) + '.compactando', caminho_diario(csv_path)]
+
+def existe_dados(csv_path=CSV_PATH):
+    return (os.path.exists(csv_path)
+            or (usa_parquet() and os.path.exists(caminho_parquet(csv_path)))
+            or any(os.path.exists(caminho) for caminho in caminhos_diario(csv_path)))
+
+def caminhos_derivados(csv_path=CSV_PATH):
+    """Arquivos calculados a partir dos dados: retrato binário, estado das análises e quarentenas"""
+    # Importação local: esses módulos importam o armazenamento
+    try:
+        from Sistema import binario, estado, validacao
+    except ImportError:
+        import binario
+        import estado
+        import validacao
+    return [binario.caminho_binario(csv_path), estado.caminho_estado(csv_path),
+            validacao.caminho_quarentena(csv_path), validacao.caminho_quarentena(csv_path, 'upload')]
+
+def remover_dados(csv_path=CSV_PATH):
+    """Remove os dados e tudo o que foi calculado a partir deles"""
+    for caminho in ([csv_path, caminho_parquet(csv_path)] + caminhos_diario(csv_path)
+                    + caminhos_derivados(csv_path)):
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+# ---------------------------- CSV ----------------------------
+
+def ler_csv(origem):
+    return pd.read_csv(origem, sep=';', encoding='utf-8')
+
+def escrever_csv(df, destino):
+    """CSV com ; no formato do arquivo versionado (UTF-8 com BOM, linhas CRLF, datas DD/MM/AAAA)"""
+    if df.empty:
+        df = pd.DataFrame(columns=COLUNAS)
+    elif 'Data Sorteio' in df.columns and pd.api.types.is_datetime64_any_dtype(df['Data Sorteio']):
+        df = df.assign(**{'Data Sorteio': df['Data Sorteio'].dt.strftime(FORMATO_DATA)})
+    substituir_atomico(destino, lambda tmp: df.to_csv(tmp, sep=';', index=False, encoding='utf-8-sig',
+                                                      lineterminator='\r\n'))
+
+# ---------------------------- Parquet ----------------------------
+
+def tabela_arrow(df):
+    """Converte o DataFrame do CSV em tabela Arrow tipada (uint8 + date32)"""
+    colunas = {'Concurso': pa.array(pd.to_numeric(df.get('Concurso'), errors='coerce'),
+                                    type=pa.int32(), from_pandas=True)}
+    if 'Data Sorteio' in df.columns:
+        datas = converter_datas(df['Data Sorteio'])
+    else:
+        datas = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[D]')
+    colunas['Data Sorteio'] = pa.array(datas, type=pa.date32(), from_pandas=True)
+    for coluna in COLUNAS_BOLAS:
+        valores = pd.to_numeric(df[coluna], errors='coerce') if coluna in df.columns else pd.Series(np.nan, index=df.index)
+        valores = valores.where((valores >= 0) & (valores <= 255))
+        colunas[coluna] = pa.array(valores, type=pa.uint8(), from_pandas=True)
+    return pa.table(colunas)
+
+def escrever_parquet(df, destino):
+    tabela = tabela_arrow(df if not df.empty else pd.DataFrame(columns=COLUNAS))
+    substituir_atomico(destino, lambda tmp: pq.write_table(tabela, tmp, compression='zstd'))
+
+def ler_parquet(origem, formatar_datas=True):
+    """Lê o Parquet; com formatar_datas a data volta como texto DD/MM/AAAA"""
+    df = pq.read_table(origem).to_pandas(date_as_object=False)
+    if formatar_datas:
+        df['Data Sorteio'] = df['Data Sorteio'].dt.strftime(FORMATO_DATA)
+    return df
+
+def migrar_csv(csv_path=CSV_PATH):
+    """Gera o Parquet a partir do CSV quando ele não existe ou está desatualizado"""
+    destino = caminho_parquet(csv_path)
+    if not os.path.exists(csv_path):
+        return False
+    if os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(csv_path):
+        return False
+    escrever_parquet(ler_csv(csv_path), destino)
+    return True
+
+# ---------------------------- Diário de acréscimos ----------------------------
+
+def ler_diario(caminhos):
+    """Lê os diários indicados; linha final incompleta (escrita interrompida) é ignorada"""
+    partes = []
+    for caminho in caminhos:
+        if not os.path.exists(caminho):
+            continue
+        with open(caminho, encoding='utf-8') as f:
+            texto = f.read()
+        texto = texto[:texto.rfind('\n') + 1]
+        if texto:
+            partes.append(pd.read_csv(io.StringIO(texto), sep=';', header=None, names=COLUNAS,
+                                      on_bad_lines='skip'))
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS)
+    # Linhas truncadas por escrita interrompida ficam sem algum campo
+    diario = pd.concat(partes, ignore_index=True).dropna(subset=COLUNAS)
+    return diario.astype({coluna: 'int64' for coluna in ['Concurso'] + COLUNAS_BOLAS})
+
+def mesclar_diario(df, diario):
+    """Junta o diário ao histórico; em concurso repetido vale o registro do diário"""
+    if diario.empty:
+        return df
+    df = pd.concat([df, diario], ignore_index=True) if not df.empty else diario
+    df = df.drop_duplicates('Concurso', keep='last')
+    return df.sort_values('Concurso').reset_index(drop=True)
+
+def _acrescentar_diario(texto, csv_path=CSV_PATH):
+    """Uma única escrita (com fsync) de linhas já formatadas no fim do diário"""
+    caminho = caminho_diario(csv_path)
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    fd = os.open(caminho, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        # Sobra de escrita interrompida: começa em linha nova para não emendar
+        tamanho = os.fstat(fd).st_size
+        if tamanho and os.pread(fd, 1, tamanho - 1) != b'\n':
+            texto = '\n' + texto
+        dados = memoryview(texto.encode('utf-8'))
+        while dados:
+            dados = dados[os.write(fd, dados):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    compactar_se_necessario(csv_path)
+
+def anexar(registro, csv_path=CSV_PATH):
+    """Acrescenta um concurso ao diário: uma única escrita, sem reler o histórico"""
+    _acrescentar_diario(';'.join(str(registro.get(coluna, '')) for coluna in COLUNAS) + '\n', csv_path)
+
+def anexar_lote(df, csv_path=CSV_PATH):
+    """Acrescenta vários concursos (DataFrame nas colunas do arquivo) ao diário em uma única escrita"""
+    if df.empty:
+        return
+    _acrescentar_diario(df[COLUNAS].to_csv(sep=';', header=False, index=False, lineterminator='\n'), csv_path)
+
+def compactar(csv_path=CSV_PATH):
+    """Incorpora o diário ao arquivo principal e o descarta"""
+    with _trava_compactacao:
+        diario, compactando = caminho_diario(csv_path), caminho_diario(csv_path) + '.compactando'
+        # Novos acréscimos passam a ir para um diário novo durante a compactação
+        if os.path.exists(diario) and not os.path.exists(compactando):
+            os.replace(diario, compactando)
+        if not os.path.exists(compactando):
+            return False
+        df = mesclar_diario(carregar_principal(csv_path), ler_diario([compactando]))
+        salvar_principal(df, csv_path)
+        os.remove(compactando)
+        return True
+
+def compactar_se_necessario(csv_path=CSV_PATH):
+    """Dispara a compactação em segundo plano quando o diário passa do limite"""
+    caminho = caminho_diario(csv_path)
+    if (os.path.exists(caminho) and os.path.getsize(caminho) >= LIMITE_DIARIO_BYTES
+            and not _trava_compactacao.locked()):
+        threading.Thread(target=compactar, args=(csv_path,), daemon=True).start()
+
+def tamanho_diario(csv_path=CSV_PATH):
+    """Quantidade de concursos ainda não compactados"""
+    return len(ler_diario(caminhos_diario(csv_path)))
+
+# ---------------------------- Interface única ----------------------------
+
+def carregar_principal(csv_path=CSV_PATH, formatar_datas=True):
+    """Lê só o arquivo principal (Parquet ou CSV), sem o diário"""
+    if usa_parquet():
+        migrar_csv(csv_path)
+        destino = caminho_parquet(csv_path)
+        if os.path.exists(destino):
+            return ler_parquet(destino, formatar_datas)
+        return pd.DataFrame()
+    if os.path.exists(csv_path):
+        return ler_csv(csv_path)
+    return pd.DataFrame()
+
+def salvar_principal(df, csv_path=CSV_PATH):
+    if usa_parquet():
+        # CSV primeiro: com mtime anterior ao do Parquet, a exportação não dispara nova migração
+        escrever_csv(df, csv_path)
+        escrever_parquet(df, caminho_parquet(csv_path))
+    else:
+        escrever_csv(df, csv_path)
+
+def carregar(csv_path=CSV_PATH, formatar_datas=True):
+    """Carrega o histórico do armazenamento configurado, já com o diário mesclado"""
+    df = carregar_principal(csv_path, formatar_datas)
+    diario = ler_diario(caminhos_diario(csv_path))
+    if not diario.empty and not formatar_datas:
+        diario['Data Sorteio'] = pd.to_datetime(diario['Data Sorteio'], format=FORMATO_DATA, errors='coerce')
+    return mesclar_diario(df, diario)
+
+def salvar(df, csv_path=CSV_PATH):
+    """Salva o histórico completo no armazenamento configurado (o diário é descartado)"""
+    with _trava_compactacao:
+        salvar_principal(df, csv_path)
+        for caminho in caminhos_diario(csv_path):
+            if os.path.exists(caminho):
+                os.remove(caminho)
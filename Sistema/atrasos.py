@@ -0,0 +1,150 @@
+import numpy as np
+
+try:
+    from Sistema.sorteios import DESLOCAMENTOS
+except ImportError:
+    from sorteios import DESLOCAMENTOS
+
+# Índice de atrasos por número (sem dependência do Streamlit).
+# Atraso = quantidade de concursos seguidos sem o número. Para cada número o
+# índice guarda a última aparição, o maior atraso já encerrado e o histograma
+# dos atrasos encerrados (coluna g = quantas ausências de g concursos).
+# A cada PASSO concursos fica um ponto de controle com esse estado, então a
+# situação "como era no concurso t" parte do ponto anterior e processa no
+# máximo PASSO - 1 concursos, sem varrer o histórico. Posições são índices
+# (0 = primeiro concurso da base ordenada).
+
+PASSO = 1024
+
+def incidencia_booleana(mascaras):
+    return ((np.asarray(mascaras, dtype=np.uint32)[:, None] >> DESLOCAMENTOS) & 1).astype(bool)
+
+def _larguras(histograma, largura):
+    """Alarga o histograma (última dimensão) para `largura` colunas"""
+    if histograma.shape[-1] >= largura:
+        return histograma
+    extra = [(0, 0)] * (histograma.ndim - 1) + [(0, largura - histograma.shape[-1])]
+    return np.pad(histograma, extra)
+
+def _avancar(mascaras, inicio, ultimo, maximo, histograma, pontos=()):
+    """Processa os concursos [inicio, inicio + len(mascaras)) a partir do estado dado
+
+    Devolve o novo estado (ultimo, maximo, histograma) e, para cada posição de
+    `pontos` (dentro do trecho, espaçadas de PASSO), o estado antes daquela posição.
+    """
+    incidencia = incidencia_booleana(mascaras)
+    pontos = np.asarray(pontos, dtype=np.int64)
+    ultimo, maximo = ultimo.copy(), maximo.copy()
+    eventos = []
+    largura = histograma.shape[-1]
+    pontos_ultimo = np.empty((len(pontos), 25), dtype=np.int64)
+    pontos_maximo = np.empty((len(pontos), 25), dtype=np.int64)
+    for j in range(25):
+        posicoes = np.flatnonzero(incidencia[:, j]) + inicio
+        anteriores = np.concatenate(([ultimo[j]], posicoes))[:-1]
+        atrasos = posicoes - anteriores - 1
+        validos = anteriores >= 0  # a primeira aparição não encerra um atraso conhecido
+        atrasos = np.where(validos, atrasos, 0)
+        maximos = np.maximum.accumulate(np.maximum(atrasos, maximo[j]))
+
+        # Estado em cada ponto de controle: aparições anteriores ao ponto
+        pontos_ultimo[:, j], pontos_maximo[:, j] = ultimo[j], maximo[j]
+        if len(posicoes):
+            k = np.searchsorted(posicoes, pontos)
+            anterior = np.maximum(k - 1, 0)
+            pontos_ultimo[:, j] = np.where(k > 0, posicoes[anterior], ultimo[j])
+            pontos_maximo[:, j] = np.where(k > 0, maximos[anterior], maximo[j])
+            ultimo[j] = posicoes[-1]
+            maximo[j] = maximos[-1]
+        eventos.append((posicoes[validos], atrasos[validos]))
+        if validos.any():
+            largura = max(largura, int(atrasos[validos].max()) + 1)
+
+    # Histograma acumulado: cada atraso conta a partir do primeiro ponto depois dele
+    base = _larguras(histograma, largura)
+    # Pontos espaçados de PASSO: quantos pontos há até cada posição sai por divisão
+    if len(pontos):
+        depois = [np.clip((posicoes - pontos[0]) // PASSO + 1, 0, len(pontos)) for posicoes, _ in eventos]
+    else:
+        depois = [np.zeros(len(posicoes), dtype=np.int64) for posicoes, _ in eventos]
+    indices = [(ponto * 25 + j) * largura + atrasos for j, (ponto, (_, atrasos)) in enumerate(zip(depois, eventos))]
+    grade = np.bincount(np.concatenate(indices), minlength=(len(pontos) + 1) * 25 * largura)
+    grade = np.cumsum(grade.reshape(len(pontos) + 1, 25, largura), axis=0) + base
+    return ultimo, maximo, grade[-1], (pontos_ultimo, pontos_maximo, grade[:-1])
+
+class IndiceAtrasos:
+    """Atrasos dos `n` primeiros concursos de um histórico, com pontos de controle"""
+
+    __slots__ = ('n', 'ultimo', 'maximo', 'histograma', 'pontos_ultimo', 'pontos_maximo', 'pontos_histograma')
+
+    def __init__(self):
+        self.n = 0
+        self.ultimo = np.full(25, -1, dtype=np.int64)
+        self.maximo = np.zeros(25, dtype=np.int64)
+        self.histograma = np.zeros((25, 1), dtype=np.int64)
+        # Ponto k = estado antes do concurso k * PASSO (o ponto 0 é o estado vazio)
+        self.pontos_ultimo = self.ultimo[None].copy()
+        self.pontos_maximo = self.maximo[None].copy()
+        self.pontos_histograma = self.histograma[None].copy()
+
+    @classmethod
+    def de_mascaras(cls, mascaras):
+        indice = cls()
+        indice.acrescentar(mascaras)
+        return indice
+
+    def acrescentar(self, mascaras):
+        """Incorpora novos concursos em uma passada vetorizada (O(novos))"""
+        mascaras = np.asarray(mascaras, dtype=np.uint32)
+        if len(mascaras) == 0:
+            return
+        inicio, fim = self.n, self.n + len(mascaras)
+        # Pontos que caem dentro do trecho novo (o de `inicio` já existe)
+        pontos = np.arange((inicio // PASSO + 1) * PASSO, fim + 1, PASSO)
+        self.ultimo, self.maximo, self.histograma, (p_ultimo, p_maximo, p_histograma) = _avancar(
+            mascaras, inicio, self.ultimo, self.maximo, self.histograma, pontos)
+        self.n = fim
+        if len(pontos):
+            largura = self.histograma.shape[1]
+            self.pontos_ultimo = np.concatenate([self.pontos_ultimo, p_ultimo])
+            self.pontos_maximo = np.concatenate([self.pontos_maximo, p_maximo])
+            self.pontos_histograma = np.concatenate([_larguras(self.pontos_histograma, largura),
+                                                     _larguras(p_histograma, largura)])
+
+    def situacao(self, mascaras, posicao=None):
+        """Estado logo após o concurso da `posicao` (None = último)
+
+        `mascaras` são as do histórico indexado (ao menos até a posição).
+        Devolve dicionário de arrays de 25 posições: ultimo (índice da última
+        aparição, -1 se nunca saiu), atraso (atual), maximo (inclui o atraso
+        atual) e histograma (25 x largura, só atrasos encerrados).
+        """
+        if posicao is None or posicao >= self.n - 1:
+            ultimo, maximo, histograma, fim = self.ultimo, self.maximo, self.histograma, self.n
+        else:
+            fim = max(int(posicao), -1) + 1
+            k = fim // PASSO
+            ultimo, maximo, histograma = self.pontos_ultimo[k], self.pontos_maximo[k], self.pontos_histograma[k]
+            if fim > k * PASSO:
+                ultimo, maximo, histograma, _ = _avancar(mascaras[k * PASSO:fim], k * PASSO, ultimo, maximo,
+                                                         histograma)
+        atraso = np.where(ultimo >= 0, fim - 1 - ultimo, fim)
+        return {'ultimo': ultimo, 'atraso': atraso, 'maximo': np.maximum(maximo, atraso), 'histograma': histograma}
+
+    def salvar_em(self, dados):
+        """Acrescenta os arrays do índice ao dicionário (para np.savez)"""
+        dados.update({'atrasos_n': np.array(self.n), 'atrasos_ultimo': self.ultimo, 'atrasos_maximo': self.maximo,
+                      'atrasos_histograma': self.histograma, 'atrasos_pontos_ultimo': self.pontos_ultimo,
+                      'atrasos_pontos_maximo': self.pontos_maximo,
+                      'atrasos_pontos_histograma': self.pontos_histograma})
+
+    @classmethod
+    def carregar_de(cls, dados):
+        """Índice gravado por salvar_em (None se o arquivo não tiver)"""
+        if 'atrasos_n' not in dados.files:
+            return None
+        indice = cls()
+        indice.n = int(dados['atrasos_n'])
+        for nome in ('ultimo', 'maximo', 'histograma', 'pontos_ultimo', 'pontos_maximo', 'pontos_histograma'):
+            setattr(indice, nome, dados[f'atrasos_{nome}'].astype(np.int64))
+        return indice
@@ -0,0 +1,178 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from Sistema.analise import alvos_por_distribuicao, contar_grupos, dividir_grupos, ranking_por_frequencia
+    from Sistema.janelas import rotulo_distribuicao
+    from Sistema.lotes import gerar_lote
+    from Sistema.sorteios import (COLUNAS_BOLAS, contar_bits, incidencia_de_mascaras, mascaras_de_bolas,
+                                  numeros_de_mascara)
+except ImportError:
+    from analise import alvos_por_distribuicao, contar_grupos, dividir_grupos, ranking_por_frequencia
+    from janelas import rotulo_distribuicao
+    from lotes import gerar_lote
+    from sorteios import COLUNAS_BOLAS, contar_bits, incidencia_de_mascaras, mascaras_de_bolas, numeros_de_mascara
+
+# Conferência de jogos contra o histórico (sem dependência do Streamlit).
+# Acertos de um jogo num concurso = popcount(jogo AND sorteio); um lote de jogos
+# contra todos os concursos vira uma matriz jogos x concursos processada em blocos,
+# para a memória não crescer com o produto das duas dimensões.
+
+FAIXAS_PREMIO = [11, 12, 13, 14, 15]
+ELEMENTOS_POR_BLOCO = 1 << 20  # pares jogo x concurso por bloco (cabe no cache)
+
+def matriz_acertos(jogos, mascaras):
+    """Matriz jogos x concursos (uint8) com a quantidade de acertos"""
+    jogos = np.asarray(jogos, dtype=np.uint32)
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    return contar_bits(jogos[:, None] & mascaras[None, :]).astype(np.uint8, copy=False)
+
+def conferir(jogos, mascaras, faixas=FAIXAS_PREMIO):
+    """Confere cada jogo contra todos os concursos
+
+    Devolve (contagens jogos x faixas, máximo de acertos por jogo, soma de acertos por jogo).
+    """
+    jogos = np.asarray(jogos, dtype=np.uint32)
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    contagens = np.zeros((len(jogos), len(faixas)), dtype=np.int32)
+    maximo = np.zeros(len(jogos), dtype=np.uint8)
+    bloco = max(1, ELEMENTOS_POR_BLOCO // max(1, len(mascaras)))
+    for inicio in range(0, len(jogos) if len(mascaras) else 0, bloco):
+        acertos = matriz_acertos(jogos[inicio:inicio + bloco], mascaras)
+        fim = inicio + len(acertos)
+        maximo[inicio:fim] = acertos.max(axis=1)
+        for i, faixa in enumerate(faixas):
+            contagens[inicio:fim, i] = (acertos == faixa).sum(axis=1, dtype=np.int32)
+
+    # Soma dos acertos sem a matriz: cada número do jogo conta a sua frequência
+    frequencia = incidencia_de_mascaras(mascaras).sum(axis=0, dtype=np.int64)
+    soma = incidencia_de_mascaras(jogos) @ frequencia
+    return contagens, maximo, soma
+
+def resumo_acertos(jogos, mascaras):
+    """DataFrame com uma linha por jogo: faixas de 11 a 15 pontos, máximo e média"""
+    import pandas as pd
+
+    jogos = np.asarray(jogos, dtype=np.uint32)
+    contagens, maximo, soma = conferir(jogos, mascaras)
+    resumo = pd.DataFrame({'Jogo': [" - ".join(f"{num:02d}" for num in numeros_de_mascara(m)) for m in jogos]})
+    for i, faixa in enumerate(FAIXAS_PREMIO):
+        resumo[f'{faixa} pts'] = contagens[:, i]
+    resumo['Premiações'] = contagens.sum(axis=1)
+    resumo['Máximo'] = maximo
+    resumo['Média'] = soma / max(1, len(mascaras))
+    return resumo
+
+def jogos_de_dataframe(df):
+    """Máscaras dos jogos de um arquivo (colunas Bola1..Bola15 ou as 15 primeiras numéricas)
+
+    Devolve (máscaras, linhas descartadas); só valem linhas com 15 números distintos de 1 a 25.
+    """
+    import pandas as pd
+
+    if all(coluna in df.columns for coluna in COLUNAS_BOLAS):
+        colunas = COLUNAS_BOLAS
+    else:
+        colunas = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c]) and df[c].between(1, 25).all()][:15]
+    if len(colunas) < 15:
+        return np.empty(0, dtype=np.uint32), len(df)
+    bolas = df[colunas].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    validas = np.isfinite(bolas).all(axis=1) & ((bolas >= 1) & (bolas <= 25)).all(axis=1)
+    mascaras = mascaras_de_bolas(bolas[validas].astype(np.uint8))
+    distintas = contar_bits(mascaras) == 15
+    return mascaras[distintas], int(len(df) - distintas.sum())
+
+# ---------------------------- Avaliação walk-forward ----------------------------
+# Em cada concurso t, o ranking, os grupos e as distribuições mais comuns são
+# recalculados só com os concursos anteriores a t; os jogos gerados são
+# conferidos contra o concurso t. Referências: jogos uniformes ('aleatorio') e
+# jogos sorteados com peso pela frequência até t ('frequencia'). A semente de
+# cada t é (semente, t), então o resultado não depende da divisão em processos.
+
+ESTRATEGIAS = {
+    'grupos': 'Grupos (top distribuições)',
+    'aleatorio': 'Aleatório uniforme',
+    'frequencia': 'Ponderado pela frequência',
+}
+
+def jogos_ponderados(pesos, k, rng):
+    """k jogos de 15 números sem reposição, com probabilidade proporcional aos pesos (Gumbel top-k)"""
+    pesos = np.maximum(np.asarray(pesos, dtype=np.float64), 1e-12)
+    chaves = np.log(pesos) - np.log(-np.log(rng.random((k, 25))))
+    escolhidos = np.argpartition(-chaves, 14, axis=1)[:, :15].astype(np.uint32)
+    return np.bitwise_or.reduce(np.uint32(1) << escolhidos, axis=1)
+
+def jogos_por_grupos(anteriores, contagens, k, janela, top_k, rng):
+    """Jogos da estratégia de grupos usando só os concursos anteriores"""
+    grupos_melhores, grupos_piores = dividir_grupos(ranking_por_frequencia(contagens))
+    recentes = anteriores[-janela:] if janela else anteriores
+    totais = contar_grupos(recentes, grupos_melhores).sum(axis=1)
+    ocorrencias = np.bincount(totais, minlength=16)
+    distribuicoes = [(rotulo_distribuicao(m), alvos_por_distribuicao(m), ocorrencias[m])
+                     for m in np.argsort(-ocorrencias, kind='stable')[:top_k] if ocorrencias[m]]
+    # Semente inteira tirada do gerador de t: o lote registra uma semente reprodutível
+    return gerar_lote(grupos_melhores + grupos_piores, distribuicoes, k, int(rng.integers(1 << 32))).mascaras
+
+def avaliar_trecho(mascaras, concursos_t, jogos_por_concurso, janela, top_k, semente):
+    """Histograma de acertos (0 a 15) de cada estratégia nos concursos t indicados"""
+    resultados = {nome: np.zeros(16, dtype=np.int64) for nome in ESTRATEGIAS}
+    if len(concursos_t) == 0:
+        return resultados
+    anterior = int(concursos_t[0])
+    contagens = incidencia_de_mascaras(mascaras[:anterior]).sum(axis=0, dtype=np.int64)
+    for t in concursos_t:
+        t = int(t)
+        contagens += incidencia_de_mascaras(mascaras[anterior:t]).sum(axis=0, dtype=np.int64)
+        anterior = t
+        rng = np.random.default_rng([semente, t])
+        jogos = {
+            'grupos': jogos_por_grupos(mascaras[:t], contagens, jogos_por_concurso, janela, top_k, rng),
+            'aleatorio': jogos_ponderados(np.ones(25), jogos_por_concurso, rng),
+            'frequencia': jogos_ponderados(contagens, jogos_por_concurso, rng),
+        }
+        for nome, mascaras_jogos in jogos.items():
+            resultados[nome] += np.bincount(contar_bits(mascaras_jogos & mascaras[t]), minlength=16)
+    return resultados
+
+def avaliar_walk_forward(mascaras, inicio=100, passo=1, jogos_por_concurso=6, janela=2000, top_k=3,
+                         semente=None, processos=None):
+    """Avalia as estratégias em todos os concursos a partir de `inicio` (mascaras em ordem cronológica)
+
+    Os concursos são divididos em trechos processados em paralelo (ProcessPoolExecutor).
+    Devolve (histogramas por estratégia, semente usada).
+    """
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    if semente is None:
+        semente = int(np.random.SeedSequence().entropy % (1 << 32))
+    concursos_t = np.arange(max(1, int(inicio)), len(mascaras), max(1, int(passo)))
+    processos = processos or os.cpu_count() or 1
+    argumentos = (jogos_por_concurso, janela, top_k, semente)
+
+    if processos == 1 or len(concursos_t) < 64:
+        return avaliar_trecho(mascaras, concursos_t, *argumentos), semente
+
+    trechos = np.array_split(concursos_t, processos * 4)
+    total = {nome: np.zeros(16, dtype=np.int64) for nome in ESTRATEGIAS}
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [executor.submit(avaliar_trecho, mascaras, trecho, *argumentos) for trecho in trechos]
+        for futuro in futuros:
+            for nome, histograma in futuro.result().items():
+                total[nome] += histograma
+    return total, semente
+
+def resumo_walk_forward(resultados):
+    """Uma linha por estratégia: jogos conferidos, média de acertos e faixas de 11 a 15"""
+    import pandas as pd
+
+    linhas = []
+    for nome, histograma in resultados.items():
+        jogos = int(histograma.sum())
+        linha = {'Estratégia': ESTRATEGIAS.get(nome, nome), 'Jogos': jogos,
+                 'Média de Acertos': float((histograma * np.arange(16)).sum() / max(1, jogos))}
+        for faixa in FAIXAS_PREMIO:
+            linha[f'{faixa} pts'] = int(histograma[faixa])
+        linha['Premiados (%)'] = 100.0 * histograma[FAIXAS_PREMIO].sum() / max(1, jogos)
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
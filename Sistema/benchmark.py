@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    from Sistema import armazenamento, binario, exportacao, nucleo, paginacao, sintetico, validacao
+    from Sistema.atrasos import IndiceAtrasos
+    from Sistema.coocorrencia import Coocorrencia
+    from Sistema.estado import EstadoAnalise
+    from Sistema.janelas import SomasAcumuladas
+except ImportError:
+    import armazenamento
+    import binario
+    import exportacao
+    import nucleo
+    import paginacao
+    import sintetico
+    import validacao
+    from atrasos import IndiceAtrasos
+    from coocorrencia import Coocorrencia
+    from estado import EstadoAnalise
+    from janelas import SomasAcumuladas
+
+# Benchmarks das etapas da análise em históricos de tamanhos diferentes.
+#
+#   python -m Sistema.benchmark                       # real, 100 mil e 1 milhão de concursos
+#   python -m Sistema.benchmark --tamanhos real,100000 --salvar-base
+#   python -m Sistema.benchmark --comparar            # compara com a base salva
+#
+# Cada etapa reproduz o caminho da tela correspondente sem o Streamlit. O tempo
+# é o menor de N repetições; o pico de memória vem de uma execução extra sob
+# tracemalloc (alocações do Python e do numpy/pandas; buffers internos do
+# pyarrow ficam de fora).
+
+CAMINHO_BASE = 'dados/benchmark_base.json'
+TAMANHOS_PADRAO = ['real', '100000', '1000000']
+TOLERANCIA = 1.25  # acima de 25% mais lento = regressão
+LINHAS_POR_PAGINA = 10
+
+# ---------------------------- Etapas ----------------------------
+# Cada etapa recebe o contexto (dicionário) e devolve o valor guardado nele com
+# o próprio nome, para ser usado pelas etapas seguintes.
+
+def etapa_carregar_dados(contexto):
+    """carregar_dados: leitura do armazenamento com datas formatadas (tela Ver Dados)"""
+    return armazenamento.carregar(contexto['csv_path'])
+
+def etapa_validacao(contexto):
+    """Validação vetorizada de todas as linhas lidas (mesmo caminho do upload e da carga)"""
+    return validacao.validar(contexto['carregar_dados'])
+
+def etapa_base(contexto):
+    """Base compacta ordenada como no início de exibir_jogo (retrato binário via memmap)"""
+    return binario.carregar_base(contexto['csv_path'])
+
+def etapa_analisar_distribuicao_grupos(contexto):
+    return nucleo.analisar_distribuicao_grupos(contexto['base'])
+
+def etapa_analisar_padrao_concursos(contexto):
+    grupos_melhores, grupos_piores, _ = contexto['analisar_distribuicao_grupos']
+    return nucleo.analisar_padrao_concursos(contexto['base'], grupos_melhores, grupos_piores)
+
+def etapa_somas(contexto):
+    """Estado incremental e somas acumuladas a partir do zero"""
+    return SomasAcumuladas.de_estado(EstadoAnalise.de_base(contexto['base']))
+
+def etapa_coocorrencia(contexto):
+    """Pares e trios recalculados do zero"""
+    return Coocorrencia.de_mascaras(contexto['base'].mascaras)
+
+def etapa_atrasos(contexto):
+    """Índice de atrasos do zero e uma consulta no meio do histórico"""
+    mascaras = contexto['base'].mascaras
+    indice = IndiceAtrasos.de_mascaras(mascaras)
+    indice.situacao(mascaras, len(mascaras) // 2)
+    return indice
+
+def etapa_calcular_media_ultimos(contexto):
+    return nucleo.calcular_media_ultimos(contexto['somas'], 2000)
+
+def etapa_gerar_sugestoes_inteligentes(contexto):
+    grupos_melhores, grupos_piores, _ = contexto['analisar_distribuicao_grupos']
+    return nucleo.gerar_sugestoes(grupos_melhores, grupos_piores, contexto['somas'], 2000, semente=0)
+
+def etapa_visao_dados(contexto):
+    """Índice por concurso e por data da tela Ver Dados (uma vez por versão dos dados)"""
+    return paginacao.VisaoPaginada(contexto['carregar_dados'])
+
+def etapa_exibir_dados_loto(contexto):
+    """Troca de página: filtro do slider, ordem por data e formatação só da página"""
+    visao = contexto['visao_dados']
+    inicio, fim = visao.limites_concursos()
+    posicoes = visao.filtrar(inicio, fim, 'data', True)
+    return paginacao.formatar_compacto(visao.pagina(posicoes, 2, LINHAS_POR_PAGINA))
+
+def etapa_filtro_datas(contexto):
+    """Intervalo de datas (metade final do período) em ordem de concurso: busca binária e fatia"""
+    visao = contexto['visao_dados']
+    primeira, ultima = visao.limites_datas()
+    posicoes = visao.filtrar(data_inicio=primeira + (ultima - primeira) / 2, data_fim=ultima)
+    return paginacao.formatar_compacto(visao.pagina(posicoes, 1, LINHAS_POR_PAGINA))
+
+def etapa_exportar_csv(contexto):
+    """Arquivo do botão 'Baixar Todos os Dados' (gerado só no clique)"""
+    return exportacao.serializar(contexto['carregar_dados'], 'csv')
+
+def etapa_exportar_parquet(contexto):
+    """Mesmo arquivo em Parquet"""
+    if armazenamento.pq is None:
+        return None
+    return exportacao.serializar(contexto['carregar_dados'], 'parquet')
+
+ETAPAS = [
+    ('carregar_dados', etapa_carregar_dados),
+    ('validacao', etapa_validacao),
+    ('base', etapa_base),
+    ('analisar_distribuicao_grupos', etapa_analisar_distribuicao_grupos),
+    ('analisar_padrao_concursos', etapa_analisar_padrao_concursos),
+    ('somas', etapa_somas),
+    ('coocorrencia', etapa_coocorrencia),
+    ('atrasos', etapa_atrasos),
+    ('calcular_media_ultimos', etapa_calcular_media_ultimos),
+    ('gerar_sugestoes_inteligentes', etapa_gerar_sugestoes_inteligentes),
+    ('visao_dados', etapa_visao_dados),
+    ('exibir_dados_loto', etapa_exibir_dados_loto),
+    ('filtro_datas', etapa_filtro_datas),
+    ('exportar_csv', etapa_exportar_csv),
+    ('exportar_parquet', etapa_exportar_parquet),
+]
+
+# ---------------------------- Medição ----------------------------
+
+def medir(funcao, contexto, repeticoes=3):
+    """(resultado, menor tempo em segundos, pico de memória em bytes)"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(contexto)
+        tempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    try:
+        funcao(contexto)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, min(tempos), pico
+
+def preparar_historico(tamanho, pasta, semente=0):
+    """Caminho do CSV a usar: o histórico real ou um sintético gravado na pasta"""
+    if tamanho == 'real':
+        return armazenamento.CSV_PATH
+    csv_path = os.path.join(pasta, f"sintetico_{tamanho}", 'lotofacil.csv')
+    # Concursos uniformes, gravados direto no formato do armazenamento
+    destino = armazenamento.caminho_parquet(csv_path) if armazenamento.usa_parquet() else csv_path
+    sintetico.escrever(destino, int(tamanho), semente, mistura=None)
+    return csv_path
+
+def executar_tamanho(tamanho, pasta, repeticoes=3, semente=0, etapas=None, progresso=None):
+    """Mede todas as etapas em um tamanho de histórico; devolve lista de medições"""
+    contexto = {'csv_path': preparar_historico(tamanho, pasta, semente)}
+    medicoes = []
+    for nome, funcao in ETAPAS:
+        resultado, segundos, pico = medir(funcao, contexto, repeticoes)
+        contexto[nome] = resultado
+        if etapas and nome not in etapas:
+            continue
+        medicao = {'tamanho': tamanho, 'concursos': len(contexto['carregar_dados']), 'etapa': nome,
+                   'segundos': segundos, 'pico_mb': pico / 2 ** 20}
+        medicoes.append(medicao)
+        if progresso:
+            progresso(medicao)
+    return medicoes
+
+# ---------------------------- Base de comparação ----------------------------
+
+def ambiente():
+    import pandas as pd
+
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'maquina': platform.machine(), 'cpus': os.cpu_count(), 'formato': armazenamento.FORMATO}
+
+def salvar_base(medicoes, caminho=CAMINHO_BASE):
+    documento = {'data': time.strftime('%Y-%m-%d %H:%M:%S'), 'ambiente': ambiente(), 'medicoes': medicoes}
+
+    def escrever(temporario):
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(documento, f, ensure_ascii=False, indent=1)
+
+    armazenamento.substituir_atomico(caminho, escrever)
+
+def carregar_base(caminho=CAMINHO_BASE):
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+def comparar(medicoes, base, tolerancia=TOLERANCIA):
+    """Acrescenta a razão atual/base em cada medição; devolve as regressões"""
+    anteriores = {(m['tamanho'], m['etapa']): m for m in base['medicoes']}
+    regressoes = []
+    for medicao in medicoes:
+        anterior = anteriores.get((medicao['tamanho'], medicao['etapa']))
+        if not anterior or anterior['segundos'] <= 0:
+            continue
+        medicao['razao'] = medicao['segundos'] / anterior['segundos']
+        # Abaixo de 1 ms a variação é ruído
+        if medicao['razao'] > tolerancia and medicao['segundos'] > 1e-3:
+            regressoes.append(medicao)
+    return regressoes
+
+def formatar_linha(medicao):
+    linha = (f"{medicao['tamanho']:>8} {medicao['concursos']:>9} {medicao['etapa']:<30} "
+             f"{medicao['segundos'] * 1000:>10.1f} ms {medicao['pico_mb']:>9.1f} MB")
+    if 'razao' in medicao:
+        linha += f"  x{medicao['razao']:.2f}"
+    return linha
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='python -m Sistema.benchmark',
+                                     description='Tempo e pico de memória das etapas da análise')
+    parser.add_argument('--tamanhos', default=','.join(TAMANHOS_PADRAO),
+                        help='"real" e/ou quantidades de concursos sintéticos, separados por vírgula')
+    parser.add_argument('--etapas', default=None, help='só estas etapas (separadas por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=0, help='semente dos históricos sintéticos')
+    parser.add_argument('--base', default=CAMINHO_BASE, help=f'arquivo da base de comparação ({CAMINHO_BASE})')
+    parser.add_argument('--salvar-base', action='store_true', help='grava as medições como nova base')
+    parser.add_argument('--comparar', action='store_true', help='compara com a base e sai com erro se houver regressão')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA)
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    tamanhos = [t.strip() for t in args.tamanhos.split(',') if t.strip()]
+    etapas = [e.strip() for e in args.etapas.split(',')] if args.etapas else None
+    desconhecidas = set(etapas or []) - {nome for nome, _ in ETAPAS}
+    if desconhecidas:
+        raise SystemExit(f"Etapas desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    print(f"{'tamanho':>8} {'concursos':>9} {'etapa':<30} {'tempo':>13} {'pico':>12}")
+    pasta = tempfile.mkdtemp(prefix='lotofacil_bench_')
+    medicoes = []
+    try:
+        for tamanho in tamanhos:
+            medicoes += executar_tamanho(tamanho, pasta, args.repeticoes, args.semente, etapas,
+                                         lambda m: print(formatar_linha(m), flush=True))
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    regressoes = []
+    if args.comparar:
+        base = carregar_base(args.base)
+        if base is None:
+            print(f"\nSem base de comparação em {args.base} (use --salvar-base)")
+        else:
+            regressoes = comparar(medicoes, base, args.tolerancia)
+            print(f"\nComparação com a base de {base['data']}:")
+            for medicao in medicoes:
+                print(formatar_linha(medicao))
+            if regressoes:
+                print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia:.2f}x:")
+                for medicao in regressoes:
+                    print(formatar_linha(medicao))
+    if args.salvar_base:
+        salvar_base(medicoes, args.base)
+        print(f"\nBase salva em {args.base}")
+    return 1 if regressoes else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import os
+
+import numpy as np
+
+try:
+    from Sistema import armazenamento, cache, validacao
+    from Sistema.sorteios import BaseSorteios
+except ImportError:
+    import armazenamento
+    import cache
+    import validacao
+    from sorteios import BaseSorteios
+
+# Retrato binário do histórico (lotofacil.bin, sem dependência do Streamlit).
+# Cabeçalho de 64 bytes + um registro de 12 bytes por concurso (concurso int32,
+# data em dias desde 1970 int32, máscara de 25 bits uint32), em ordem de
+# concurso: o histórico real cabe em ~40 KB. A leitura usa np.memmap, então
+# sessões e processos compartilham as mesmas páginas do sistema operacional.
+# O cabeçalho guarda a versão dos dados (cache.versao_dados) de onde o retrato
+# saiu; se o armazenamento mudar por outro caminho, o retrato é refeito na
+# próxima leitura. A regravação é atômica (arquivo temporário + os.replace); o
+# acréscimo de concursos novos escreve só os registros no fim do arquivo e
+# depois o cabeçalho, então custa o mesmo com qualquer tamanho de histórico.
+# Uma falha entre as duas escritas deixa o tamanho em desacordo com o
+# cabeçalho, e o retrato é refeito na próxima leitura.
+# Só entram linhas aprovadas por validacao.validar; as recusadas ficam no
+# relatório de quarentena (lotofacil.quarentena.csv).
+
+ASSINATURA = b'LOTOFBIN'
+VERSAO_FORMATO = 1
+TAMANHO_CABECALHO = 64
+TIPO_CABECALHO = np.dtype([('assinatura', 'S8'), ('formato', '<u2'), ('tamanho_registro', '<u2'),
+                           ('quantidade', '<u4'), ('versao_dados', 'S48')])
+TIPO_REGISTRO = np.dtype([('concurso', '<i4'), ('dias', '<i4'), ('mascara', '<u4')])
+DATA_AUSENTE = np.iinfo(np.int32).min
+
+def caminho_binario(csv_path=armazenamento.CSV_PATH):
+    return os.path.splitext(csv_path)[0] + '.bin'
+
+def registros_de_base(base):
+    """Array estruturado (TIPO_REGISTRO) da base, em ordem de concurso"""
+    base = base.ordenar()
+    registros = np.empty(len(base), dtype=TIPO_REGISTRO)
+    registros['concurso'] = base.concursos
+    dias = base.datas.astype(np.int64)
+    registros['dias'] = np.where(np.isnat(base.datas), DATA_AUSENTE, dias)
+    registros['mascara'] = base.mascaras
+    return registros
+
+def cabecalho_bytes(quantidade, versao_dados=''):
+    """Os TAMANHO_CABECALHO bytes do cabeçalho"""
+    cabecalho = np.zeros(1, dtype=TIPO_CABECALHO)
+    cabecalho['assinatura'] = ASSINATURA
+    cabecalho['formato'] = VERSAO_FORMATO
+    cabecalho['tamanho_registro'] = TIPO_REGISTRO.itemsize
+    cabecalho['quantidade'] = quantidade
+    cabecalho['versao_dados'] = versao_dados.encode('ascii')
+    return cabecalho.tobytes().ljust(TAMANHO_CABECALHO, b'\0')
+
+def escrever(registros, caminho, versao_dados=''):
+    def gravar(temporario):
+        with open(temporario, 'wb') as f:
+            f.write(cabecalho_bytes(len(registros), versao_dados))
+            f.write(np.ascontiguousarray(registros, dtype=TIPO_REGISTRO).tobytes())
+
+    armazenamento.substituir_atomico(caminho, gravar)
+
+def ler_cabecalho(caminho):
+    """Cabeçalho como dicionário (None se o arquivo não existir ou não for um retrato válido)"""
+    try:
+        with open(caminho, 'rb') as f:
+            bruto = f.read(TAMANHO_CABECALHO)
+    except OSError:
+        return None
+    if len(bruto) < TAMANHO_CABECALHO:
+        return None
+    cabecalho = np.frombuffer(bruto[:TIPO_CABECALHO.itemsize], dtype=TIPO_CABECALHO)[0]
+    if (cabecalho['assinatura'] != ASSINATURA or cabecalho['formato'] != VERSAO_FORMATO
+            or cabecalho['tamanho_registro'] != TIPO_REGISTRO.itemsize):
+        return None
+    tamanho_esperado = TAMANHO_CABECALHO + int(cabecalho['quantidade']) * TIPO_REGISTRO.itemsize
+    if os.path.getsize(caminho) != tamanho_esperado:
+        return None
+    return {'quantidade': int(cabecalho['quantidade']), 'versao_dados': cabecalho['versao_dados'].decode('ascii')}
+
+def mapear(caminho):
+    """Registros do retrato via np.memmap somente leitura (None se inválido)"""
+    cabecalho = ler_cabecalho(caminho)
+    if cabecalho is None:
+        return None, None
+    if cabecalho['quantidade'] == 0:
+        return cabecalho, np.empty(0, dtype=TIPO_REGISTRO)
+    registros = np.memmap(caminho, dtype=TIPO_REGISTRO, mode='r', offset=TAMANHO_CABECALHO,
+                          shape=(cabecalho['quantidade'],))
+    return cabecalho, registros
+
+def base_de_registros(registros):
+    """BaseSorteios sobre os registros: concursos e máscaras são vistas do memmap"""
+    dias = registros['dias']
+    datas = np.where(dias == DATA_AUSENTE, np.datetime64('NaT'), dias.astype('datetime64[D]'))
+    return BaseSorteios(registros['concurso'], datas, registros['mascara'])
+
+def gravar_base(base, csv_path=armazenamento.CSV_PATH, versao_dados=None):
+    """Reescreve o retrato a partir da base (versão atual do armazenamento por padrão)"""
+    if versao_dados is None:
+        versao_dados = cache.versao_dados(csv_path)
+    escrever(registros_de_base(base), caminho_binario(csv_path), versao_dados)
+
+def base_validada(df, csv_path=armazenamento.CSV_PATH):
+    """Base só com as linhas válidas do DataFrame; as recusadas vão para o relatório de quarentena"""
+    resultado = validacao.validar(df)
+    try:
+        validacao.gravar_quarentena(resultado, validacao.caminho_quarentena(csv_path))
+    except OSError:
+        pass
+    return resultado.base()
+
+def gravar_dataframe(df, csv_path=armazenamento.CSV_PATH):
+    """Retrato do DataFrame recém-salvo (chamado por salvar_dados)"""
+    gravar_base(base_validada(df, csv_path), csv_path)
+
+def acrescentar(novos, csv_path=armazenamento.CSV_PATH, versao_anterior=None):
+    """Acrescenta ao retrato concursos posteriores ao último, sem reler o armazenamento
+
+    Só os registros novos e o cabeçalho são escritos (E/S independente do
+    tamanho do histórico). `versao_anterior` é a versão dos dados antes do
+    acréscimo: só um retrato daquela versão é estendido. Devolve False (sem
+    gravar) se não houver retrato dessa versão ou se os novos concursos não
+    vierem depois do último.
+    """
+    caminho = caminho_binario(csv_path)
+    cabecalho = ler_cabecalho(caminho)
+    if cabecalho is None or novos.empty or cabecalho['versao_dados'] != versao_anterior:
+        return False
+    quantidade = cabecalho['quantidade']
+    novos = registros_de_base(novos)
+    with open(caminho, 'r+b') as f:
+        if quantidade:
+            f.seek(TAMANHO_CABECALHO + (quantidade - 1) * TIPO_REGISTRO.itemsize)
+            ultimo = np.frombuffer(f.read(TIPO_REGISTRO.itemsize), dtype=TIPO_REGISTRO)[0]
+            if novos['concurso'][0] <= ultimo['concurso']:
+                return False
+        f.seek(TAMANHO_CABECALHO + quantidade * TIPO_REGISTRO.itemsize)
+        f.write(novos.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+        # Cabeçalho por último: antes dele o tamanho não confere e o retrato seria refeito
+        f.seek(0)
+        f.write(cabecalho_bytes(quantidade + len(novos), cache.versao_dados(csv_path)))
+        f.flush()
+        os.fsync(f.fileno())
+    return True
+
+def carregar_base(csv_path=armazenamento.CSV_PATH, versao_dados=None):
+    """Base do histórico: lida do retrato se ele for da versão atual; senão refaz o retrato
+
+    Refazer o retrato lê o armazenamento (Parquet/CSV + diário) uma única vez
+    e valida todas as linhas nessa mesma passada.
+    """
+    if versao_dados is None:
+        versao_dados = cache.versao_dados(csv_path)
+    caminho = caminho_binario(csv_path)
+    cabecalho, registros = mapear(caminho)
+    if cabecalho is not None and cabecalho['versao_dados'] == versao_dados:
+        return base_de_registros(registros)
+
+    base = base_validada(armazenamento.carregar(csv_path, formatar_datas=False), csv_path).ordenar()
+    try:
+        gravar_base(base, csv_path, versao_dados)
+    except OSError:
+        pass
+    return base
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    from Sistema import armazenamento
+except ImportError:
+    import armazenamento
+
+# Cache em memória do histórico carregado e das análises derivadas.
+# A chave é a versão dos dados: hash do conteúdo dos arquivos de armazenamento
+# (principal + diário). O hash só é recalculado quando mtime ou tamanho mudam,
+# então uma rerun com os arquivos intactos custa apenas alguns os.stat.
+# Compartilhado por todas as sessões do processo (sem dependência do Streamlit).
+
+MAX_ENTRADAS = 64
+
+_trava = threading.Lock()
+_entradas = OrderedDict()
+_hashes = {}
+_contadores = {}
+
+def hash_arquivo(caminho):
+    """Hash do conteúdo, reaproveitado enquanto mtime e tamanho não mudarem"""
+    info = os.stat(caminho)
+    marca = (info.st_mtime_ns, info.st_size)
+    memo = _hashes.get(caminho)
+    if memo is not None and memo[0] == marca:
+        return memo[1]
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    _hashes[caminho] = (marca, h.hexdigest())
+    return h.hexdigest()
+
+def versao_dados(csv_path=armazenamento.CSV_PATH):
+    """Identificador do conteúdo atual do histórico (muda quando qualquer arquivo muda)"""
+    # Migra antes de medir, para a versão não mudar logo após a primeira carga
+    if armazenamento.usa_parquet():
+        armazenamento.migrar_csv(csv_path)
+    caminhos = [csv_path, armazenamento.caminho_parquet(csv_path)] + armazenamento.caminhos_diario(csv_path)
+    h = hashlib.blake2b(digest_size=16)
+    for caminho in caminhos:
+        if os.path.exists(caminho):
+            h.update(f"{os.path.basename(caminho)}:{hash_arquivo(caminho)};".encode())
+    return f"{armazenamento.FORMATO}-{h.hexdigest()}"
+
+def obter(nome, versao, calcular, *args, chave=()):
+    """Devolve o artefato `nome` da versão indicada, calculando-o só na primeira vez"""
+    completa = (nome, versao) + tuple(chave)
+    with _trava:
+        contador = _contadores.setdefault(nome, {'acertos': 0, 'falhas': 0})
+        if completa in _entradas:
+            _entradas.move_to_end(completa)
+            contador['acertos'] += 1
+            return _entradas[completa]
+        contador['falhas'] += 1
+
+    valor = calcular(*args)
+
+    with _trava:
+        _entradas[completa] = valor
+        while len(_entradas) > MAX_ENTRADAS:
+            _entradas.popitem(last=False)
+    return valor
+
+def invalidar():
+    """Descarta todos os artefatos (chamado após qualquer escrita nos dados)"""
+    with _trava:
+        _entradas.clear()
+        _hashes.clear()
+
+def estatisticas():
+    """Acertos e falhas por artefato, mais a quantidade de entradas em memória"""
+    with _trava:
+        return {
+            'entradas': len(_entradas),
+            'artefatos': {nome: dict(contador) for nome, contador in _contadores.items()}
+        }
@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    from Sistema import nucleo
+    from Sistema.janelas import JANELAS_PADRAO, comparar_janelas
+    from Sistema.lotes import LIMITE_LOTE, gerar_lote
+except ImportError:
+    import nucleo
+    from janelas import JANELAS_PADRAO, comparar_janelas
+    from lotes import LIMITE_LOTE, gerar_lote
+
+# Linha de comando para os jobs em lote (não inicia o Streamlit).
+#
+#   python -m Sistema.cli                                   # JSON na saída padrão
+#   python -m Sistema.cli --jogos 10000 --semente 7 --saida resultado.json
+#   python -m Sistema.cli --arquivo outro.csv --formato parquet --saida pasta_resultado
+#
+# Seções: grupos (frequência e divisão em 5 grupos), padroes (padrão por
+# concurso), janelas (médias e distribuições por janela) e sugestoes (jogos
+# repartidos entre as distribuições mais comuns, como no modo lote).
+
+SECOES = ['grupos', 'padroes', 'janelas', 'sugestoes']
+
+def carregar(arquivo):
+    """Análise do armazenamento configurado (CSV_PATH) ou de qualquer CSV/Parquet avulso"""
+    if os.path.abspath(arquivo) == os.path.abspath(nucleo.CSV_PATH):
+        return nucleo.carregar_analise(arquivo)
+
+    try:
+        from Sistema import armazenamento
+        from Sistema.sorteios import BaseSorteios
+    except ImportError:
+        import armazenamento
+        from sorteios import BaseSorteios
+    if arquivo.lower().endswith('.parquet'):
+        df = armazenamento.ler_parquet(arquivo, formatar_datas=False)
+    else:
+        df = armazenamento.ler_csv(arquivo)
+    return nucleo.analise_de_base(BaseSorteios.de_dataframe(df))
+
+def secao_grupos(analise):
+    grupos_melhores, grupos_piores = analise.grupos()
+    frequencia = analise.frequencia()
+    return {
+        'grupos_melhores': grupos_melhores,
+        'grupos_piores': grupos_piores,
+        'frequencia': {str(num): frequencia[num] for num in range(1, 26)},
+    }
+
+def secao_janelas(analise, janela):
+    janelas = JANELAS_PADRAO if janela in JANELAS_PADRAO else JANELAS_PADRAO + [janela]
+    resumo = nucleo.calcular_media_ultimos(analise.somas, janela)
+    resumo['distribuicoes_mais_comuns'] = [list(item) for item in resumo['distribuicoes_mais_comuns']]
+    return {'janela': janela, 'resumo': resumo, 'comparacao': comparar_janelas(analise.somas, janelas)}
+
+def secao_sugestoes(analise, janela, jogos, top, semente):
+    grupos_melhores, grupos_piores = analise.grupos()
+    # Peso de cada distribuição = ocorrências na janela
+    mais_comuns = nucleo.calcular_media_ultimos(analise.somas, janela)['distribuicoes_mais_comuns'][:top]
+    distribuicoes = [(dist, nucleo.calcular_distribuicao_por_grupo(dist), count) for dist, count in mais_comuns]
+    return gerar_lote(grupos_melhores + grupos_piores, distribuicoes, jogos, semente)
+
+def executar(args):
+    """Calcula as seções pedidas; devolve dicionário nome -> resultado"""
+    analise = carregar(args.arquivo)
+    if analise.empty:
+        raise SystemExit(f"Nenhum concurso válido em {args.arquivo}")
+    resultados = {}
+    if 'grupos' in args.secoes:
+        resultados['grupos'] = secao_grupos(analise)
+    if 'padroes' in args.secoes:
+        resultados['padroes'] = analise.padroes()
+    if 'janelas' in args.secoes:
+        resultados['janelas'] = secao_janelas(analise, args.janela)
+    if 'sugestoes' in args.secoes:
+        resultados['sugestoes'] = secao_sugestoes(analise, args.janela, args.jogos, args.top, args.semente)
+    return analise, resultados
+
+def para_json(analise, resultados, arquivo):
+    documento = {'arquivo': arquivo, 'concursos': len(analise.base),
+                 'ultimo_concurso': int(analise.base.concursos[-1])}
+    for nome, valor in resultados.items():
+        if nome == 'sugestoes':
+            valor = {'semente': valor.semente, 'distribuicoes': valor.resumo(), 'jogos': valor.bolas.tolist(),
+                     'origem': valor.origem.tolist()}
+        documento[nome] = valor
+    return json.dumps(documento, ensure_ascii=False, default=int)
+
+def gravar_parquet(resultados, pasta):
+    """Um arquivo Parquet por seção dentro da pasta de saída"""
+    import pandas as pd
+
+    os.makedirs(pasta, exist_ok=True)
+    tabelas = {}
+    if 'grupos' in resultados:
+        grupos = resultados['grupos']
+        linhas = []
+        for indice, grupo in enumerate(grupos['grupos_melhores'] + grupos['grupos_piores'], 1):
+            linhas += [{'numero': num, 'grupo': indice, 'frequencia': grupos['frequencia'][str(num)]} for num in grupo]
+        tabelas['grupos'] = pd.DataFrame(linhas)
+    if 'padroes' in resultados:
+        tabelas['padroes'] = pd.DataFrame(resultados['padroes'])
+    if 'janelas' in resultados:
+        tabelas['janelas'] = pd.DataFrame(resultados['janelas']['comparacao'])
+    if 'sugestoes' in resultados:
+        tabelas['sugestoes'] = resultados['sugestoes'].para_dataframe()
+    for nome, tabela in tabelas.items():
+        tabela.to_parquet(os.path.join(pasta, f"{nome}.parquet"), index=False)
+    return sorted(tabelas)
+
+def janela_arg(valor):
+    if valor.lower() in ('todos', 'todas', 'all', '0'):
+        return None
+    n = int(valor)
+    if n < 0:
+        raise argparse.ArgumentTypeError("a janela deve ser positiva")
+    return n
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='python -m Sistema.cli',
+                                     description='Análises e sugestões da Lotofácil em lote (sem Streamlit)')
+    parser.add_argument('--arquivo', default=nucleo.CSV_PATH,
+                        help=f'histórico (CSV com ; ou Parquet); padrão: {nucleo.CSV_PATH}')
+    parser.add_argument('--secoes', default=','.join(SECOES),
+                        help=f'seções separadas por vírgula ({", ".join(SECOES)})')
+    parser.add_argument('--janela', type=janela_arg, default=2000,
+                        help='últimos N concursos para janelas e sugestões ("todos" = histórico completo)')
+    parser.add_argument('--jogos', type=int, default=6, help=f'quantidade de jogos sugeridos (até {LIMITE_LOTE})')
+    parser.add_argument('--top', type=int, default=3, help='distribuições mais comuns usadas nas sugestões')
+    parser.add_argument('--semente', type=int, default=None, help='semente para sugestões reprodutíveis')
+    parser.add_argument('--formato', choices=['json', 'parquet'], default='json')
+    parser.add_argument('--saida', default=None,
+                        help='arquivo JSON (padrão: saída padrão) ou pasta para os arquivos Parquet')
+    return parser
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    args.secoes = [secao.strip() for secao in args.secoes.split(',') if secao.strip()]
+    desconhecidas = set(args.secoes) - set(SECOES)
+    if desconhecidas:
+        raise SystemExit(f"Seções desconhecidas: {', '.join(sorted(desconhecidas))}")
+    if not 1 <= args.jogos <= LIMITE_LOTE:
+        raise SystemExit(f"--jogos deve estar entre 1 e {LIMITE_LOTE}")
+
+    inicio = time.perf_counter()
+    analise, resultados = executar(args)
+
+    if args.formato == 'parquet':
+        if not args.saida:
+            raise SystemExit("--formato parquet exige --saida (pasta de destino)")
+        gravados = gravar_parquet(resultados, args.saida)
+        destino = ', '.join(f"{nome}.parquet" for nome in gravados)
+    else:
+        texto = para_json(analise, resultados, args.arquivo)
+        if args.saida:
+            with open(args.saida, 'w', encoding='utf-8') as f:
+                f.write(texto)
+            destino = args.saida
+        else:
+            sys.stdout.write(texto + '\n')
+            destino = 'saída padrão'
+
+    print(f"{len(analise.base)} concursos processados em {time.perf_counter() - inicio:.2f} s -> {destino}",
+          file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import os
+from functools import lru_cache
+from itertools import combinations
+from math import comb, prod
+
+import numpy as np
+
+try:
+    from Sistema.analise import contar_grupos
+    from Sistema.sorteios import contar_bits, mascara_de_numeros
+except ImportError:
+    from analise import contar_grupos
+    from sorteios import contar_bits, mascara_de_numeros
+
+# Tabela com todas as C(25,15) = 3.268.760 combinações da Lotofácil, gerada uma
+# única vez e lida como memmap. Cada linha guarda a máscara de 25 bits e
+# características fixas do jogo; o padrão por grupo depende do ranking atual e
+# é calculado sob demanda (um vetor uint16 por ranking, guardado em memória).
+
+CAMINHO_COMBINACOES = 'dados/combinacoes_25_15.npy'
+TOTAL_COMBINACOES = comb(25, 15)
+PRIMOS = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+MASCARA_IMPARES = mascara_de_numeros(range(1, 26, 2))
+MASCARA_PRIMOS = mascara_de_numeros(PRIMOS)
+
+TIPO_COMBINACAO = np.dtype([
+    ('mascara', np.uint32),
+    ('soma', np.uint16),
+    ('impares', np.uint8),
+    ('primos', np.uint8),
+])
+
+# Soma dos números de cada byte da máscara (4 tabelas de 256 posições)
+_SOMAS_BYTE = np.array([
+    [sum(8 * byte + bit + 1 for bit in range(8) if valor >> bit & 1) for valor in range(256)]
+    for byte in range(4)
+], dtype=np.uint16)
+
+_tabelas = {}
+_padroes = {}
+
+def somar_numeros(mascaras):
+    """Soma dos números de cada máscara por consulta em tabela byte a byte"""
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    soma = np.zeros(len(mascaras), dtype=np.uint16)
+    for byte in range(4):
+        soma += _SOMAS_BYTE[byte][(mascaras >> np.uint32(8 * byte)) & 0xFF]
+    return soma
+
+def gerar_mascaras():
+    """Todas as máscaras de 25 bits com 15 bits ligados, em ordem crescente"""
+    baixos = np.arange(1 << 16, dtype=np.uint32)
+    bits_baixos = contar_bits(baixos)
+    por_quantidade = [baixos[bits_baixos == k] for k in range(17)]
+    partes = []
+    for alto in range(1 << 9):
+        faltam = 15 - bin(alto).count('1')
+        if 0 <= faltam <= 16:
+            partes.append(np.uint32(alto << 16) | por_quantidade[faltam])
+    return np.concatenate(partes)
+
+def gerar_tabela(caminho=CAMINHO_COMBINACOES):
+    """Gera o arquivo da tabela (uma vez) e devolve o memmap somente leitura"""
+    mascaras = gerar_mascaras()
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    temporario = caminho + '.tmp.npy'
+    tabela = np.lib.format.open_memmap(temporario, mode='w+', dtype=TIPO_COMBINACAO, shape=(len(mascaras),))
+    tabela['mascara'] = mascaras
+    tabela['soma'] = somar_numeros(mascaras)
+    tabela['impares'] = contar_bits(mascaras & MASCARA_IMPARES)
+    tabela['primos'] = contar_bits(mascaras & MASCARA_PRIMOS)
+    tabela.flush()
+    del tabela
+    os.replace(temporario, caminho)
+    return np.load(caminho, mmap_mode='r')
+
+def tabela_combinacoes(caminho=CAMINHO_COMBINACOES):
+    """Memmap da tabela de combinações (gerado na primeira chamada)"""
+    if caminho not in _tabelas:
+        if os.path.exists(caminho):
+            tabela = np.load(caminho, mmap_mode='r')
+            if tabela.dtype != TIPO_COMBINACAO or len(tabela) != TOTAL_COMBINACOES:
+                tabela = gerar_tabela(caminho)
+        else:
+            tabela = gerar_tabela(caminho)
+        _tabelas[caminho] = tabela
+    return _tabelas[caminho]
+
+def codigo_padrao(alvos):
+    """Código único (base 6) de um padrão (G1, G2, G3, P1, P2)"""
+    codigo = 0
+    for qtd in reversed(list(alvos)):
+        codigo = codigo * 6 + int(qtd)
+    return codigo
+
+def padrao_de_codigo(codigo):
+    alvos = []
+    for _ in range(5):
+        alvos.append(int(codigo % 6))
+        codigo //= 6
+    return tuple(alvos)
+
+def padroes_combinacoes(tabela, grupos_melhores, grupos_piores):
+    """Código do padrão por grupo de cada combinação para o ranking informado"""
+    grupos = list(grupos_melhores) + list(grupos_piores)
+    chave = (id(tabela), tuple(tuple(grupo) for grupo in grupos))
+    if chave not in _padroes:
+        contagens = contar_grupos(tabela['mascara'], grupos).astype(np.uint16)
+        _padroes.clear()  # só o ranking atual fica em memória
+        _padroes[chave] = contagens @ (6 ** np.arange(5, dtype=np.uint16))
+    return _padroes[chave]
+
+def filtrar(tabela, padroes=None, alvos=None, soma=None, impares=None, primos=None):
+    """Índices das combinações que atendem a todos os filtros informados
+
+    soma, impares e primos são intervalos (mínimo, máximo) inclusivos.
+    """
+    selecao = np.ones(len(tabela), dtype=bool)
+    if alvos is not None:
+        selecao &= padroes == codigo_padrao(alvos)
+    for campo, intervalo in (('soma', soma), ('impares', impares), ('primos', primos)):
+        if intervalo is not None:
+            valores = tabela[campo]
+            selecao &= (valores >= intervalo[0]) & (valores <= intervalo[1])
+    return np.flatnonzero(selecao)
+
+def sortear(tabela, indices, k, rng=None):
+    """Sorteia até k combinações distintas entre os índices; devolve as máscaras"""
+    rng = rng if rng is not None else np.random.default_rng()
+    k = min(k, len(indices))
+    escolhidos = rng.choice(indices, size=k, replace=False) if k else indices[:0]
+    return tabela['mascara'][np.sort(escolhidos)]
+
+# ---------------------------- Amostragem sem tentativas ----------------------------
+# O espaço de um padrão (G1, G2, G3, P1, P2) é o produto cartesiano das escolhas
+# de cada grupo: C(5, g1) x C(5, g2) x ... jogos. Cada inteiro em [0, tamanho)
+# corresponde a um único jogo (base mista, um dígito por grupo), então sortear
+# k inteiros distintos dá k jogos distintos, sem laço de tentativas.
+
+@lru_cache(maxsize=1024)
+def _subconjuntos(grupo, k):
+    tabela = np.array([mascara_de_numeros(c) for c in combinations(grupo, k)], dtype=np.uint32)
+    tabela.setflags(write=False)
+    return tabela
+
+def subconjuntos(grupo, k):
+    """Máscaras dos C(n, k) subconjuntos de k números do grupo, em ordem lexicográfica"""
+    return _subconjuntos(tuple(sorted(int(num) for num in grupo)), int(k))
+
+def tamanho_espaco(grupos, alvos):
+    """Quantidade de jogos de 15 números com exatamente alvos[j] números de cada grupo j"""
+    if sum(int(k) for k in alvos) != 15:
+        return 0
+    return prod(comb(len(grupo), int(k)) for grupo, k in zip(grupos, alvos))
+
+def desranquear(posicoes, grupos, alvos):
+    """Converte posições em [0, tamanho_espaco) nas máscaras dos jogos correspondentes"""
+    restos = np.asarray(posicoes, dtype=np.int64)
+    mascaras = np.zeros(len(restos), dtype=np.uint32)
+    for grupo, k in zip(grupos, alvos):
+        tabela = subconjuntos(grupo, int(k))
+        restos, digito = np.divmod(restos, len(tabela))
+        mascaras |= tabela[digito]
+    return mascaras
+
+def numeros_por_grupo(mascara, grupos):
+    """Números do jogo separados por grupo (cada lista em ordem crescente)"""
+    mascara = int(mascara)
+    return [sorted(num for num in grupo if mascara >> (num - 1) & 1) for grupo in grupos]
+
+def amostrar_padrao(grupos, alvos, k, rng=None):
+    """k jogos distintos do padrão indicado; devolve (máscaras, tamanho do espaço)
+
+    Se o espaço tiver menos de k jogos, devolve todos eles (o chamador avisa).
+    """
+    total = tamanho_espaco(grupos, alvos)
+    if total == 0:
+        return np.empty(0, dtype=np.uint32), 0
+    rng = rng if rng is not None else np.random.default_rng()
+    posicoes = np.arange(total) if total <= k else rng.choice(total, size=k, replace=False)
+    return desranquear(posicoes, grupos, alvos), total
@@ -0,0 +1,107 @@
+import pandas as pd
+import streamlit as st
+
+try:
+    from Sistema import medicao
+    from Sistema.avaliacao import FAIXAS_PREMIO, jogos_de_dataframe, resumo_acertos
+except ImportError:
+    import medicao
+    from avaliacao import FAIXAS_PREMIO, jogos_de_dataframe, resumo_acertos
+
+# Componentes de tela usados pelo app.py e pelas páginas do Sistema: navegação
+# e filtros da tela "Ver Dados", a conferência de jogos no histórico e o painel
+# de desempenho. Só a interface: os cálculos ficam nos módulos sem dependência
+# do Streamlit.
+
+def seletor_pagina(total, chave='pagina_dados'):
+    """Navegação entre páginas (anterior, número e próxima), guardada na sessão"""
+    if st.session_state.get(chave, 1) > total:
+        st.session_state[chave] = total
+
+    def mudar(passo):
+        st.session_state[chave] = min(max(st.session_state.get(chave, 1) + passo, 1), total)
+
+    atual = st.session_state.get(chave, 1)
+    col_ant, col_num, col_prox = st.columns([1, 2, 1])
+    with col_ant:
+        st.button("◀ Anterior", on_click=mudar, args=(-1,), disabled=atual <= 1, key=f"{chave}_anterior",
+                  width='stretch')
+    with col_num:
+        pagina = st.number_input(f"Página (de {total})", min_value=1, max_value=total, step=1, key=chave)
+    with col_prox:
+        st.button("Próxima ▶", on_click=mudar, args=(1,), disabled=atual >= total, key=f"{chave}_proxima",
+                  width='stretch')
+    return int(pagina)
+
+def seletor_datas(visao, chave='datas_dados'):
+    """Intervalo de datas do índice da visão; (None, None) se for o período todo ou incompleto"""
+    limites = visao.limites_datas()
+    if limites is None:
+        return None, None
+    selecao = st.date_input("Intervalo de Datas", value=limites, min_value=limites[0], max_value=limites[1],
+                            format="DD/MM/YYYY", key=chave, help="Selecione o período dos sorteios")
+    # Enquanto o usuário escolhe, o widget devolve só a data inicial
+    if not isinstance(selecao, (tuple, list)) or len(selecao) != 2 or tuple(selecao) == tuple(limites):
+        return None, None
+    return selecao[0], selecao[1]
+
+def exibir_conferencia_jogos(base, gerados, rotulo_gerados, dica_gerados):
+    """Confere os jogos gerados na sessão ou os de um CSV enviado contra todo o histórico
+
+    `gerados` são as máscaras dos últimos jogos gerados na tela (None se ainda não houver).
+    """
+    origem = st.radio("Jogos a conferir", [rotulo_gerados, "📤 Arquivo CSV"], horizontal=True, key='conferencia_origem')
+
+    if origem == "📤 Arquivo CSV":
+        arquivo = st.file_uploader("Arquivo com os jogos (colunas Bola1 a Bola15, separador ;)", type=['csv'], key='conferencia_arquivo')
+        if arquivo is None:
+            return
+        jogos, descartados = jogos_de_dataframe(pd.read_csv(arquivo, sep=';'))
+        if descartados:
+            st.warning(f"⚠️ {descartados} linha(s) ignorada(s): não têm 15 números distintos de 1 a 25")
+    elif gerados is None:
+        st.info(dica_gerados)
+        return
+    else:
+        jogos = gerados
+
+    if len(jogos) == 0:
+        st.info("Nenhum jogo válido para conferir")
+        return
+
+    if st.button(f"🧪 Conferir {len(jogos)} Jogos em {len(base)} Concursos", key='conferencia_conferir', width='stretch'):
+        resumo = resumo_acertos(jogos, base.mascaras)
+
+        # Totais por faixa somando todos os jogos
+        cols = st.columns(len(FAIXAS_PREMIO))
+        for col, faixa in zip(cols, FAIXAS_PREMIO):
+            with col:
+                st.metric(f"{faixa} pontos", int(resumo[f'{faixa} pts'].sum()))
+        st.bar_chart(pd.Series({f"{faixa} pts": int(resumo[f'{faixa} pts'].sum()) for faixa in FAIXAS_PREMIO}))
+
+        st.write("**🏆 Jogos com mais premiações no histórico (até 100):**")
+        st.dataframe(
+            resumo.sort_values(['Premiações', 'Máximo'], ascending=False, kind='stable').head(100),
+            width='stretch',
+            hide_index=True
+        )
+
+def exibir_painel_medicao(historico):
+    """Painel de depuração: tempo por etapa do rerun atual e dos anteriores desta sessão"""
+    st.markdown("---")
+    st.subheader("⏱️ Tempo por Etapa")
+    if not historico:
+        st.caption("Nenhuma tela medida ainda.")
+        return
+    ultima = historico[-1]
+    tempos = ultima.tempos()
+    st.write(f"**Rerun atual ({ultima.tela}): {ultima.total * 1000:.1f} ms**")
+    colunas = st.columns(len(tempos))
+    for coluna, (nome, segundos) in zip(colunas, tempos.items()):
+        with coluna:
+            st.metric(nome, f"{segundos * 1000:.1f} ms")
+    st.dataframe(medicao.tabela(historico), width='stretch', hide_index=True)
+    if ultima.perfil:
+        st.caption(f"Perfil do cProfile: {ultima.perfil}")
+    else:
+        st.caption(f"Defina {medicao.VARIAVEL_PERFIL}=1 para gravar um perfil do cProfile a cada rerun.")
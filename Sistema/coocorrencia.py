@@ -0,0 +1,106 @@
+from itertools import combinations
+
+import numpy as np
+
+try:
+    from Sistema.sorteios import DESLOCAMENTOS, contar_bits
+except ImportError:
+    from sorteios import DESLOCAMENTOS, contar_bits
+
+# Coocorrência de pares e trios de números (sem dependência do Streamlit).
+# Pares: matriz 25 x 25 = incidênciaᵀ @ incidência (diagonal = frequência),
+# calculada em blocos de linhas com float32 (exato até 2^24 por bloco).
+# Trios: as 2.300 combinações de 3 números, contadas sobre a incidência
+# "fatiada por bit" (um bitset de N bits por número): cada trio é o popcount de
+# B[a] & B[b] & B[c], 23 x 24 / 2 operações vetorizadas no total.
+# As contagens são somas por concurso, então novos concursos só somam a sua parte.
+
+TRIOS = np.array(list(combinations(range(1, 26), 3)), dtype=np.uint8)
+TOTAL_TRIOS = len(TRIOS)  # 2300
+LINHAS_POR_BLOCO = 1 << 20
+
+def incidencia(mascaras, dtype=np.float32):
+    """Matriz N x 25 (0/1) no tipo pedido"""
+    return ((np.asarray(mascaras, dtype=np.uint32)[:, None] >> DESLOCAMENTOS) & 1).astype(dtype)
+
+def contar_pares(mascaras, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Matriz 25 x 25 (int64): vezes em que os números i e j saíram juntos"""
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    pares = np.zeros((25, 25), dtype=np.int64)
+    for inicio in range(0, len(mascaras), linhas_por_bloco):
+        bloco = incidencia(mascaras[inicio:inicio + linhas_por_bloco])
+        pares += np.rint(bloco.T @ bloco).astype(np.int64)
+    return pares
+
+def bitsets(mascaras):
+    """Incidência transposta e empacotada: 25 linhas de palavras uint32 (bit k = concurso k)"""
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    colunas = incidencia(mascaras, np.uint8).T
+    sobra = (-len(mascaras)) % 32
+    if sobra:
+        colunas = np.pad(colunas, ((0, 0), (0, sobra)))
+    return np.ascontiguousarray(np.packbits(colunas, axis=1, bitorder='little')).view(np.uint32)
+
+def contar_trios(mascaras):
+    """Contagem (int64) de cada trio de TRIOS"""
+    trios = np.zeros(TOTAL_TRIOS, dtype=np.int64)
+    if len(mascaras) == 0:
+        return trios
+    b = bitsets(mascaras)
+    k = 0
+    for i in range(23):
+        for j in range(i + 1, 24):
+            ambos = b[i] & b[j]
+            contagens = contar_bits(ambos[None, :] & b[j + 1:]).sum(axis=1, dtype=np.int64)
+            trios[k:k + len(contagens)] = contagens
+            k += len(contagens)
+    return trios
+
+class Coocorrencia:
+    """Contagens de pares e trios dos primeiros `n` concursos de um histórico"""
+
+    __slots__ = ('n', 'pares', 'trios')
+
+    def __init__(self, n=0, pares=None, trios=None):
+        self.n = int(n)
+        self.pares = np.zeros((25, 25), dtype=np.int64) if pares is None else np.asarray(pares, dtype=np.int64)
+        self.trios = np.zeros(TOTAL_TRIOS, dtype=np.int64) if trios is None else np.asarray(trios, dtype=np.int64)
+
+    @classmethod
+    def de_mascaras(cls, mascaras):
+        coocorrencia = cls()
+        coocorrencia.acrescentar(mascaras)
+        return coocorrencia
+
+    def acrescentar(self, mascaras):
+        """Soma as contagens dos novos concursos (O(novos))"""
+        if len(mascaras) == 0:
+            return
+        self.pares += contar_pares(mascaras)
+        self.trios += contar_trios(mascaras)
+        self.n += len(mascaras)
+
+    def frequencia(self):
+        return np.diagonal(self.pares).copy()
+
+    def tabela_pares(self):
+        """Lista de dicionários (numero_a, numero_b, vezes, percentual) para o heatmap"""
+        n = max(self.n, 1)
+        return [{'numero_a': i + 1, 'numero_b': j + 1, 'vezes': int(self.pares[i, j]),
+                 'percentual': round(100 * float(self.pares[i, j]) / n, 2)}
+                for i in range(25) for j in range(25) if i != j]
+
+    def mais_frequentes(self, quantidade=20, tipo='trios', menos=False):
+        """Pares ou trios mais (ou menos) frequentes: lista de (números, vezes)"""
+        if tipo == 'pares':
+            i, j = np.triu_indices(25, 1)
+            combinacoes, contagens = np.stack([i + 1, j + 1], axis=1), self.pares[i, j]
+        else:
+            combinacoes, contagens = TRIOS, self.trios
+        ordem = np.argsort(contagens if menos else -contagens, kind='stable')[:quantidade]
+        return [(tuple(int(x) for x in combinacoes[k]), int(contagens[k])) for k in ordem]
+
+    def esperado(self, tamanho=2):
+        """Contagem esperada de um par (2) ou trio (3) em sorteios uniformes"""
+        probabilidade = {2: (15 * 14) / (25 * 24), 3: (15 * 14 * 13) / (25 * 24 * 23)}[tamanho]
+        return self.n * probabilidade
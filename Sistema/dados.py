@@ -1,11 +1,40 @@
 import streamlit as st
 import pandas as pd
 import os
+from collections import deque
 from datetime import datetime
 import io
 
+try:
+    from Sistema import (armazenamento, binario, cache, exportacao, importacao, medicao, nucleo, paginacao,
+                         validacao)
+    from Sistema.componentes import exibir_painel_medicao, seletor_datas, seletor_pagina
+    from Sistema.estado import registrar_concursos
+    from Sistema.sorteios import BaseSorteios
+except ImportError:
+    import armazenamento
+    import binario
+    import cache
+    import exportacao
+    import importacao
+    import medicao
+    import nucleo
+    import paginacao
+    import validacao
+    from componentes import exibir_painel_medicao, seletor_datas, seletor_pagina
+    from estado import registrar_concursos
+    from sorteios import BaseSorteios
+
 CSV_PATH = 'dados/lotofacil.csv'
 
+# Critério de ordenação da tela "Ver Dados": (chave, decrescente) da paginação
+ORDENACOES = {
+    "Concurso (Crescente)": ('concurso', False),
+    "Concurso (Decrescente)": ('concurso', True),
+    "Data (Mais Recente)": ('data', True),
+    "Data (Mais Antiga)": ('data', False),
+}
+
 def verificar_estrutura():
     """Verifica e cria a estrutura de pastas necessária"""
     if not os.path.exists('dados'):
@@ -13,34 +42,59 @@ def verificar_estrutura():
 
 def criar_arquivo_base():
     """Cria um arquivo base vazio se não existir"""
-    if not os.path.exists(CSV_PATH):
+    if not armazenamento.existe_dados(CSV_PATH):
         colunas = ['Concurso', 'Data Sorteio'] + [f'Bola{i}' for i in range(1, 16)]
         df_base = pd.DataFrame(columns=colunas)
-        df_base.to_csv(CSV_PATH, sep=';', index=False, encoding='utf-8')
+        armazenamento.salvar(df_base, CSV_PATH)
         return True
     return False
 
 def carregar_dados():
-    """Carrega os dados do arquivo CSV"""
+    """Carrega os dados do armazenamento configurado (Parquet ou CSV)"""
     try:
-        if os.path.exists(CSV_PATH):
-            df = pd.read_csv(CSV_PATH, sep=';', encoding='utf-8')
-            return df
-        else:
-            return pd.DataFrame()
+        return cache.obter('dados', cache.versao_dados(CSV_PATH), armazenamento.carregar, CSV_PATH)
     except Exception as e:
         st.error(f"Erro ao carregar dados: {e}")
         return pd.DataFrame()
 
 def salvar_dados(df):
-    """Salva os dados no arquivo CSV"""
+    """Salva os dados no armazenamento configurado (Parquet ou CSV)"""
     try:
-        df.to_csv(CSV_PATH, sep=';', index=False, encoding='utf-8')
+        armazenamento.salvar(df, CSV_PATH)
+        # Retrato binário regravado de forma atômica junto com o histórico
+        binario.gravar_dataframe(df, CSV_PATH)
+        cache.invalidar()
         return True
     except Exception as e:
         st.error(f"Erro ao salvar dados: {e}")
         return False
 
+def salvar_concurso(registro):
+    """Acrescenta um único concurso ao diário (sem regravar o histórico)"""
+    try:
+        versao_anterior = cache.versao_dados(CSV_PATH)
+        armazenamento.anexar(registro, CSV_PATH)
+        cache.invalidar()
+        # Análises incrementais e retrato binário: só o concurso novo é processado
+        novos = BaseSorteios.de_dataframe(pd.DataFrame([registro]))
+        binario.acrescentar(novos, CSV_PATH, versao_anterior)
+        registrar_concursos(CSV_PATH, novos, cache.versao_dados(CSV_PATH))
+        return True
+    except Exception as e:
+        st.error(f"Erro ao salvar concurso: {e}")
+        return False
+
+def exibir_quarentena(resultado, caminho):
+    """Resumo das linhas recusadas na validação, com a tabela e o relatório para download"""
+    validacao.gravar_quarentena(resultado, caminho)
+    st.warning(f"⚠️ {resultado.total_invalidas} linha(s) em quarentena (não serão importadas)")
+    for motivo, quantidade in resultado.resumo().items():
+        st.write(f"- {motivo}: {quantidade}")
+    relatorio = resultado.quarentena()
+    st.dataframe(relatorio.head(100), width='stretch', hide_index=True)
+    st.download_button("📥 Baixar Relatório da Quarentena", relatorio.to_csv(sep=';', index=False).encode('utf-8'),
+                       file_name=os.path.basename(caminho), mime="text/csv")
+
 def tela_atualizacao_dados():
     """Tela para atualizar dados manualmente"""
     st.header("🔄 Atualização de Dados da Lotofácil")
@@ -49,7 +103,8 @@ def tela_atualizacao_dados():
     criar_arquivo_base()
     
     # Carregar dados existentes
-    df = carregar_dados()
+    with medicao.etapa('carregar_dados'):
+        df = carregar_dados()
     
     # Informações atuais
     col1, col2, col3 = st.columns(3)
@@ -145,53 +200,29 @@ def tela_atualizacao_dados():
         )
         
         if submitted:
-            # VALIDAÇÕES
-            erros = []
+            # CRIAR NOVO REGISTRO
+            novo_concurso = {
+                'Concurso': numero_concurso,
+                'Data Sorteio': data_sorteio.strftime('%d/%m/%Y')
+            }
             
-            # Validar se concurso já existe
-            if not df.empty and numero_concurso in df['Concurso'].values:
-                erros.append(f"Concurso {numero_concurso} já existe no arquivo!")
+            # Adicionar números às colunas Bola1 a Bola15
+            for i, num in enumerate(numeros, 1):
+                novo_concurso[f'Bola{i}'] = num
             
-            # Validar quantidade de números
-            if len(numeros) != 15:
-                erros.append("São necessários exatamente 15 números!")
-            
-            # Validar números únicos
-            if len(numeros) != len(set(numeros)):
-                erros.append("Os números devem ser únicos! Há números repetidos.")
-            
-            # Validar faixa de números
-            for num in numeros:
-                if num < 1 or num > 25:
-                    erros.append("Todos os números devem estar entre 1 e 25!")
-                    break
+            # VALIDAÇÕES (as mesmas da carga: bolas, data e ordem em relação ao histórico)
+            with medicao.etapa('validacao'):
+                historico = nucleo.carregar_analise(CSV_PATH).base
+                erros = list(validacao.validar(pd.DataFrame([novo_concurso]), historico).resumo())
             
             if erros:
                 for erro in erros:
-                    st.error(f"❌ {erro}")
+                    st.error(f"❌ Concurso {numero_concurso}: {erro}")
             else:
-                # CRIAR NOVO REGISTRO
-                novo_concurso = {
-                    'Concurso': numero_concurso,
-                    'Data Sorteio': data_sorteio.strftime('%d/%m/%Y')
-                }
-                
-                # Adicionar números às colunas Bola1 a Bola15
-                for i, num in enumerate(numeros, 1):
-                    novo_concurso[f'Bola{i}'] = num
-                
-                # Adicionar ao DataFrame
-                if df.empty:
-                    df = pd.DataFrame([novo_concurso])
-                else:
-                    df_novo = pd.DataFrame([novo_concurso])
-                    df = pd.concat([df, df_novo], ignore_index=True)
-                
-                # Ordenar por concurso
-                df = df.sort_values('Concurso').reset_index(drop=True)
-                
-                # SALVAR NO ARQUIVO
-                if salvar_dados(df):
+                # SALVAR NO DIÁRIO (acréscimo simples; a compactação incorpora ao arquivo principal)
+                with medicao.etapa('gravacao'):
+                    salvo = salvar_concurso(novo_concurso)
+                if salvo:
                     st.success(f"✅ Concurso {numero_concurso} salvo com sucesso no arquivo lotofacil.csv!")
                     st.balloons()
                     
@@ -251,45 +282,59 @@ def tela_atualizacao_dados():
         if uploaded_file is not None:
             try:
                 # Ler arquivo upload
-                df_upload = pd.read_csv(uploaded_file, sep=';', encoding='utf-8')
+                with medicao.etapa('carregar_upload'):
+                    df_upload = pd.read_csv(uploaded_file, sep=';', encoding='utf-8')
                 
-                # Validar colunas necessárias
-                colunas_necessarias = ['Concurso', 'Data Sorteio'] + [f'Bola{i}' for i in range(1, 16)]
-                colunas_faltantes = [col for col in colunas_necessarias if col not in df_upload.columns]
+                # Validar o arquivo inteiro de uma vez; linhas com problema vão para a quarentena
+                with medicao.etapa('validacao'):
+                    analise = nucleo.carregar_analise(CSV_PATH)
+                    resultado = validacao.validar(df_upload, analise.base, rejeitar_existentes=False)
                 
-                if colunas_faltantes:
-                    st.error(f"❌ Colunas faltantes no arquivo: {', '.join(colunas_faltantes)}")
+                if resultado.faltantes:
+                    st.error(f"❌ Colunas faltantes no arquivo: {', '.join(resultado.faltantes)}")
                 else:
-                    st.success(f"✅ Arquivo válido! {len(df_upload)} concursos encontrados.")
+                    st.success(f"✅ {len(df_upload) - resultado.total_invalidas} concursos válidos de {len(df_upload)} linhas.")
+                    if resultado.total_invalidas:
+                        exibir_quarentena(resultado, validacao.caminho_quarentena(CSV_PATH, 'upload'))
                     
                     # Mostrar preview
                     with st.expander("👀 Visualizar Primeiras Linhas do Arquivo"):
-                        st.dataframe(df_upload.head(3), width='stretch')
+                        st.dataframe(resultado.validos().head(3), width='stretch')
                     
-                    # Verificar concursos duplicados
-                    concursos_existentes = set(df['Concurso']) if not df.empty else set()
-                    concursos_novos = set(df_upload['Concurso'])
-                    concursos_duplicados = concursos_existentes.intersection(concursos_novos)
+                    # Mesclagem ordenada com o histórico: concursos já cadastrados seguem a política escolhida
+                    politica = st.radio("Concursos que já existem no arquivo", list(importacao.POLITICAS),
+                                        format_func=importacao.POLITICAS.get, key='politica_importacao')
+                    with medicao.etapa('mesclagem'):
+                        plano = importacao.planejar(resultado, analise.base, politica, CSV_PATH, analise.versao)
+                        mesclagem = plano.mesclagem
+                        resumo = mesclagem.resumo()
                     
-                    if concursos_duplicados:
-                        st.warning(f"⚠️ {len(concursos_duplicados)} concursos já existem e serão ignorados: {sorted(concursos_duplicados)[:5]}...")
-                        df_upload = df_upload[~df_upload['Concurso'].isin(concursos_duplicados)]
+                    col_imp1, col_imp2, col_imp3, col_imp4 = st.columns(4)
+                    col_imp1.metric("Novos", resumo['inseridos'])
+                    col_imp2.metric("Sobrescritos", resumo['sobrescritos'])
+                    col_imp3.metric("Conflitos", resumo['conflitos'])
+                    col_imp4.metric("Idênticos", resumo['iguais'])
                     
-                    if len(df_upload) > 0:
-                        # Combinar dados
-                        if df.empty:
-                            df_combinado = df_upload.copy()
-                        else:
-                            df_combinado = pd.concat([df, df_upload], ignore_index=True)
-                        
-                        # Ordenar e salvar
-                        df_combinado = df_combinado.sort_values('Concurso').reset_index(drop=True)
-                        
-                        if salvar_dados(df_combinado):
-                            st.success(f"✅ {len(df_upload)} novos concursos importados com sucesso!")
-                            st.rerun()
-                    else:
+                    if resumo['conflitos']:
+                        conflitos = mesclagem.conflitos()
+                        st.warning(f"⚠️ {resumo['conflitos']} concursos já existem com números ou data diferentes")
+                        st.dataframe(conflitos.head(100), width='stretch', hide_index=True)
+                        st.download_button("📥 Baixar Relatório de Conflitos",
+                                           conflitos.to_csv(sep=';', index=False).encode('utf-8'),
+                                           file_name="lotofacil_conflitos.csv", mime="text/csv")
+                    
+                    if resumo['recusada']:
+                        st.error("❌ Importação recusada: há conflitos e a política é só inserir.")
+                    elif mesclagem.alteracoes == 0:
                         st.info("ℹ️ Nenhum concurso novo para importar.")
+                    else:
+                        if resumo['cauda']:
+                            st.caption("Os concursos vêm depois do último cadastrado: só serão acrescentados ao diário.")
+                        if st.button(f"📥 Importar {mesclagem.alteracoes} concursos", type="primary"):
+                            with medicao.etapa('gravacao'):
+                                gravados = importacao.aplicar(plano)
+                            st.success(f"✅ {gravados} concursos importados com sucesso!")
+                            st.rerun()
                         
             except Exception as e:
                 st.error(f"❌ Erro ao importar arquivo: {e}")
@@ -300,12 +345,23 @@ def tela_atualizacao_dados():
     # GESTÃO DE DADOS
     st.subheader("🗃️ Gestão do Arquivo de Dados")
     
-    col_gest1, col_gest2, col_gest3 = st.columns(3)
+    col_gest1, col_gest2, col_gest3, col_gest4 = st.columns(4)
     
     with col_gest1:
         if st.button("🔄 Recarregar Dados", width='stretch'):
             st.rerun()
     
+    with col_gest4:
+        pendentes = armazenamento.tamanho_diario(CSV_PATH)
+        if st.button(f"🧩 Compactar Diário ({pendentes})", width='stretch', disabled=pendentes == 0):
+            try:
+                armazenamento.compactar(CSV_PATH)
+                cache.invalidar()
+                st.success("✅ Diário incorporado ao arquivo principal!")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Erro ao compactar diário: {e}")
+    
     with col_gest2:
         if st.button("📊 Visualizar Arquivo Atual", width='stretch'):
             if not df.empty:
@@ -328,12 +384,13 @@ def exibir_dados_loto():
     
     verificar_estrutura()
     
-    if not os.path.exists(CSV_PATH):
+    if not armazenamento.existe_dados(CSV_PATH):
         st.warning("📝 Arquivo lotofacil.csv não encontrado.")
         st.info("Vá para a aba 'Atualização de Dados' para criar o arquivo e adicionar concursos.")
         return
     
-    df = carregar_dados()
+    with medicao.etapa('carregar_dados'):
+        df = carregar_dados()
     
     if df.empty:
         st.warning("📝 Nenhum concurso cadastrado no arquivo.")
@@ -362,19 +419,27 @@ def exibir_dados_loto():
     # Filtros interativos
     st.subheader("🔍 Filtros e Visualização")
     
+    # Índice por concurso e por data pronto por versão dos dados: os intervalos são
+    # buscas binárias, filtrar e paginar não reordena o histórico e só as linhas da
+    # página são formatadas
+    with medicao.etapa('indice_dados'):
+        versao = cache.versao_dados(CSV_PATH)
+        visao = cache.obter('visao_dados', versao, paginacao.VisaoPaginada, df)
+    
     col_filtro1, col_filtro2, col_filtro3 = st.columns(3)
     
     with col_filtro1:
         # Filtro por intervalo de concursos
-        min_concurso = df['Concurso'].min()
-        max_concurso = df['Concurso'].max()
+        min_concurso, max_concurso = visao.limites_concursos()
         concursos_selecionados = st.slider(
             "Intervalo de Concursos",
-            min_value=int(min_concurso),
-            max_value=int(max_concurso),
-            value=(int(min_concurso), int(max_concurso)),
+            min_value=min_concurso,
+            max_value=max_concurso,
+            value=(min_concurso, max_concurso),
             help="Selecione o intervalo de concursos para visualizar"
         )
+        # Filtro por intervalo de datas
+        data_inicio, data_fim = seletor_datas(visao)
     
     with col_filtro2:
         # Quantidade de linhas a exibir
@@ -389,73 +454,44 @@ def exibir_dados_loto():
         # Ordenação
         ordenacao = st.selectbox(
             "Ordenar por",
-            options=["Concurso (Crescente)", "Concurso (Decrescente)", "Data (Mais Recente)", "Data (Mais Antiga)"],
+            options=list(ORDENACOES),
             index=1,
             help="Ordenação dos concursos"
         )
     
-    # Aplicar filtros
-    df_filtrado = df[
-        (df['Concurso'] >= concursos_selecionados[0]) & 
-        (df['Concurso'] <= concursos_selecionados[1])
-    ]
-    
-    # Aplicar ordenação
-    if ordenacao == "Concurso (Crescente)":
-        df_filtrado = df_filtrado.sort_values('Concurso', ascending=True)
-    elif ordenacao == "Concurso (Decrescente)":
-        df_filtrado = df_filtrado.sort_values('Concurso', ascending=False)
-    elif ordenacao == "Data (Mais Recente)" and 'Data Sorteio' in df_filtrado.columns:
-        # Converter datas para datetime para ordenação correta
-        try:
-            df_filtrado['Data_Sorteio_DT'] = pd.to_datetime(df_filtrado['Data Sorteio'], format='%d/%m/%Y')
-            df_filtrado = df_filtrado.sort_values('Data_Sorteio_DT', ascending=False)
-            df_filtrado = df_filtrado.drop('Data_Sorteio_DT', axis=1)
-        except:
-            df_filtrado = df_filtrado.sort_values('Data Sorteio', ascending=False)
-    elif ordenacao == "Data (Mais Antiga)" and 'Data Sorteio' in df_filtrado.columns:
-        try:
-            df_filtrado['Data_Sorteio_DT'] = pd.to_datetime(df_filtrado['Data Sorteio'], format='%d/%m/%Y')
-            df_filtrado = df_filtrado.sort_values('Data_Sorteio_DT', ascending=True)
-            df_filtrado = df_filtrado.drop('Data_Sorteio_DT', axis=1)
-        except:
-            df_filtrado = df_filtrado.sort_values('Data Sorteio', ascending=True)
+    chave, decrescente = ORDENACOES[ordenacao]
+    with medicao.etapa('filtro'):
+        posicoes = visao.filtrar(concursos_selecionados[0], concursos_selecionados[1], chave, decrescente,
+                                 data_inicio, data_fim)
     
     st.markdown("---")
     
     # Visualização dos dados com abas
     st.subheader("📋 Visualização dos Dados")
     
+    total_paginas = paginacao.total_paginas(len(posicoes), num_linhas)
+    pagina_atual = seletor_pagina(total_paginas)
+    df_pagina = visao.pagina(posicoes, pagina_atual, num_linhas)
+    
     tab1, tab2, tab3 = st.tabs(["🎯 Visualização Compacta", "📊 Visualização Completa", "📈 Estatísticas Detalhadas"])
     
     with tab1:
-        st.write(f"**Concursos {concursos_selecionados[0]} a {concursos_selecionados[1]}** (Total: {len(df_filtrado)})")
-        
-        # Criar dataframe compacto
-        df_compacto = df_filtrado[['Concurso']].copy()
-        if 'Data Sorteio' in df_filtrado.columns:
-            df_compacto['Data Sorteio'] = df_filtrado['Data Sorteio']
-        
-        # Adicionar coluna com números sorteados formatados
-        colunas_bolas = [f'Bola{i}' for i in range(1, 16) if f'Bola{i}' in df_filtrado.columns]
-        if colunas_bolas:
-            df_compacto['Números Sorteados'] = df_filtrado[colunas_bolas].apply(
-                lambda row: ' - '.join(f"{int(x):02d}" for x in row.astype(int).values), axis=1
-            )
+        periodo = f" de {data_inicio:%d/%m/%Y} a {data_fim:%d/%m/%Y}" if data_inicio is not None else ""
+        st.write(f"**Concursos {concursos_selecionados[0]} a {concursos_selecionados[1]}{periodo}** (Total: {len(posicoes)}, página {pagina_atual} de {total_paginas})")
         
         st.dataframe(
-            df_compacto.head(num_linhas),
+            paginacao.formatar_compacto(df_pagina),
             width='stretch',
             hide_index=True,
             height=400
         )
     
     with tab2:
-        st.write(f"**Visualização Completa - {len(df_filtrado)} concursos**")
+        st.write(f"**Visualização Completa - {len(posicoes)} concursos**")
         
         # Mostrar todas as colunas disponíveis
         st.dataframe(
-            df_filtrado.head(num_linhas),
+            df_pagina,
             width='stretch',
             hide_index=True,
             height=500
@@ -472,16 +508,14 @@ def exibir_dados_loto():
             st.write(f"• Período: **{df['Concurso'].min()}** a **{df['Concurso'].max()}**")
             st.write(f"• Colunas Disponíveis: **{len(df.columns)}**")
             
-            # Contar números únicos
-            todos_numeros = []
-            for i in range(1, 16):
-                coluna = f'Bola{i}'
-                if coluna in df.columns:
-                    todos_numeros.extend(df[coluna].dropna().astype(int).tolist())
+            # Contagens por número do núcleo de análises (estado incremental em cache)
+            with medicao.etapa('estatisticas'):
+                analise = nucleo.carregar_analise(CSV_PATH)
             
-            if todos_numeros:
-                st.write(f"• Total de Números Sorteados: **{len(todos_numeros):,}**")
-                st.write(f"• Números Únicos Sorteados: **{len(set(todos_numeros))}**")
+            if not analise.empty:
+                frequencia = analise.estado.contagens
+                st.write(f"• Total de Números Sorteados: **{int(frequencia.sum()):,}**")
+                st.write(f"• Números Únicos Sorteados: **{int((frequencia > 0).sum())}**")
         
         with col_stat2:
             st.write("**Colunas do Arquivo:**")
@@ -493,28 +527,33 @@ def exibir_dados_loto():
     st.markdown("---")
     st.subheader("💾 Exportar Dados")
     
+    # Os arquivos só são gerados no clique e ficam em cache por versão, intervalos e formato
+    formato = st.radio("Formato", exportacao.formatos_disponiveis(),
+                       format_func=lambda f: exportacao.FORMATOS[f]['rotulo'], horizontal=True,
+                       key='formato_exportacao')
+    inicio, fim = concursos_selecionados
+    
     col_dl1, col_dl2 = st.columns(2)
     
     with col_dl1:
-        # Download do arquivo original filtrado
-        csv_filtrado = df_filtrado.to_csv(index=False, sep=';', encoding='utf-8')
+        # Download do arquivo original filtrado (na ordem escolhida)
         st.download_button(
             label="📥 Baixar Dados Filtrados",
-            data=csv_filtrado,
-            file_name=f"lotofacil_filtrado_{concursos_selecionados[0]}_{concursos_selecionados[1]}.csv",
-            mime="text/csv",
+            data=lambda: exportacao.arquivo(versao, visao, formato, inicio, fim, chave, decrescente,
+                                            data_inicio, data_fim),
+            file_name=exportacao.nome_arquivo(f"lotofacil_filtrado_{inicio}_{fim}", formato),
+            mime=exportacao.FORMATOS[formato]['mime'],
             width='stretch',
             help="Baixar apenas os concursos filtrados"
         )
     
     with col_dl2:
         # Download do arquivo completo
-        csv_completo = df.to_csv(index=False, sep=';', encoding='utf-8')
         st.download_button(
             label="📥 Baixar Todos os Dados",
-            data=csv_completo,
-            file_name="lotofacil_completo.csv",
-            mime="text/csv",
+            data=lambda: exportacao.arquivo(versao, visao, formato),
+            file_name=exportacao.nome_arquivo("lotofacil_completo", formato),
+            mime=exportacao.FORMATOS[formato]['mime'],
             width='stretch',
             help="Baixar todos os concursos disponíveis"
         )
@@ -529,14 +568,23 @@ def main():
     
     st.title("🎯 Lotofácil Analytics - Gerenciador de Dados")
     
+    # Tempo por etapa das duas telas (últimos reruns da sessão; painel opcional no fim da página)
+    painel_medicao = st.sidebar.toggle("⏱️ Painel de Desempenho", key='painel_medicao')
+    medicoes = st.session_state.setdefault('medicoes', deque(maxlen=medicao.MAX_HISTORICO))
+    
     # Menu de navegação
     tab1, tab2 = st.tabs(["📁 Visualizar Dados", "🔄 Alimentar Dados"])
     
     with tab1:
-        exibir_dados_loto()
+        with medicao.rerun('exibir_dados_loto', medicoes):
+            exibir_dados_loto()
     
     with tab2:
-        tela_atualizacao_dados()
+        with medicao.rerun('tela_atualizacao_dados', medicoes):
+            tela_atualizacao_dados()
+    
+    if painel_medicao:
+        exibir_painel_medicao(medicoes)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,249 @@
+import os
+from collections import Counter
+
+import numpy as np
+
+try:
+    from Sistema.analise import contar_grupos, dividir_grupos, padroes_de_contagens, ranking_por_frequencia
+    from Sistema.atrasos import IndiceAtrasos
+    from Sistema.coocorrencia import Coocorrencia
+    from Sistema.sorteios import DESLOCAMENTOS, NUMEROS
+except ImportError:
+    from analise import contar_grupos, dividir_grupos, padroes_de_contagens, ranking_por_frequencia
+    from atrasos import IndiceAtrasos
+    from coocorrencia import Coocorrencia
+    from sorteios import DESLOCAMENTOS, NUMEROS
+
+# Estado incremental das análises: contagem por número, ranking dos grupos e
+# padrões (contagem por grupo) de cada concurso. Novos concursos custam
+# O(novos); os padrões de todo o histórico só são recalculados quando a
+# divisão dos números nos 5 grupos muda. Persistido em lotofacil.analise.npz.
+# As contagens de pares e trios e o índice de atrasos só são calculados na
+# primeira consulta e depois acompanham os novos concursos (também no .npz).
+
+_estados = {}
+
+def caminho_estado(csv_path):
+    return os.path.splitext(csv_path)[0] + '.analise.npz'
+
+def grupo_de_cada_numero(ranking):
+    """Array de 25 posições: índice (0 a 4) do grupo de cada número"""
+    grupo_de = np.empty(25, dtype=np.int8)
+    grupo_de[np.asarray(ranking) - 1] = np.arange(25) // 5
+    return grupo_de
+
+class EstadoAnalise:
+    """Contagens, ranking e padrões por concurso mantidos de forma incremental"""
+
+    __slots__ = ('versao', 'contagens', 'ranking', 'recalculos', '_n', '_concursos', '_mascaras', '_padroes',
+                 '_coocorrencia', '_atrasos')
+
+    def __init__(self, capacidade=1024):
+        self.versao = None
+        self.contagens = np.zeros(25, dtype=np.int64)
+        self.ranking = NUMEROS.copy()
+        self.recalculos = 0
+        self._n = 0
+        self._concursos = np.empty(capacidade, dtype=np.int32)
+        self._mascaras = np.empty(capacidade, dtype=np.uint32)
+        self._padroes = np.empty((capacidade, 5), dtype=np.uint8)
+        self._coocorrencia = None
+        self._atrasos = None
+
+    @classmethod
+    def de_base(cls, base):
+        """Estado completo a partir de uma base em ordem crescente de concurso"""
+        estado = cls(capacidade=max(1024, 2 * len(base)))
+        estado.acrescentar(base.concursos, base.mascaras)
+        return estado
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def concursos(self):
+        return self._concursos[:self._n]
+
+    @property
+    def mascaras(self):
+        return self._mascaras[:self._n]
+
+    @property
+    def contagens_grupos(self):
+        return self._padroes[:self._n]
+
+    def grupos(self):
+        return dividir_grupos(self.ranking)
+
+    def frequencia(self):
+        return Counter({int(num): int(qtd) for num, qtd in zip(NUMEROS, self.contagens) if qtd})
+
+    def padroes(self, decrescente=True):
+        """Dicionário de arrays no formato de analise.calcular_padroes"""
+        ordem = slice(None, None, -1) if decrescente else slice(None)
+        return padroes_de_contagens(self.concursos[ordem], self.contagens_grupos[ordem])
+
+    def coocorrencia(self):
+        """Pares e trios de todo o estado; na primeira vez conta o histórico inteiro"""
+        if self._coocorrencia is None:
+            self._coocorrencia = Coocorrencia()
+        if self._coocorrencia.n < self._n:
+            self._coocorrencia.acrescentar(self.mascaras[self._coocorrencia.n:])
+        return self._coocorrencia
+
+    def atrasos(self):
+        """Índice de atrasos de todo o estado; na primeira vez percorre o histórico inteiro"""
+        if self._atrasos is None:
+            self._atrasos = IndiceAtrasos()
+        if self._atrasos.n < self._n:
+            self._atrasos.acrescentar(self.mascaras[self._atrasos.n:])
+        return self._atrasos
+
+    def _garantir_capacidade(self, extra):
+        necessario = self._n + extra
+        if necessario <= len(self._mascaras):
+            return
+        capacidade = max(necessario, 2 * len(self._mascaras))
+        for nome in ('_concursos', '_mascaras', '_padroes'):
+            antigo = getattr(self, nome)
+            novo = np.empty((capacidade,) + antigo.shape[1:], dtype=antigo.dtype)
+            novo[:self._n] = antigo[:self._n]
+            setattr(self, nome, novo)
+
+    def acrescentar(self, concursos, mascaras):
+        """Incorpora novos concursos; devolve True se o histórico todo foi recalculado"""
+        concursos = np.asarray(concursos, dtype=np.int32)
+        mascaras = np.asarray(mascaras, dtype=np.uint32)
+        if len(mascaras) == 0:
+            return False
+
+        self._garantir_capacidade(len(mascaras))
+        inicio, fim = self._n, self._n + len(mascaras)
+        self._concursos[inicio:fim] = concursos
+        self._mascaras[inicio:fim] = mascaras
+        self._n = fim
+        if self._coocorrencia is not None:
+            self._coocorrencia.acrescentar(mascaras)
+        if self._atrasos is not None:
+            self._atrasos.acrescentar(mascaras)
+
+        grupos_antes = grupo_de_cada_numero(self.ranking)
+        self.contagens += ((mascaras[:, None] >> DESLOCAMENTOS) & 1).sum(axis=0, dtype=np.int64)
+        self.ranking = ranking_por_frequencia(self.contagens)
+
+        grupos_melhores, grupos_piores = self.grupos()
+        grupos = grupos_melhores + grupos_piores
+        if inicio > 0 and np.array_equal(grupos_antes, grupo_de_cada_numero(self.ranking)):
+            self._padroes[inicio:fim] = contar_grupos(mascaras, grupos)
+            return False
+
+        self._padroes[:fim] = contar_grupos(self.mascaras, grupos)
+        self.recalculos += 1
+        return True
+
+    def e_prefixo_de(self, base):
+        """O estado cobre exatamente os primeiros concursos da base?"""
+        return (self._n <= len(base)
+                and np.array_equal(self.concursos, base.concursos[:self._n])
+                and np.array_equal(self.mascaras, base.mascaras[:self._n]))
+
+    def salvar(self, caminho):
+        temporario = caminho + '.tmp.npz'
+        extras = {}
+        if self._coocorrencia is not None:
+            extras = {'coocorrencia_n': np.array(self._coocorrencia.n), 'pares': self._coocorrencia.pares,
+                      'trios': self._coocorrencia.trios}
+        if self._atrasos is not None:
+            self._atrasos.salvar_em(extras)
+        np.savez(temporario, versao=np.array(self.versao or ''), concursos=self.concursos,
+                 mascaras=self.mascaras, padroes=self.contagens_grupos,
+                 contagens=self.contagens, ranking=self.ranking, **extras)
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        if not os.path.exists(caminho):
+            return None
+        with np.load(caminho) as dados:
+            estado = cls(capacidade=max(1024, 2 * len(dados['mascaras'])))
+            n = len(dados['mascaras'])
+            estado._concursos[:n] = dados['concursos']
+            estado._mascaras[:n] = dados['mascaras']
+            estado._padroes[:n] = dados['padroes']
+            estado._n = n
+            estado.contagens = dados['contagens'].astype(np.int64)
+            estado.ranking = dados['ranking']
+            estado.versao = str(dados['versao']) or None
+            if 'pares' in dados.files and int(dados['coocorrencia_n']) <= n:
+                estado._coocorrencia = Coocorrencia(int(dados['coocorrencia_n']), dados['pares'], dados['trios'])
+            atrasos = IndiceAtrasos.carregar_de(dados)
+            if atrasos is not None and atrasos.n <= n:
+                estado._atrasos = atrasos
+        return estado
+
+def obter_estado(base, versao, csv_path):
+    """Estado da versão indicada (base em ordem crescente de concurso)
+
+    Reaproveita o estado em memória ou em disco e processa só os concursos
+    que faltam; recalcula do zero se o histórico mudou de outra forma.
+    """
+    caminho = caminho_estado(csv_path)
+    estado = _estados.get(caminho)
+    if estado is None:
+        try:
+            estado = EstadoAnalise.carregar(caminho)
+        except Exception:
+            estado = None
+    if estado is not None and estado.versao == versao and len(estado) == len(base):
+        _estados[caminho] = estado
+        return estado
+
+    if estado is not None and estado.e_prefixo_de(base):
+        estado.acrescentar(base.concursos[len(estado):], base.mascaras[len(estado):])
+    else:
+        estado = EstadoAnalise.de_base(base)
+    estado.versao = versao
+    _estados[caminho] = estado
+    try:
+        estado.salvar(caminho)
+    except OSError:
+        pass
+    return estado
+
+def _obter_derivado(estado, csv_path, atributo, calcular):
+    """Artefato derivado do estado, gravando o .npz quando algo novo foi processado"""
+    atual = getattr(estado, atributo)
+    antes = atual.n if atual is not None else None
+    derivado = calcular()
+    if csv_path and derivado.n != antes:
+        try:
+            estado.salvar(caminho_estado(csv_path))
+        except OSError:
+            pass
+    return derivado
+
+def obter_coocorrencia(estado, csv_path=None):
+    """Pares e trios do estado (persistidos quando há csv_path)"""
+    return _obter_derivado(estado, csv_path, '_coocorrencia', estado.coocorrencia)
+
+def obter_atrasos(estado, csv_path=None):
+    """Índice de atrasos do estado (persistido quando há csv_path)"""
+    return _obter_derivado(estado, csv_path, '_atrasos', estado.atrasos)
+
+def registrar_concursos(csv_path, novos, versao):
+    """Atualiza o estado em memória com concursos recém-gravados (O(novos))
+
+    Só vale para concursos posteriores ao último do estado; fora de ordem, o
+    estado é descartado e será reconstruído na próxima leitura.
+    """
+    caminho = caminho_estado(csv_path)
+    estado = _estados.get(caminho)
+    if estado is None or novos.empty:
+        return None
+    if len(estado) and novos.concursos.min() <= estado.concursos[-1]:
+        _estados.pop(caminho, None)
+        return None
+    novos = novos.ordenar()
+    estado.acrescentar(novos.concursos, novos.mascaras)
+    estado.versao = versao
+    return estado
@@ -0,0 +1,56 @@
+import gzip
+import io
+
+try:
+    from Sistema import armazenamento, cache
+except ImportError:
+    import armazenamento
+    import cache
+
+# Arquivos de exportação da tela "Ver Dados" (sem dependência do Streamlit).
+# Os bytes só são gerados quando o download é pedido (st.download_button
+# aceita uma função em `data`) e ficam no cache da versão dos dados, por
+# intervalo de concursos e de datas, ordem e formato: reruns sem clique não serializam
+# nada e um segundo download igual sai pronto.
+
+FORMATOS = {
+    'csv': {'rotulo': 'CSV', 'extensao': 'csv', 'mime': 'text/csv'},
+    'csv.gz': {'rotulo': 'CSV compactado (gzip)', 'extensao': 'csv.gz', 'mime': 'application/gzip'},
+    'parquet': {'rotulo': 'Parquet', 'extensao': 'parquet', 'mime': 'application/octet-stream'},
+}
+
+def formatos_disponiveis():
+    """Formatos suportados no ambiente (Parquet só com pyarrow)"""
+    return [formato for formato in FORMATOS if formato != 'parquet' or armazenamento.pq is not None]
+
+def nome_arquivo(nome, formato):
+    return f"{nome}.{FORMATOS[formato]['extensao']}"
+
+def serializar(df, formato):
+    """Bytes do DataFrame no formato pedido (separador ; como o arquivo de dados)"""
+    if formato == 'parquet':
+        tabela = armazenamento.tabela_arrow(df)
+        buffer = io.BytesIO()
+        armazenamento.pq.write_table(tabela, buffer, compression='zstd')
+        return buffer.getvalue()
+    texto = df.to_csv(index=False, sep=';').encode('utf-8')
+    if formato == 'csv.gz':
+        # mtime fixo: o mesmo conteúdo gera sempre os mesmos bytes
+        return gzip.compress(texto, compresslevel=6, mtime=0)
+    if formato == 'csv':
+        return texto
+    raise ValueError(f"Formato desconhecido: {formato}")
+
+def arquivo(versao, visao, formato='csv', inicio=None, fim=None, chave='concurso', decrescente=False,
+            data_inicio=None, data_fim=None):
+    """Bytes da exportação das linhas com concurso em [inicio, fim] e data em [data_inicio, data_fim]
+
+    `visao` é a paginacao.VisaoPaginada da mesma versão; o resultado fica no
+    cache por (versão, formato, intervalos, ordem).
+    """
+    def gerar():
+        posicoes = visao.filtrar(inicio, fim, chave, decrescente, data_inicio, data_fim)
+        return serializar(visao.df.take(posicoes), formato)
+
+    return cache.obter('exportacao', versao, gerar,
+                       chave=(formato, inicio, fim, chave, decrescente, data_inicio, data_fim))
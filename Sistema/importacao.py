@@ -0,0 +1,202 @@
+import numpy as np
+
+try:
+    from Sistema import armazenamento, binario, cache, validacao
+    from Sistema.estado import registrar_concursos
+    from Sistema.sorteios import BaseSorteios, numeros_de_mascara
+except ImportError:
+    import armazenamento
+    import binario
+    import cache
+    import validacao
+    from estado import registrar_concursos
+    from sorteios import BaseSorteios, numeros_de_mascara
+
+# Importação em lote por mesclagem ordenada (sem dependência do Streamlit).
+# O histórico (retrato binário) e o arquivo importado são duas sequências em
+# ordem de concurso; a mesclagem intercala as duas em O(n + m) e resolve os
+# concursos presentes nas duas conforme a política:
+#   ignorar       mantém o registro atual
+#   sobrescrever  fica o registro importado
+#   inserir       só aceita concursos novos (conflito recusa a importação toda)
+# Registro idêntico ao atual nunca é conflito. Quando todo o arquivo vem depois
+# do último concurso, a gravação é só um acréscimo ao diário (cauda), sem
+# regravar o histórico; senão o arquivo principal é regravado uma vez.
+
+IGNORAR = 'ignorar'
+SOBRESCREVER = 'sobrescrever'
+INSERIR = 'inserir'
+
+POLITICAS = {
+    IGNORAR: 'Manter os atuais (ignorar os importados)',
+    SOBRESCREVER: 'Substituir pelos importados',
+    INSERIR: 'Só inserir (recusar o arquivo se houver conflito)',
+}
+
+class Mesclagem:
+    """Resultado da mesclagem de duas bases em ordem de concurso
+
+    `ordem` indexa a concatenação [existentes, novos] já na ordem final;
+    `atuais`/`importados` são os pares em conflito (mesmo concurso, conteúdo diferente).
+    """
+
+    __slots__ = ('existentes', 'novos', 'politica', 'ordem', 'cauda', 'inseridos', 'atuais', 'importados',
+                 'iguais')
+
+    def __init__(self, existentes, novos, politica, ordem, cauda, inseridos, atuais, importados, iguais):
+        self.existentes = existentes
+        self.novos = novos
+        self.politica = politica
+        self.ordem = ordem
+        self.cauda = cauda
+        self.inseridos = inseridos
+        self.atuais = atuais
+        self.importados = importados
+        self.iguais = iguais
+
+    @property
+    def recusada(self):
+        return self.politica == INSERIR and len(self.atuais) > 0
+
+    @property
+    def sobrescritos(self):
+        return len(self.atuais) if self.politica == SOBRESCREVER else 0
+
+    @property
+    def alteracoes(self):
+        """Quantidade de concursos gravados (inseridos + sobrescritos)"""
+        return 0 if self.recusada else len(self.inseridos) + self.sobrescritos
+
+    def resumo(self):
+        return {'inseridos': 0 if self.recusada else len(self.inseridos), 'sobrescritos': self.sobrescritos,
+                'conflitos': len(self.atuais), 'iguais': self.iguais, 'cauda': self.cauda,
+                'recusada': self.recusada}
+
+    def base(self):
+        """Base mesclada (BaseSorteios em ordem de concurso)"""
+        existentes, novos = self.existentes, self.novos
+        return BaseSorteios(np.concatenate([existentes.concursos, novos.concursos])[self.ordem],
+                            np.concatenate([existentes.datas, novos.datas])[self.ordem],
+                            np.concatenate([existentes.mascaras, novos.mascaras])[self.ordem])
+
+    def tabela(self, df_existentes, df_novos):
+        """DataFrame mesclado a partir dos DataFrames alinhados às duas bases (mantém a ordem das bolas)"""
+        import pandas as pd
+
+        return pd.concat([df_existentes, df_novos], ignore_index=True).take(self.ordem).reset_index(drop=True)
+
+    def conflitos(self):
+        """Relatório dos concursos em conflito: registro atual, importado e o que foi feito"""
+        import pandas as pd
+
+        acao = {IGNORAR: 'mantido o atual', SOBRESCREVER: 'substituído pelo importado',
+                INSERIR: 'importação recusada'}[self.politica]
+
+        def bolas(mascaras):
+            return [' '.join(f"{n:02d}" for n in numeros_de_mascara(m)) for m in mascaras]
+
+        def datas(valores):
+            return pd.to_datetime(valores).strftime('%d/%m/%Y')
+
+        return pd.DataFrame({
+            'Concurso': self.existentes.concursos[self.atuais].astype(np.int64),
+            'Data atual': datas(self.existentes.datas[self.atuais]),
+            'Bolas atuais': bolas(self.existentes.mascaras[self.atuais]),
+            'Data importada': datas(self.novos.datas[self.importados]),
+            'Bolas importadas': bolas(self.novos.mascaras[self.importados]),
+            'Ação': acao,
+        })
+
+def mesclar(existentes, novos, politica=IGNORAR):
+    """Mescla duas bases em ordem de concurso (novos sem concursos repetidos)"""
+    if politica not in POLITICAS:
+        raise ValueError(f"Política desconhecida: {politica}")
+    n = len(existentes)
+    concursos = np.concatenate([existentes.concursos, novos.concursos])
+    cauda = bool(n == 0 or novos.empty or novos.concursos[0] > existentes.concursos[-1])
+    if cauda:
+        ordem = np.arange(len(concursos))
+    else:
+        # Duas sequências já ordenadas: o sort estável (timsort) só intercala as duas, O(n + m)
+        ordem = np.argsort(concursos, kind='stable')
+    sequencia = concursos[ordem]
+    # Concurso nas duas bases: o atual vem logo antes do importado (sort estável)
+    repetidos = np.flatnonzero(sequencia[1:] == sequencia[:-1])
+    atuais, importados = ordem[repetidos], ordem[repetidos + 1] - n
+    datas_atuais, datas_novas = existentes.datas[atuais], novos.datas[importados]
+    iguais = ((existentes.mascaras[atuais] == novos.mascaras[importados])
+              & ((datas_atuais == datas_novas) | (np.isnat(datas_atuais) & np.isnat(datas_novas))))
+
+    descartar = np.zeros(len(ordem), dtype=bool)
+    if politica == SOBRESCREVER:
+        descartar[repetidos[~iguais]] = True
+        descartar[repetidos[iguais] + 1] = True
+    else:
+        descartar[repetidos + 1] = True
+    inseridos = np.ones(len(novos), dtype=bool)
+    inseridos[importados] = False
+
+    return Mesclagem(existentes, novos, politica, ordem[~descartar], cauda, np.flatnonzero(inseridos),
+                     atuais[~iguais], importados[~iguais], int(np.count_nonzero(iguais)))
+
+class Importacao:
+    """Importação planejada: arquivo validado, registros normalizados e a mesclagem com o histórico"""
+
+    __slots__ = ('csv_path', 'versao', 'registros', 'mesclagem')
+
+    def __init__(self, csv_path, versao, registros, mesclagem):
+        self.csv_path = csv_path
+        self.versao = versao
+        self.registros = registros
+        self.mesclagem = mesclagem
+
+def planejar(resultado, existentes, politica=IGNORAR, csv_path=armazenamento.CSV_PATH, versao=None):
+    """Mescla as linhas válidas de um validacao.Validacao com o histórico, sem gravar nada
+
+    `existentes` é a base atual em ordem de concurso (retrato binário) e `versao`
+    a versão dos dados de onde ela saiu.
+    """
+    if versao is None:
+        versao = cache.versao_dados(csv_path)
+    novos = resultado.base()
+    ordem = np.argsort(novos.concursos, kind='stable')
+    registros = resultado.registros().take(ordem).reset_index(drop=True)
+    return Importacao(csv_path, versao, registros, mesclar(existentes, novos.selecionar(ordem), politica))
+
+def aplicar(importacao):
+    """Grava a importação planejada; devolve a quantidade de concursos gravados
+
+    Cauda: um acréscimo ao diário e ao retrato binário. Caso contrário o
+    histórico é relido, mesclado e regravado uma vez (linhas em quarentena
+    continuam no arquivo).
+    """
+    import pandas as pd
+
+    mesclagem, csv_path = importacao.mesclagem, importacao.csv_path
+    if mesclagem.alteracoes == 0:
+        return 0
+    if cache.versao_dados(csv_path) != importacao.versao:
+        raise RuntimeError("Os dados mudaram desde a pré-visualização; envie o arquivo de novo.")
+
+    if mesclagem.cauda:
+        armazenamento.anexar_lote(importacao.registros.take(mesclagem.inseridos), csv_path)
+        cache.invalidar()
+        novos = mesclagem.novos.selecionar(mesclagem.inseridos)
+        binario.acrescentar(novos, csv_path, importacao.versao)
+        registrar_concursos(csv_path, novos, cache.versao_dados(csv_path))
+        return mesclagem.alteracoes
+
+    atual = armazenamento.carregar(csv_path)
+    resultado = validacao.validar(atual)
+    validas = resultado.validas
+    ordem = np.argsort(resultado.concursos[validas], kind='stable')
+    df_existentes = atual[validas].take(ordem)
+    if len(df_existentes) != len(mesclagem.existentes):
+        raise RuntimeError("O histórico não confere com o retrato binário; recarregue a página.")
+    df = mesclagem.tabela(df_existentes, importacao.registros)
+    if not validas.all():
+        df = pd.concat([df, atual[~validas]], ignore_index=True)
+    armazenamento.salvar(df, csv_path)
+    cache.invalidar()
+    binario.gravar_base(mesclagem.base(), csv_path)
+    return mesclagem.alteracoes
@@ -0,0 +1,86 @@
+import numpy as np
+
+try:
+    from Sistema.analise import NOMES_GRUPOS
+except ImportError:
+    from analise import NOMES_GRUPOS
+
+# Estatísticas de janelas móveis por somas acumuladas (sem dependência do Streamlit).
+# Com as somas prontas, a média de qualquer janela [a, b) custa O(1) e o
+# histograma de distribuições M x P custa O(número de distribuições).
+
+JANELAS_PADRAO = [100, 500, 2000, None]  # None = histórico completo
+
+def rotulo_distribuicao(total_melhores):
+    return f"{total_melhores}m x {15 - total_melhores}p"
+
+class SomasAcumuladas:
+    """Somas acumuladas das contagens por grupo e das distribuições M x P
+
+    Os concursos ficam em ordem cronológica: a janela dos últimos n é [N - n, N).
+    """
+
+    __slots__ = ('concursos', 'grupos', 'totais', 'distribuicoes')
+
+    def __init__(self, concursos, contagens_grupos):
+        contagens_grupos = np.asarray(contagens_grupos, dtype=np.uint8)
+        n = len(contagens_grupos)
+        self.concursos = np.asarray(concursos)
+
+        self.grupos = np.zeros((n + 1, 5), dtype=np.int32)
+        np.cumsum(contagens_grupos, axis=0, dtype=np.int32, out=self.grupos[1:])
+
+        # Uma coluna por distribuição presente no histórico (one-hot acumulado)
+        total_melhores = contagens_grupos[:, :3].sum(axis=1)
+        self.totais = np.unique(total_melhores)
+        self.distribuicoes = np.zeros((n + 1, len(self.totais)), dtype=np.int32)
+        np.cumsum(total_melhores[:, None] == self.totais, axis=0, dtype=np.int32, out=self.distribuicoes[1:])
+
+    @classmethod
+    def de_estado(cls, estado):
+        return cls(estado.concursos, estado.contagens_grupos)
+
+    def __len__(self):
+        return len(self.grupos) - 1
+
+    def ultimos(self, n=None):
+        """Intervalo [a, b) dos últimos n concursos (todos se n for None)"""
+        total = len(self)
+        if n is None or n >= total:
+            return 0, total
+        return total - n, total
+
+    def media(self, a, b):
+        """Média de cada grupo (G1..G5) na janela [a, b)"""
+        if b <= a:
+            return np.zeros(5)
+        return (self.grupos[b] - self.grupos[a]) / (b - a)
+
+    def histograma(self, a, b):
+        """Lista (distribuição, ocorrências) da janela, da mais para a menos comum"""
+        contagens = self.distribuicoes[b] - self.distribuicoes[a]
+        ordem = np.argsort(-contagens, kind='stable')
+        return [(rotulo_distribuicao(int(self.totais[i])), int(contagens[i])) for i in ordem if contagens[i]]
+
+    def resumo(self, n=None):
+        """Médias por grupo e distribuições mais comuns dos últimos n concursos"""
+        a, b = self.ultimos(n)
+        medias = self.media(a, b)
+        resumo = {f'media_{nome}': float(media) for nome, media in zip(NOMES_GRUPOS, medias)}
+        histograma = self.histograma(a, b)
+        resumo['distribuicoes_mais_comuns'] = histograma
+        resumo['total_concursos'] = sum(count for _, count in histograma)
+        resumo['concursos_analisados'] = b - a
+        return resumo
+
+def comparar_janelas(somas, janelas=JANELAS_PADRAO):
+    """Uma linha por janela com médias por grupo e a distribuição mais comum"""
+    linhas = []
+    for n in janelas:
+        a, b = somas.ultimos(n)
+        histograma = somas.histograma(a, b)
+        linha = {'janela': 'Todos' if n is None else str(n), 'concursos': b - a}
+        linha.update({nome: round(float(media), 2) for nome, media in zip(NOMES_GRUPOS, somas.media(a, b))})
+        linha['mais_comum'] = histograma[0][0] if histograma else '-'
+        linhas.append(linha)
+    return linhas
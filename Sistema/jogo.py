@@ -2,10 +2,26 @@ import streamlit as st
 import pandas as pd
 import os
 import io
-from collections import Counter
+from collections import deque
 from datetime import datetime
-import numpy as np
-import random
+
+try:
+    from Sistema import armazenamento, cache, medicao, nucleo, sintetico, validacao
+    from Sistema.componentes import exibir_conferencia_jogos, exibir_painel_medicao
+    from Sistema.janelas import JANELAS_PADRAO
+    from Sistema.nucleo import calcular_media_ultimos, gerar_sugestoes, intercalar_melhores_piores
+    from Sistema.sorteios import mascaras_de_bolas
+except ImportError:
+    import armazenamento
+    import cache
+    import medicao
+    import nucleo
+    import sintetico
+    import validacao
+    from componentes import exibir_conferencia_jogos, exibir_painel_medicao
+    from janelas import JANELAS_PADRAO
+    from nucleo import calcular_media_ultimos, gerar_sugestoes, intercalar_melhores_piores
+    from sorteios import mascaras_de_bolas
 
 # PARA STREAMLIT CLOUD - caminho relativo
 CSV_PATH = 'dados/lotofacil.csv'
@@ -17,41 +33,12 @@ def criar_arquivo_teste():
     try:
         os.makedirs('dados', exist_ok=True)
         
-        np.random.seed(42)
         num_concursos = 2500  # Aumentado para garantir pelo menos 2000 concursos
         
-        distribuicoes = [
-            (10, 5),
-            (9, 6),
-            (8, 7),
-            (11, 4),
-            (7, 8)
-        ]
-        
-        pesos = [35, 30, 20, 10, 5]
-        
-        concursos = []
-        for i in range(1, num_concursos + 1):
-            dist_idx = np.random.choice(len(distribuicoes), p=np.array(pesos)/100)
-            melhores_count, piores_count = distribuicoes[dist_idx]
-            
-            numeros_melhores = np.random.choice(range(1, 16), melhores_count, replace=False)
-            numeros_piores = np.random.choice(range(16, 26), piores_count, replace=False)
-            
-            numeros = np.concatenate([numeros_melhores, numeros_piores])
-            numeros.sort()
-            
-            concurso = {
-                'Concurso': i,
-                'Data Sorteio': (datetime.now() - pd.Timedelta(days=num_concursos - i)).strftime('%d/%m/%Y')
-            }
-            
-            for j, num in enumerate(numeros, 1):
-                concurso[f'Bola{j}'] = int(num)
-            concursos.append(concurso)
-        
-        df = pd.DataFrame(concursos)
-        df.to_csv(CSV_PATH, sep=';', index=False, encoding='utf-8')
+        # Mistura de distribuições M x P (melhores = 1 a 15, piores = 16 a 25) com pesos 35/30/20/10/5
+        data_inicial = (datetime.now() - pd.Timedelta(days=num_concursos - 1)).strftime('%Y-%m-%d')
+        sintetico.escrever(CSV_PATH, num_concursos, semente=42, mistura=sintetico.MISTURA_PADRAO,
+                           data_inicial=data_inicial)
         
         st.success(f"✅ Arquivo de teste criado com {num_concursos} concursos!")
         return True
@@ -64,115 +51,18 @@ def verificar_estrutura():
     if not os.path.exists('dados'):
         os.makedirs('dados', exist_ok=True)
 
-def intercalar_melhores_piores(melhores_sorted, piores_sorted):
-    resultado = []
-    max_len = max(len(melhores_sorted), len(piores_sorted))
-    for i in range(max_len):
-        if i < len(melhores_sorted):
-            resultado.append(melhores_sorted[i])
-        if i < len(piores_sorted):
-            resultado.append(piores_sorted[i])
-    return resultado
-
-def analisar_distribuicao_grupos(df):
-    todos_numeros = []
-    for i in range(1, 16):
-        coluna = f'Bola{i}'
-        if coluna in df.columns:
-            numeros_coluna = pd.to_numeric(df[coluna], errors='coerce').dropna().astype(int).tolist()
-            todos_numeros.extend(numeros_coluna)
-    frequencia = Counter(todos_numeros)
-    
-    numeros_ordenados = sorted(range(1, 26), key=lambda x: frequencia.get(x, 0), reverse=True)
-    
-    grupos_melhores = [
-        numeros_ordenados[0:5],
-        numeros_ordenados[5:10],
-        numeros_ordenados[10:15]
-    ]
-    grupos_piores = [
-        numeros_ordenados[15:20],
-        numeros_ordenados[20:25]
-    ]
-    return grupos_melhores, grupos_piores, frequencia
-
-def analisar_padrao_concursos(df, grupos_melhores, grupos_piores):
-    padroes = []
-    for idx, row in df.iterrows():
-        numeros_concurso = []
-        for i in range(1, 16):
-            coluna = f'Bola{i}'
-            if coluna in row and pd.notna(row[coluna]):
-                try:
-                    numeros_concurso.append(int(row[coluna]))
-                except (ValueError, TypeError):
-                    continue
-        
-        # CORREÇÃO PRINCIPAL: Removida a verificação que limitava a 15 números
-        # A Lotofácil sempre tem 15 números, então se tivermos 15, está correto
-        if len(numeros_concurso) != 15:
-            continue
-        
-        contagem_grupos = {
-            'melhores_g1': len(set(numeros_concurso) & set(grupos_melhores[0])),
-            'melhores_g2': len(set(numeros_concurso) & set(grupos_melhores[1])),
-            'melhores_g3': len(set(numeros_concurso) & set(grupos_melhores[2])),
-            'piores_g1': len(set(numeros_concurso) & set(grupos_piores[0])),
-            'piores_g2': len(set(numeros_concurso) & set(grupos_piores[1]))
-        }
-        
-        total_melhores = contagem_grupos['melhores_g1'] + contagem_grupos['melhores_g2'] + contagem_grupos['melhores_g3']
-        total_piores = contagem_grupos['piores_g1'] + contagem_grupos['piores_g2']
-        
-        padroes.append({
-            'concurso': row['Concurso'],
-            'melhores_g1': contagem_grupos['melhores_g1'],
-            'melhores_g2': contagem_grupos['melhores_g2'],
-            'melhores_g3': contagem_grupos['melhores_g3'],
-            'piores_g1': contagem_grupos['piores_g1'],
-            'piores_g2': contagem_grupos['piores_g2'],
-            'total_melhores': total_melhores,
-            'total_piores': total_piores,
-            'distribuicao': f"{total_melhores}m x {total_piores}p"
-        })
-    return padroes
-
-def calcular_media_ultimos(padroes_recentes, n=2000):
-    """Calcula médias dos últimos N concursos"""
-    if len(padroes_recentes) < n:
-        concursos_analisados = padroes_recentes
-    else:
-        concursos_analisados = padroes_recentes[:n]
-    
-    # Calcular médias reais dos últimos concursos
-    media_melhores_g1 = np.mean([p['melhores_g1'] for p in concursos_analisados])
-    media_melhores_g2 = np.mean([p['melhores_g2'] for p in concursos_analisados])
-    media_melhores_g3 = np.mean([p['melhores_g3'] for p in concursos_analisados])
-    media_piores_g1 = np.mean([p['piores_g1'] for p in concursos_analisados])
-    media_piores_g2 = np.mean([p['piores_g2'] for p in concursos_analisados])
-    
-    return {
-        'media_melhores_g1': media_melhores_g1,
-        'media_melhores_g2': media_melhores_g2,
-        'media_melhores_g3': media_melhores_g3,
-        'media_piores_g1': media_piores_g1,
-        'media_piores_g2': media_piores_g2,
-        'concursos_analisados': len(concursos_analisados)
-    }
-
-def exibir_estatisticas_concursos(padroes_recentes, n_analise):
+def exibir_estatisticas_concursos(somas, n_analise):
     """Exibe estatísticas dos últimos N concursos de forma otimizada"""
     
     # Determinar quantos concursos analisar
-    n = min(n_analise, len(padroes_recentes))
-    padroes_analise = padroes_recentes[:n]
+    n = len(somas) if n_analise is None else min(n_analise, len(somas))
     
-    # Calcular estatísticas
-    dist_melhores_piores = Counter([p['distribuicao'] for p in padroes_analise])
-    analise = calcular_media_ultimos(padroes_recentes, n=n)
+    # Calcular estatísticas (O(1) por janela com as somas acumuladas)
+    with medicao.etapa('estatisticas'):
+        analise = calcular_media_ultimos(somas, n)
     
     # Exibir informações
-    if n < n_analise:
+    if n_analise is not None and n < n_analise:
         st.warning(f"⚠️ Apenas {n} concursos disponíveis (ideal: {n_analise} para análise completa)")
         st.write(f"**📈 Estatísticas dos {n} Concursos Disponíveis:**")
     else:
@@ -184,7 +74,7 @@ def exibir_estatisticas_concursos(padroes_recentes, n_analise):
         st.write(f"**Total de concursos analisados: {n}**")
         
         st.write("**Distribuições mais comuns:**")
-        for dist, count in dist_melhores_piores.most_common(5):
+        for dist, count in analise['distribuicoes_mais_comuns'][:5]:
             st.write(f"• {dist}: {count} vezes")
     
     with col2:
@@ -197,102 +87,30 @@ def exibir_estatisticas_concursos(padroes_recentes, n_analise):
 
 # ---------------------------- Função principal corrigida ----------------------------
 
-def gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, padroes_recentes):
-    sugestoes = []
-    
-    # Analisar os últimos 2000 concursos
-    ultimos_2000 = padroes_recentes[:2000] if len(padroes_recentes) >= 2000 else padroes_recentes
-
-    # Contar distribuições nos últimos 2000 concursos
-    dist_counter_2000 = Counter([p['distribuicao'] for p in ultimos_2000])
-    distribuicoes_mais_comuns_2000 = dist_counter_2000.most_common(5)
-    total_ocorrencias_2000 = sum(dist_counter_2000.values())
+def gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, somas, n=2000):
+    # Cálculo no núcleo (sem Streamlit); aqui só a exibição
+    with medicao.etapa('sugestoes'):
+        analise, distribuicoes, sugestoes = gerar_sugestoes(grupos_melhores, grupos_piores, somas, n)
+    distribuicoes_mais_comuns = analise['distribuicoes_mais_comuns'][:5]
+    total_ocorrencias = analise['total_concursos']
 
-    st.write("📈 **Estatísticas dos Últimos 2000 Concursos:**")
-    for i, (dist, count) in enumerate(distribuicoes_mais_comuns_2000, 1):
+    st.write(f"📈 **Estatísticas dos Últimos {analise['concursos_analisados']} Concursos:**")
+    for i, (dist, count) in enumerate(distribuicoes_mais_comuns, 1):
         st.write(f"{i} - {dist}: {count} vezes")
-    st.write(f"**Total:** {total_ocorrencias_2000} vezes")
+    st.write(f"**Total:** {total_ocorrencias} vezes")
     st.write("---")
 
     # Verificar se temos pelo menos 3 distribuições
-    if len(distribuicoes_mais_comuns_2000) < 3:
-        st.error(f"❌ Apenas {len(distribuicoes_mais_comuns_2000)} distribuições distintas encontradas.")
+    if len(distribuicoes_mais_comuns) < 3:
+        st.error(f"❌ Apenas {len(distribuicoes_mais_comuns)} distribuições distintas encontradas.")
         return []
 
-    # Pegar as 3 distribuições mais comuns
-    top3_distribuicoes = [dist for dist, _ in distribuicoes_mais_comuns_2000[:3]]
-
-    # Gerar 2 jogos para cada uma das 3 distribuições mais comuns
-    for dist_idx, distribuicao in enumerate(top3_distribuicoes):
-        st.write(f"🎯 **Gerando 2 jogos para: {distribuicao}** ({dist_idx + 1}ª distribuição mais comum)")
-        
-        jogos_gerados = 0
-        tentativas = 0
-        max_tentativas = 2000
-
-        while jogos_gerados < 2 and tentativas < max_tentativas:
-            tentativas += 1
-
-            # Extrair m_count e p_count da distribuição
-            try:
-                partes = distribuicao.replace('m', '').replace('p', '').split(' x ')
-                m_count = int(partes[0])
-                p_count = int(partes[1])
-            except Exception:
-                m_count, p_count = 10, 5
-
-            # Distribuição mais inteligente entre grupos
-            if m_count == 10 and p_count == 5:
-                targets = (4, 3, 3, 3, 2)  # G1, G2, G3, P1, P2
-            elif m_count == 9 and p_count == 6:
-                targets = (3, 3, 3, 3, 3)  # G1, G2, G3, P1, P2
-            elif m_count == 8 and p_count == 7:
-                targets = (3, 3, 2, 4, 3)  # G1, G2, G3, P1, P2
-            elif m_count == 11 and p_count == 4:
-                targets = (4, 4, 3, 2, 2)  # G1, G2, G3, P1, P2
-            else:
-                # Distribuição genérica
-                targets = (
-                    max(1, min(5, (m_count + 1) // 3)),
-                    max(1, min(5, m_count // 3)),
-                    max(1, min(5, m_count - ((m_count + 1) // 3) - (m_count // 3))),
-                    max(1, min(5, (p_count + 1) // 2)),
-                    max(1, min(5, p_count - ((p_count + 1) // 2)))
-                )
-
-            target_melhores_g1, target_melhores_g2, target_melhores_g3, target_piores_g1, target_piores_g2 = targets
-
-            try:
-                selecao_melhores_g1 = random.sample(grupos_melhores[0], target_melhores_g1)
-                selecao_melhores_g2 = random.sample(grupos_melhores[1], target_melhores_g2)
-                selecao_melhores_g3 = random.sample(grupos_melhores[2], target_melhores_g3)
-                selecao_piores_g1 = random.sample(grupos_piores[0], target_piores_g1)
-                selecao_piores_g2 = random.sample(grupos_piores[1], target_piores_g2)
-            except ValueError:
-                continue
-
-            jogo = selecao_melhores_g1 + selecao_melhores_g2 + selecao_melhores_g3 + selecao_piores_g1 + selecao_piores_g2
-
-            if len(jogo) == 15 and len(set(jogo)) == 15:
-                jogo_ordenado = sorted(jogo)
-                chave = tuple(jogo_ordenado)
-
-                # Verificar se já não geramos esta combinação
-                if all(s['chave'] != chave for s in sugestoes):
-                    sugestoes.append({
-                        'chave': chave,
-                        'jogo': jogo_ordenado,
-                        'distribuicao_origem': distribuicao,
-                        'posicao_distribuicao': dist_idx + 1,
-                        'melhores_g1': selecao_melhores_g1,
-                        'melhores_g2': selecao_melhores_g2,
-                        'melhores_g3': selecao_melhores_g3,
-                        'piores_g1': selecao_piores_g1,
-                        'piores_g2': selecao_piores_g2
-                    })
-                    jogos_gerados += 1
-
-        st.write(f"✅ **{jogos_gerados} jogos gerados para {distribuicao}**")
+    # 2 jogos para cada uma das 3 distribuições mais comuns
+    for info in distribuicoes:
+        st.write(f"🎯 **Gerando 2 jogos para: {info['distribuicao']}** ({info['posicao']}ª distribuição mais comum)")
+        if info['espaco'] < 2:
+            st.warning(f"⚠️ O padrão {info['alvos']} admite apenas {info['espaco']} jogo(s) com os grupos atuais")
+        st.write(f"✅ **{info['jogos']} jogos gerados para {info['distribuicao']}**")
 
     st.write("---")
     st.write("🎉 **Resumo Final das Sugestões:**")
@@ -308,7 +126,7 @@ def exibir_jogo():
     st.header("📊 Análise de Jogos - Lotofácil")
     
     # Se arquivo não existe, mostrar opções
-    if not os.path.exists(CSV_PATH):
+    if not armazenamento.existe_dados(CSV_PATH):
         st.warning("📁 Arquivo de dados não encontrado")
         
         col1, col2 = st.columns(2)
@@ -327,19 +145,23 @@ def exibir_jogo():
     
     # Se arquivo existe, carregar e mostrar análise
     try:
-        df = pd.read_csv(CSV_PATH, sep=';', encoding='utf-8')
+        # Dados e análises (núcleo sem Streamlit) ficam em cache enquanto o conteúdo dos arquivos não mudar
+        with medicao.etapa('carregar_dados'):
+            analise = nucleo.carregar_analise(CSV_PATH)
+            base = analise.base
         
-        # Ordenar por concurso (mais recentes primeiro)
-        df = df.sort_values('Concurso', ascending=False).reset_index(drop=True)
+        if base.empty:
+            st.warning("📝 Nenhum concurso válido no arquivo de dados.")
+            return
         
         # Informações básicas
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("📈 Total de Concursos", len(df))
+            st.metric("📈 Total de Concursos", len(base))
         with col2:
-            st.metric("🎯 Primeiro Concurso", df['Concurso'].min())
+            st.metric("🎯 Primeiro Concurso", int(base.concursos.min()))
         with col3:
-            st.metric("🔥 Último Concurso", df['Concurso'].max())
+            st.metric("🔥 Último Concurso", int(base.concursos.max()))
         
         st.markdown("---")
         
@@ -347,7 +169,10 @@ def exibir_jogo():
         st.subheader("🎯 Análise Avançada por Grupos de 5")
         
         # Calcular grupos
-        grupos_melhores, grupos_piores, frequencia = analisar_distribuicao_grupos(df)
+        # Estado incremental: contagens, grupos e padrões só processam concursos novos
+        with medicao.etapa('analise_grupos'):
+            grupos_melhores, grupos_piores = analise.grupos()
+            frequencia = analise.frequencia()
         
         # Exibir grupos
         col1, col2 = st.columns(2)
@@ -365,12 +190,24 @@ def exibir_jogo():
                 st.write(f"**Grupo {i+3}:** {', '.join(numeros_com_freq)}")
         
         # Analisar padrões recentes
-        padroes_recentes = analisar_padrao_concursos(df, grupos_melhores, grupos_piores)
+        with medicao.etapa('analise_padroes'):
+            padroes_recentes = analise.padroes()
+            
+            # Somas acumuladas para estatísticas de qualquer janela
+            somas = analise.somas
         
         # Mostrar análise dos últimos concursos
         st.markdown("---")
         st.subheader("📊 Análise dos Últimos Concursos")
         
+        janela = st.selectbox(
+            "Janela de análise",
+            JANELAS_PADRAO,
+            index=JANELAS_PADRAO.index(2000),
+            format_func=lambda n: "Todos os concursos" if n is None else f"Últimos {n} concursos",
+            key='janela_analise'
+        )
+        
         if padroes_recentes:
             # Criar DataFrame para exibição (apenas primeiros 30 padrões para visualização)
             df_padroes = pd.DataFrame(padroes_recentes[:30])  # Mostrar apenas 30 para visualização
@@ -394,7 +231,7 @@ def exibir_jogo():
             )
             
             # ESTATÍSTICAS DOS ÚLTIMOS CONCURSOS (CÓDIGO OTIMIZADO)
-            exibir_estatisticas_concursos(padroes_recentes, 2000)
+            exibir_estatisticas_concursos(somas, janela)
 
         # SUGESTÕES INTELIGENTES
         st.markdown("---")
@@ -404,10 +241,12 @@ def exibir_jogo():
             if not padroes_recentes:
                 st.error("❌ Não há dados suficientes para análise")
             else:
-                sugestoes = gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, padroes_recentes)
+                sugestoes = gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, somas, janela)
                 
                 if sugestoes:
-                    st.success(f"🎉 {len(sugestoes)} sugestões geradas com base nas 3 distribuições mais comuns dos últimos 2000 concursos!")
+                    # Guardadas na sessão para a conferência no histórico abaixo
+                    st.session_state['sugestoes_jogos'] = mascaras_de_bolas([sugestao['jogo'] for sugestao in sugestoes])
+                    st.success(f"🎉 {len(sugestoes)} sugestões geradas com base nas 3 distribuições mais comuns da janela escolhida!")
                     
                     for i, sugestao in enumerate(sugestoes, 1):
                         st.markdown(f"##### 💡 Sugestão {i} - {sugestao['distribuicao_origem']} ({sugestao['posicao_distribuicao']}ª distribuição mais comum)")
@@ -470,14 +309,20 @@ def exibir_jogo():
                 else:
                     st.error("❌ Não foi possível gerar sugestões com os padrões atuais")
         
+        # Conferência dos jogos contra todo o histórico
+        st.markdown("---")
+        with st.expander("🧪 Conferência de Jogos no Histórico (11 a 15 pontos)"):
+            exibir_conferencia_jogos(base, st.session_state.get('sugestoes_jogos'), "💡 Últimas sugestões geradas",
+                                     "Gere sugestões acima ou envie um arquivo CSV")
+
         # Botão para recarregar arquivo
         st.markdown("---")
         col_rec1, col_rec2, col_rec3 = st.columns([1, 1, 1])
         
         with col_rec2:
             if st.button("🔄 Carregar Novo Arquivo CSV", key='recarregar_csv'):
-                if os.path.exists(CSV_PATH):
-                    os.remove(CSV_PATH)
+                armazenamento.remover_dados(CSV_PATH)
+                cache.invalidar()
                 st.rerun()
             
     except Exception as e:
@@ -506,24 +351,41 @@ def exibir_secao_upload():
             content = uploaded_file.getvalue().decode('utf-8')
             df = pd.read_csv(io.StringIO(content), sep=';')
             
-            colunas_necessarias = ['Concurso', 'Data Sorteio']
-            colunas_validas = all(col in df.columns for col in colunas_necessarias)
+            # Validar o arquivo inteiro; linhas com problema ficam no relatório de quarentena
+            resultado = validacao.validar(df)
             
-            if colunas_validas:
-                os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
-                
-                with open(CSV_PATH, 'wb') as f:
-                    f.write(uploaded_file.getvalue())
-                
+            if resultado.faltantes:
+                st.error(f"❌ Arquivo inválido. Colunas faltantes: {', '.join(resultado.faltantes)}")
+                return
+            
+            os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
+            
+            with open(CSV_PATH, 'wb') as f:
+                f.write(uploaded_file.getvalue())
+            cache.invalidar()
+            
+            if resultado.total_invalidas:
+                caminho = validacao.caminho_quarentena(CSV_PATH, 'upload')
+                validacao.gravar_quarentena(resultado, caminho)
+                st.success(f"✅ Arquivo carregado: {len(df) - resultado.total_invalidas} concursos válidos.")
+                st.warning(f"⚠️ {resultado.total_invalidas} linha(s) em quarentena (fora das análises), relatório em {caminho}")
+                for motivo, quantidade in resultado.resumo().items():
+                    st.write(f"- {motivo}: {quantidade}")
+                if st.button("▶️ Continuar", type="primary"):
+                    st.rerun()
+            else:
                 st.success("✅ Arquivo carregado com sucesso!")
                 st.balloons()
                 st.rerun()
-            else:
-                st.error("❌ Arquivo inválido. Verifique as colunas necessárias.")
                 
         except Exception as e:
             st.error(f"❌ Erro ao processar arquivo: {str(e)}")
 
 # Executar o aplicativo
 if __name__ == "__main__":
-    exibir_jogo()
\ No newline at end of file
+    painel_medicao = st.sidebar.toggle("⏱️ Painel de Desempenho", key='painel_medicao')
+    medicoes = st.session_state.setdefault('medicoes', deque(maxlen=medicao.MAX_HISTORICO))
+    with medicao.rerun('exibir_jogo', medicoes):
+        exibir_jogo()
+    if painel_medicao:
+        exibir_painel_medicao(medicoes)
\ No newline at end of file
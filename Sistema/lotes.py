@@ -0,0 +1,131 @@
+import io
+
+import numpy as np
+
+try:
+    from Sistema.combinacoes import amostrar_padrao, tamanho_espaco
+    from Sistema.sorteios import COLUNAS_BOLAS, bolas_de_mascaras
+except ImportError:
+    from combinacoes import amostrar_padrao, tamanho_espaco
+    from sorteios import COLUNAS_BOLAS, bolas_de_mascaras
+
+# Geração de sugestões em lote (milhares de jogos por pedido), sem dependência
+# do Streamlit. Os jogos são repartidos entre as distribuições mais comuns na
+# proporção da frequência histórica de cada uma e sorteados de forma vetorizada
+# no espaço de cada padrão (combinacoes.amostrar_padrao). Com a mesma semente e
+# os mesmos grupos, o lote é sempre o mesmo; sem semente, uma é sorteada e
+# guardada no lote para que ele possa ser refeito.
+
+LIMITE_LOTE = 100_000
+
+def repartir(quantidade, pesos, capacidades):
+    """Divide a quantidade proporcionalmente aos pesos sem passar da capacidade de cada parte
+
+    Usa o método dos maiores restos; o que sobra de partes cheias vai para as demais.
+    """
+    pesos = np.asarray(pesos, dtype=np.float64)
+    capacidades = np.asarray(capacidades, dtype=np.int64)
+    cotas = np.zeros(len(pesos), dtype=np.int64)
+    restante = min(int(quantidade), int(capacidades.sum()))
+    while restante > 0:
+        abertas = (cotas < capacidades) & (pesos > 0)
+        if not abertas.any():
+            abertas = cotas < capacidades
+            pesos = np.ones(len(pesos))
+        ideal = np.where(abertas, restante * pesos / pesos[abertas].sum(), 0.0)
+        extra = np.floor(ideal).astype(np.int64)
+        faltam = restante - extra.sum()
+        if faltam:
+            ordem = np.argsort(-(ideal - extra), kind='stable')
+            extra[ordem[:faltam]] += 1
+        extra = np.minimum(extra, capacidades - cotas)
+        cotas += extra
+        restante -= int(extra.sum())
+    return cotas
+
+class LoteJogos:
+    """Jogos de um lote (máscaras), a distribuição de origem de cada um, a semente e a quantidade pedida"""
+
+    __slots__ = ('mascaras', 'origem', 'distribuicoes', 'semente', 'quantidade')
+
+    def __init__(self, mascaras, origem, distribuicoes, semente=None, quantidade=None):
+        self.mascaras = np.asarray(mascaras, dtype=np.uint32)
+        self.origem = np.asarray(origem, dtype=np.uint8)
+        self.distribuicoes = distribuicoes
+        self.semente = semente
+        self.quantidade = len(self.mascaras) if quantidade is None else quantidade
+
+    def __len__(self):
+        return len(self.mascaras)
+
+    @property
+    def bolas(self):
+        """Matriz N x 15 com os números de cada jogo em ordem crescente"""
+        return bolas_de_mascaras(self.mascaras)
+
+    def resumo(self):
+        """Uma linha por distribuição: padrão por grupo, peso, espaço e jogos gerados"""
+        return [{
+            'distribuicao': d['distribuicao'],
+            'grupos': ', '.join(map(str, d['alvos'])),
+            'peso': d['peso'],
+            'espaco': d['espaco'],
+            'jogos': d['jogos'],
+        } for d in self.distribuicoes]
+
+    def para_dataframe(self, limite=None):
+        """Jogos numerados com a distribuição de origem (só os `limite` primeiros, se indicado)"""
+        import pandas as pd
+
+        n = len(self) if limite is None else min(int(limite), len(self))
+        df = pd.DataFrame(bolas_de_mascaras(self.mascaras[:n]), columns=COLUNAS_BOLAS)
+        rotulos = np.array([d['distribuicao'] for d in self.distribuicoes] or [''], dtype=object)
+        df.insert(0, 'Jogo', np.arange(1, n + 1))
+        df['Distribuicao'] = rotulos[self.origem[:n]]
+        return df
+
+    def para_csv(self):
+        return self.para_dataframe().to_csv(sep=';', index=False).encode('utf-8')
+
+    def para_parquet(self):
+        buffer = io.BytesIO()
+        self.para_dataframe().to_parquet(buffer, index=False)
+        return buffer.getvalue()
+
+def gerar_lote(grupos, distribuicoes, quantidade, semente=None):
+    """Gera até `quantidade` jogos distintos repartidos entre as distribuições
+
+    distribuicoes: lista de (rótulo, alvos por grupo, peso), ex.
+    [('10m x 5p', (4, 3, 3, 3, 2), 412), ...]. Distribuições com os mesmos
+    alvos são somadas (o espaço é o mesmo). Se os espaços somados tiverem
+    menos jogos que o pedido, o lote sai com todos eles. Sem semente, uma é
+    sorteada e fica em `LoteJogos.semente`.
+    """
+    quantidade = min(int(quantidade), LIMITE_LOTE)
+    if semente is None:
+        semente = int(np.random.SeedSequence().entropy % (1 << 32))
+    unicas = {}
+    for rotulo, alvos, peso in distribuicoes:
+        alvos = tuple(int(k) for k in alvos)
+        if alvos in unicas:
+            unicas[alvos]['peso'] += int(peso)
+            unicas[alvos]['distribuicao'] += f" / {rotulo}"
+        else:
+            unicas[alvos] = {'distribuicao': rotulo, 'alvos': alvos, 'peso': int(peso),
+                             'espaco': tamanho_espaco(grupos, alvos), 'jogos': 0}
+    partes = list(unicas.values())
+
+    cotas = repartir(quantidade, [p['peso'] for p in partes], [p['espaco'] for p in partes])
+    rng = np.random.default_rng(semente)
+    mascaras, origem = [], []
+    for indice, (parte, cota) in enumerate(zip(partes, cotas)):
+        if cota == 0:
+            continue
+        sorteadas, _ = amostrar_padrao(grupos, parte['alvos'], int(cota), rng)
+        parte['jogos'] = len(sorteadas)
+        mascaras.append(sorteadas)
+        origem.append(np.full(len(sorteadas), indice, dtype=np.uint8))
+
+    if not mascaras:
+        return LoteJogos(np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint8), partes, semente, quantidade)
+    return LoteJogos(np.concatenate(mascaras), np.concatenate(origem), partes, semente, quantidade)
@@ -0,0 +1,120 @@
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Tempo das etapas de cada rerun das telas (sem dependência do Streamlit).
+# A tela roda inteira dentro de `rerun(tela)` e os trechos de cálculo dentro de
+# `etapa(nome)`; o tempo que nenhuma etapa cobre é a renderização (widgets e
+# formatação). Etapas dentro de outra etapa não são contadas em separado.
+#
+# Com a variável de ambiente LOTOFACIL_PERFIL definida, cada rerun também grava
+# um arquivo do cProfile para análise offline (o valor é a pasta; 1 usa a
+# pasta padrão):
+#
+#   LOTOFACIL_PERFIL=1 streamlit run app.py
+#   python -m pstats dados/perfis/exibir_jogo_20250101-120000-000000.prof
+
+VARIAVEL_PERFIL = 'LOTOFACIL_PERFIL'
+PASTA_PERFIS = 'dados/perfis'
+RENDERIZACAO = 'renderizacao'
+MAX_HISTORICO = 20
+
+_local = threading.local()
+
+class Medicao:
+    """Tempos (segundos) das etapas de um rerun de uma tela"""
+
+    __slots__ = ('tela', 'inicio', 'etapas', 'total', 'perfil')
+
+    def __init__(self, tela):
+        self.tela = tela
+        self.inicio = datetime.now()
+        self.etapas = {}
+        self.total = 0.0
+        self.perfil = None
+
+    def registrar(self, nome, segundos):
+        self.etapas[nome] = self.etapas.get(nome, 0.0) + segundos
+
+    @property
+    def renderizacao(self):
+        return max(self.total - sum(self.etapas.values()), 0.0)
+
+    def tempos(self):
+        """Etapas na ordem em que rodaram, mais a renderização"""
+        return {**self.etapas, RENDERIZACAO: self.renderizacao}
+
+def pasta_perfis():
+    """Pasta dos arquivos do cProfile (None se a variável de ambiente não estiver definida)"""
+    valor = os.environ.get(VARIAVEL_PERFIL, '').strip()
+    if valor.lower() in ('', '0', 'false', 'nao', 'não'):
+        return None
+    return PASTA_PERFIS if valor.lower() in ('1', 'true', 'sim') else valor
+
+def atual():
+    """Medição do rerun em andamento nesta thread (None fora de `rerun`)"""
+    return getattr(_local, 'medicao', None)
+
+@contextmanager
+def rerun(tela, historico=None):
+    """Mede um rerun da tela; ao final a medição vai para `historico` (deque), se houver
+
+    Também termina quando a tela interrompe o script (st.rerun/st.stop).
+    """
+    medicao = Medicao(tela)
+    anterior, _local.medicao, _local.profundidade = atual(), medicao, 0
+    pasta = pasta_perfis()
+    perfilador = None
+    if pasta is not None:
+        perfilador = cProfile.Profile()
+        try:
+            perfilador.enable()
+        except ValueError:  # outro perfilador ativo (outra sessão no mesmo processo)
+            perfilador = None
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        medicao.total = time.perf_counter() - inicio
+        _local.medicao = anterior
+        if perfilador is not None:
+            perfilador.disable()
+            os.makedirs(pasta, exist_ok=True)
+            medicao.perfil = os.path.join(pasta, f"{tela}_{medicao.inicio:%Y%m%d-%H%M%S-%f}.prof")
+            perfilador.dump_stats(medicao.perfil)
+        if historico is not None:
+            historico.append(medicao)
+
+@contextmanager
+def etapa(nome):
+    """Soma o tempo do bloco à etapa `nome` do rerun em andamento (sem efeito fora de `rerun`)"""
+    medicao = atual()
+    if medicao is None or _local.profundidade > 0:
+        yield
+        return
+    _local.profundidade += 1
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao.registrar(nome, time.perf_counter() - inicio)
+        _local.profundidade -= 1
+
+def tabela(historico):
+    """DataFrame dos reruns (mais recente primeiro) com o tempo de cada etapa em milissegundos"""
+    import pandas as pd
+
+    linhas = []
+    for medicao in reversed(historico):
+        linha = {'Tela': medicao.tela, 'Hora': f"{medicao.inicio:%H:%M:%S}"}
+        linha.update({nome: round(segundos * 1000, 1) for nome, segundos in medicao.tempos().items()})
+        linha['total'] = round(medicao.total * 1000, 1)
+        linhas.append(linha)
+    df = pd.DataFrame(linhas)
+    # Colunas de etapas na ordem da primeira aparição, renderização e total no fim
+    fixas = ['Tela', 'Hora', RENDERIZACAO, 'total']
+    etapas = [coluna for coluna in df.columns if coluna not in fixas]
+    return df.reindex(columns=['Tela', 'Hora'] + etapas + [RENDERIZACAO, 'total']) if linhas else df
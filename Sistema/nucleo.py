@@ -0,0 +1,205 @@
+from collections import Counter
+
+import numpy as np
+
+try:
+    from Sistema.analise import (alvos_por_distribuicao, calcular_padroes, dividir_grupos, padroes_para_lista,
+                                 ranking_por_frequencia)
+    from Sistema.combinacoes import amostrar_padrao, numeros_por_grupo
+    from Sistema.sorteios import NUMEROS, numeros_de_mascara
+except ImportError:
+    from analise import (alvos_por_distribuicao, calcular_padroes, dividir_grupos, padroes_para_lista,
+                         ranking_por_frequencia)
+    from combinacoes import amostrar_padrao, numeros_por_grupo
+    from sorteios import NUMEROS, numeros_de_mascara
+
+# Núcleo das análises, sem Streamlit: frequência, grupos, padrões, janelas e
+# geração de sugestões. As telas (app.py, Sistema/jogo.py, Sistema/dados.py)
+# só exibem o que sai daqui; jobs em lote e testes importam este módulo direto.
+# A importação carrega apenas numpy: pandas/pyarrow entram com o armazenamento
+# em carregar_analise, então o import a frio fica bem abaixo de 150 ms. O
+# histórico vem do retrato binário (Sistema/binario.py), sem parsing de CSV.
+
+CSV_PATH = 'dados/lotofacil.csv'
+
+class Analise:
+    """Histórico de uma versão dos dados com o estado incremental e as somas por janela"""
+
+    __slots__ = ('versao', 'base', 'estado', 'somas', 'csv_path')
+
+    def __init__(self, versao, base, estado, somas, csv_path=None):
+        self.versao = versao
+        self.base = base
+        self.estado = estado
+        self.somas = somas
+        self.csv_path = csv_path
+
+    @property
+    def empty(self):
+        return self.base.empty
+
+    def grupos(self):
+        return self.estado.grupos()
+
+    def frequencia(self):
+        return self.estado.frequencia()
+
+    def padroes(self):
+        """Lista de padrões por concurso, do mais recente ao mais antigo"""
+        if self.versao is None:
+            return padroes_para_lista(self.estado.padroes(decrescente=True))
+        try:
+            from Sistema import cache
+        except ImportError:
+            import cache
+        return cache.obter('padroes', self.versao, lambda: padroes_para_lista(self.estado.padroes(decrescente=True)))
+
+    def coocorrencia(self):
+        """Contagens de pares (25 x 25) e trios, persistidas junto do estado quando há arquivo"""
+        try:
+            from Sistema.estado import obter_coocorrencia
+        except ImportError:
+            from estado import obter_coocorrencia
+        return obter_coocorrencia(self.estado, self.csv_path)
+
+    def atrasos(self, concurso=None):
+        """Atraso de cada número logo após o concurso indicado (None = último)
+
+        Lista de dicionários com numero, ultimo_concurso (None se nunca saiu),
+        atraso, maior_atraso e histograma ({atraso: vezes} dos atrasos encerrados).
+        """
+        try:
+            from Sistema.estado import obter_atrasos
+        except ImportError:
+            from estado import obter_atrasos
+        concursos = self.estado.concursos
+        posicao = None
+        if concurso is not None:
+            # Último concurso da base que não passa do pedido
+            posicao = int(np.searchsorted(concursos, concurso, side='right')) - 1
+        situacao = obter_atrasos(self.estado, self.csv_path).situacao(self.estado.mascaras, posicao)
+        return [{'numero': j + 1,
+                 'ultimo_concurso': int(concursos[situacao['ultimo'][j]]) if situacao['ultimo'][j] >= 0 else None,
+                 'atraso': int(situacao['atraso'][j]),
+                 'maior_atraso': int(situacao['maximo'][j]),
+                 'histograma': {g: int(v) for g, v in enumerate(situacao['histograma'][j]) if v}}
+                for j in range(25)]
+
+def carregar_analise(csv_path=CSV_PATH):
+    """Carrega o histórico e as análises derivadas, reaproveitando o cache da versão atual"""
+    try:
+        from Sistema import binario, cache
+        from Sistema.estado import EstadoAnalise, obter_estado
+        from Sistema.janelas import SomasAcumuladas
+    except ImportError:
+        import binario
+        import cache
+        from estado import EstadoAnalise, obter_estado
+        from janelas import SomasAcumuladas
+
+    versao = cache.versao_dados(csv_path)
+    # Base compacta ordenada por concurso, mapeada do retrato binário (o CSV/Parquet
+    # só é lido quando o retrato não é da versão atual)
+    base = cache.obter('base', versao, binario.carregar_base, csv_path, versao)
+    if base.empty:
+        estado = EstadoAnalise()
+    else:
+        # Estado incremental: contagens, grupos e padrões só processam concursos novos
+        estado = cache.obter('estado', versao, obter_estado, base, versao, csv_path)
+    somas = cache.obter('somas', versao, SomasAcumuladas.de_estado, estado)
+    return Analise(versao, base, estado, somas, csv_path)
+
+def analise_de_base(base, versao=None):
+    """Análise de uma base avulsa (ex.: arquivo fora do armazenamento), sem cache nem estado em disco"""
+    try:
+        from Sistema.estado import EstadoAnalise
+        from Sistema.janelas import SomasAcumuladas
+    except ImportError:
+        from estado import EstadoAnalise
+        from janelas import SomasAcumuladas
+
+    base = base.ordenar()
+    estado = EstadoAnalise.de_base(base) if not base.empty else EstadoAnalise()
+    estado.versao = versao
+    return Analise(versao, base, estado, SomasAcumuladas.de_estado(estado))
+
+def intercalar_melhores_piores(melhores_sorted, piores_sorted):
+    """Intercala elementos: melhor, pior, melhor, pior... e depois os restantes"""
+    resultado = []
+    max_len = max(len(melhores_sorted), len(piores_sorted))
+    for i in range(max_len):
+        if i < len(melhores_sorted):
+            resultado.append(melhores_sorted[i])
+        if i < len(piores_sorted):
+            resultado.append(piores_sorted[i])
+    return resultado
+
+def analisar_distribuicao_grupos(base):
+    """Grupos de melhores e piores números e a frequência de cada número"""
+    contagem = base.frequencia()
+    frequencia = Counter({int(num): int(qtd) for num, qtd in zip(NUMEROS, contagem) if qtd})
+    # Melhores = mais frequentes, empate pelo menor número
+    grupos_melhores, grupos_piores = dividir_grupos(ranking_por_frequencia(contagem))
+    return grupos_melhores, grupos_piores, frequencia
+
+def analisar_padrao_concursos(base, grupos_melhores, grupos_piores):
+    """Padrão de distribuição por grupo de cada concurso da base (lista de dicionários)"""
+    return padroes_para_lista(calcular_padroes(base, grupos_melhores, grupos_piores))
+
+def calcular_media_ultimos(somas, n=2000):
+    """Médias por grupo e as 10 distribuições mais comuns dos últimos N concursos (None = todos)"""
+    analise = somas.resumo(n)
+    analise['distribuicoes_mais_comuns'] = analise['distribuicoes_mais_comuns'][:10]
+    return analise
+
+def calcular_distribuicao_por_grupo(distribuicao):
+    """Alvos por grupo (G1, G2, G3, P1, P2) de uma distribuição no formato '10m x 5p'"""
+    try:
+        partes = distribuicao.replace('m', '').replace('p', '').split(' x ')
+        m_count = int(partes[0])
+        p_count = int(partes[1])
+    except (AttributeError, IndexError, ValueError):
+        m_count, p_count = 10, 5
+    return alvos_por_distribuicao(m_count, p_count)
+
+def gerar_sugestoes(grupos_melhores, grupos_piores, somas, n=2000, top=3, jogos_por_distribuicao=2, semente=None):
+    """Sugestões para as `top` distribuições mais comuns dos últimos N concursos
+
+    Devolve (analise da janela, distribuições usadas, sugestões). Cada distribuição
+    traz os alvos por grupo, o tamanho do espaço e quantos jogos saíram; cada
+    sugestão traz o jogo ordenado e os números separados por grupo.
+    """
+    analise = calcular_media_ultimos(somas, n)
+    grupos = list(grupos_melhores) + list(grupos_piores)
+    rng = np.random.default_rng(semente)
+
+    distribuicoes, sugestoes, chaves = [], [], set()
+    for posicao, (distribuicao, count) in enumerate(analise['distribuicoes_mais_comuns'][:top], 1):
+        alvos = calcular_distribuicao_por_grupo(distribuicao)
+        # Sorteio direto no espaço de jogos do padrão: jogos distintos, sem tentativas
+        mascaras, tamanho = amostrar_padrao(grupos, alvos, jogos_por_distribuicao, rng)
+        gerados = 0
+        for mascara in mascaras:
+            jogo = numeros_de_mascara(mascara)
+            chave = tuple(jogo)
+            if chave in chaves:
+                continue
+            chaves.add(chave)
+            por_grupo = numeros_por_grupo(mascara, grupos)
+            sugestoes.append({
+                'chave': chave,
+                'jogo': jogo,
+                'melhores_g1': por_grupo[0],
+                'melhores_g2': por_grupo[1],
+                'melhores_g3': por_grupo[2],
+                'piores_g1': por_grupo[3],
+                'piores_g2': por_grupo[4],
+                'total_melhores': sum(alvos[:3]),
+                'total_piores': sum(alvos[3:]),
+                'distribuicao_origem': distribuicao,
+                'posicao_distribuicao': posicao
+            })
+            gerados += 1
+        distribuicoes.append({'distribuicao': distribuicao, 'ocorrencias': count, 'posicao': posicao,
+                              'alvos': alvos, 'espaco': tamanho, 'jogos': gerados})
+    return analise, distribuicoes, sugestoes
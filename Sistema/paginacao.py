@@ -0,0 +1,164 @@
+import numpy as np
+
+try:
+    from Sistema.sorteios import COLUNAS_BOLAS
+    from Sistema.validacao import converter_datas, numeros
+except ImportError:
+    from sorteios import COLUNAS_BOLAS
+    from validacao import converter_datas, numeros
+
+# Paginação da tela "Ver Dados" no servidor (sem dependência do Streamlit).
+# Por versão dos dados (cache.obter) fica pronto um índice do DataFrame: a
+# ordem das linhas por concurso e por data, com os valores já ordenados ao
+# lado. Um intervalo de concursos ou de datas vira uma fatia dessa ordem achada
+# por searchsorted (O(log n)), ou seja, uma vista sem cópia; a ordem
+# decrescente é a mesma fatia invertida. No histórico validado a data acompanha
+# o concurso e as duas chaves usam a mesma ordem; fora disso o intervalo da
+# outra chave, quando usado junto, percorre as linhas da fatia. Uma troca de
+# página só formata as linhas da página (10 a 100).
+
+def _dia(valor):
+    """Data (date, datetime64 ou texto AAAA-MM-DD) como datetime64[D]"""
+    return np.datetime64(valor, 'D')
+
+class VisaoPaginada:
+    """Índice de um DataFrame do histórico por concurso e por data, calculado uma vez por versão"""
+
+    __slots__ = ('df', 'concursos', 'datas', 'ordem_concursos', 'concursos_ordenados', 'ordem_datas',
+                 'datas_ordenadas', 'com_concurso', 'com_data', '_filtro')
+
+    def __init__(self, df):
+        self.df = df
+        self.concursos = numeros(df['Concurso']) if len(df) else np.empty(0)
+        self.datas = (converter_datas(df['Data Sorteio']) if 'Data Sorteio' in df.columns and len(df)
+                      else np.full(len(df), np.datetime64('NaT'), dtype='datetime64[D]'))
+        # argsort põe NaN/NaT no fim: as linhas válidas são o começo de cada ordem
+        self.ordem_concursos = np.argsort(self.concursos, kind='stable')
+        self.concursos_ordenados = self.concursos[self.ordem_concursos]
+        self.com_concurso = len(df) - int(np.count_nonzero(np.isnan(self.concursos)))
+        self.com_data = len(df) - int(np.count_nonzero(np.isnat(self.datas)))
+        datas_por_concurso = self.datas[self.ordem_concursos]
+        if (self.com_concurso == self.com_data == len(df)
+                and not np.any(datas_por_concurso[1:] < datas_por_concurso[:-1])):
+            # Histórico validado: a data acompanha o concurso e uma única ordem serve às duas chaves
+            self.ordem_datas = self.ordem_concursos
+            self.datas_ordenadas = datas_por_concurso
+        else:
+            self.ordem_datas = np.argsort(self.datas, kind='stable')
+            self.datas_ordenadas = self.datas[self.ordem_datas]
+        self._filtro = (None, None)
+
+    def __len__(self):
+        return len(self.df)
+
+    def limites_concursos(self):
+        """Menor e maior concurso (None se não houver concurso válido)"""
+        if self.com_concurso == 0:
+            return None
+        return int(self.concursos_ordenados[0]), int(self.concursos_ordenados[self.com_concurso - 1])
+
+    def limites_datas(self):
+        """Data mais antiga e mais recente, como datetime.date (None se não houver data válida)"""
+        if self.com_data == 0:
+            return None
+        return self.datas_ordenadas[0].item(), self.datas_ordenadas[self.com_data - 1].item()
+
+    def faixa_concursos(self, inicio=None, fim=None):
+        """Fatia da ordem por concurso com concurso em [inicio, fim] (busca binária)"""
+        validos = self.concursos_ordenados[:self.com_concurso]
+        esquerda = 0 if inicio is None else int(np.searchsorted(validos, inicio, side='left'))
+        if fim is None:
+            # Sem limite superior as linhas sem concurso continuam no fim, como antes
+            return slice(esquerda, len(self.concursos_ordenados) if inicio is None else self.com_concurso)
+        return slice(esquerda, max(esquerda, int(np.searchsorted(validos, fim, side='right'))))
+
+    def faixa_datas(self, inicio=None, fim=None):
+        """Fatia da ordem por data com data em [inicio, fim] (busca binária, só datas válidas)"""
+        validas = self.datas_ordenadas[:self.com_data]
+        esquerda = 0 if inicio is None else int(np.searchsorted(validas, _dia(inicio), side='left'))
+        direita = self.com_data if fim is None else int(np.searchsorted(validas, _dia(fim), side='right'))
+        return slice(esquerda, max(esquerda, direita))
+
+    def por_concursos(self, inicio=None, fim=None):
+        """Posições das linhas com concurso em [inicio, fim], em ordem de concurso (vista)"""
+        return self.ordem_concursos[self.faixa_concursos(inicio, fim)]
+
+    def por_datas(self, inicio=None, fim=None):
+        """Posições das linhas com data em [inicio, fim], em ordem de data (vista)"""
+        return self.ordem_datas[self.faixa_datas(inicio, fim)]
+
+    def filtrar(self, inicio=None, fim=None, chave='concurso', decrescente=False, data_inicio=None, data_fim=None):
+        """Posições (na ordem pedida) das linhas com concurso em [inicio, fim] e data em [data_inicio, data_fim]
+
+        Com a data acompanhando o concurso o resultado é sempre uma fatia da
+        ordem (vista); senão a fatia sai do índice da chave de ordenação e o
+        intervalo da outra chave, se houver, só percorre as linhas da fatia.
+        O último filtro fica memorizado: trocar de página não refaz nada.
+        """
+        parametros = (inicio, fim, chave, decrescente, data_inicio, data_fim)
+        memo = self._filtro  # visão compartilhada entre sessões: uma única leitura
+        if memo[0] == parametros:
+            return memo[1]
+
+        filtra_concursos = inicio is not None or fim is not None
+        filtra_datas = data_inicio is not None or data_fim is not None
+        if self.ordem_datas is self.ordem_concursos:
+            # Ordem única: os dois intervalos são fatias dela e a interseção também
+            por_concurso = self.faixa_concursos(inicio, fim)
+            por_data = self.faixa_datas(data_inicio, data_fim)
+            esquerda = max(por_concurso.start, por_data.start)
+            posicoes = self.ordem_concursos[esquerda:max(esquerda, min(por_concurso.stop, por_data.stop))]
+            if decrescente:
+                posicoes = posicoes[::-1]
+        elif chave == 'data':
+            posicoes = self.por_datas(data_inicio, data_fim) if filtra_datas else self.ordem_datas
+            if filtra_concursos:
+                concursos = self.concursos[posicoes]
+                dentro = ~np.isnan(concursos)
+                if inicio is not None:
+                    dentro &= concursos >= inicio
+                if fim is not None:
+                    dentro &= concursos <= fim
+                posicoes = posicoes[dentro]
+            if decrescente:
+                validas = len(posicoes) if filtra_datas else int(np.count_nonzero(~np.isnat(self.datas[posicoes])))
+                # Linhas sem data continuam no fim
+                posicoes = (posicoes[::-1] if validas == len(posicoes)
+                            else np.concatenate([posicoes[:validas][::-1], posicoes[validas:]]))
+        else:
+            posicoes = self.por_concursos(inicio, fim)
+            if filtra_datas:
+                datas = self.datas[posicoes]
+                dentro = ~np.isnat(datas)
+                if data_inicio is not None:
+                    dentro &= datas >= _dia(data_inicio)
+                if data_fim is not None:
+                    dentro &= datas <= _dia(data_fim)
+                posicoes = posicoes[dentro]
+            if decrescente:
+                validos = (len(posicoes) if filtra_concursos
+                           else self.com_concurso if not filtra_datas
+                           else int(np.count_nonzero(~np.isnan(self.concursos[posicoes]))))
+                # Linhas sem concurso continuam no fim
+                posicoes = (posicoes[::-1] if validos == len(posicoes)
+                            else np.concatenate([posicoes[:validos][::-1], posicoes[validos:]]))
+
+        self._filtro = (parametros, posicoes)
+        return posicoes
+
+    def pagina(self, posicoes, numero, tamanho):
+        """DataFrame da página `numero` (1 = primeira) das posições filtradas"""
+        inicio = (max(int(numero), 1) - 1) * tamanho
+        return self.df.take(posicoes[inicio:inicio + tamanho])
+
+def total_paginas(quantidade, tamanho):
+    return max(1, -(-int(quantidade) // int(tamanho)))
+
+def formatar_compacto(pagina):
+    """Concurso, data e os números sorteados em uma única coluna (só as linhas da página)"""
+    compacto = pagina[[coluna for coluna in ('Concurso', 'Data Sorteio') if coluna in pagina.columns]].copy()
+    colunas_bolas = [coluna for coluna in COLUNAS_BOLAS if coluna in pagina.columns]
+    if colunas_bolas:
+        bolas = pagina[colunas_bolas].to_numpy()
+        compacto['Números Sorteados'] = [' - '.join(f"{int(x):02d}" for x in linha) for linha in bolas]
+    return compacto
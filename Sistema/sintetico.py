@@ -0,0 +1,188 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+try:
+    from Sistema.sorteios import COLUNAS, COLUNAS_BOLAS, BaseSorteios, bolas_de_mascaras
+except ImportError:
+    from sorteios import COLUNAS, COLUNAS_BOLAS, BaseSorteios, bolas_de_mascaras
+
+# Gerador vetorizado de históricos sintéticos (sem dependência do Streamlit).
+#
+#   python -m Sistema.sintetico --concursos 1000000 --semente 42 --saida dados/sintetico.parquet
+#   python -m Sistema.sintetico --concursos 2500 --mistura 10x5:35,9x6:30,8x7:20,11x4:10,7x8:5 --saida teste.csv
+#
+# Cada concurso sorteia uma distribuição M x P da mistura (pelos pesos) e então
+# M números dos "melhores" e P dos "piores", em blocos de linhas: o sorteio de
+# k elementos por linha é feito com chaves aleatórias e um limiar por linha
+# (a k-ésima menor chave), sem laço em Python. A gravação é feita bloco a bloco
+# (CSV com ; ou Parquet), então a memória não cresce com o número de concursos.
+
+# Mistura do arquivo de teste de Sistema/jogo.py: ((melhores, piores), peso)
+MISTURA_PADRAO = [((10, 5), 35), ((9, 6), 30), ((8, 7), 20), ((11, 4), 10), ((7, 8), 5)]
+MELHORES_PADRAO = tuple(range(1, 16))
+PIORES_PADRAO = tuple(range(16, 26))
+DATA_INICIAL = '2003-09-29'
+TAMANHO_BLOCO = 250_000
+
+def escolher_por_linha(rng, quantidades, numeros):
+    """Máscaras com quantidades[i] números distintos de `numeros` em cada linha i"""
+    numeros = np.asarray(numeros, dtype=np.uint32)
+    quantidades = np.asarray(quantidades, dtype=np.int64)
+    mascaras = np.zeros(len(quantidades), dtype=np.uint32)
+    if len(quantidades) == 0 or len(numeros) == 0:
+        return mascaras
+    chaves = rng.random((len(quantidades), len(numeros)))
+    ordenadas = np.sort(chaves, axis=1)
+    # Limiar = k-ésima menor chave da linha (k = 0 não escolhe nada)
+    limiar = np.where(quantidades > 0, ordenadas[np.arange(len(quantidades)), np.maximum(quantidades, 1) - 1], -1.0)
+    escolhidos = chaves <= limiar[:, None]
+    bits = (np.uint32(1) << (numeros - 1)).astype(np.uint32)
+    return np.bitwise_or.reduce(np.where(escolhidos, bits, np.uint32(0)), axis=1).astype(np.uint32)
+
+def validar_mistura(mistura, melhores, piores):
+    """Distribuições (M, P) e probabilidades normalizadas; None = 15 de 25 uniforme"""
+    if mistura is None:
+        return None, None
+    distribuicoes = np.array([dist for dist, _ in mistura], dtype=np.int64).reshape(-1, 2)
+    pesos = np.array([peso for _, peso in mistura], dtype=float)
+    if len(distribuicoes) == 0 or (pesos < 0).any() or pesos.sum() <= 0:
+        raise ValueError("A mistura precisa de ao menos uma distribuição com peso positivo")
+    if (distribuicoes.sum(axis=1) != 15).any():
+        raise ValueError("Cada distribuição M x P deve somar 15 números")
+    if (distribuicoes[:, 0] > len(melhores)).any() or (distribuicoes[:, 1] > len(piores)).any():
+        raise ValueError("Distribuição pede mais números do que o grupo tem")
+    if set(melhores) & set(piores) or not set(melhores) | set(piores) <= set(range(1, 26)):
+        raise ValueError("Melhores e piores devem ser números distintos entre 1 e 25")
+    return distribuicoes, pesos / pesos.sum()
+
+def gerar_mascaras(quantidade, rng, mistura=MISTURA_PADRAO, melhores=MELHORES_PADRAO, piores=PIORES_PADRAO):
+    """Máscaras de `quantidade` concursos segundo a mistura (None = uniforme)"""
+    distribuicoes, probabilidades = validar_mistura(mistura, melhores, piores)
+    if distribuicoes is None:
+        return escolher_por_linha(rng, np.full(quantidade, 15), range(1, 26))
+    sorteadas = distribuicoes[rng.choice(len(distribuicoes), quantidade, p=probabilidades)]
+    return escolher_por_linha(rng, sorteadas[:, 0], melhores) | escolher_por_linha(rng, sorteadas[:, 1], piores)
+
+def blocos(quantidade, semente=None, mistura=MISTURA_PADRAO, melhores=MELHORES_PADRAO, piores=PIORES_PADRAO,
+           primeiro_concurso=1, data_inicial=DATA_INICIAL, intervalo_dias=1, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera o histórico em pedaços (BaseSorteios), reprodutível pela semente"""
+    validar_mistura(mistura, melhores, piores)
+    rng = np.random.default_rng(semente)
+    inicio_datas = np.datetime64(data_inicial, 'D')
+    for inicio in range(0, quantidade, tamanho_bloco):
+        n = min(tamanho_bloco, quantidade - inicio)
+        indices = np.arange(inicio, inicio + n)
+        yield BaseSorteios(primeiro_concurso + indices, inicio_datas + indices * intervalo_dias,
+                           gerar_mascaras(n, rng, mistura, melhores, piores))
+
+def gerar_base(quantidade, semente=None, **opcoes):
+    """Histórico sintético inteiro em memória"""
+    partes = list(blocos(quantidade, semente, **opcoes))
+    if not partes:
+        return BaseSorteios.vazia()
+    return BaseSorteios(np.concatenate([p.concursos for p in partes]), np.concatenate([p.datas for p in partes]),
+                        np.concatenate([p.mascaras for p in partes]))
+
+def tabela_arrow(parte):
+    """Bloco no esquema do Parquet do armazenamento (int32, date32, uint8)"""
+    import pyarrow as pa
+
+    colunas = {'Concurso': pa.array(parte.concursos, type=pa.int32()),
+               'Data Sorteio': pa.array(parte.datas, type=pa.date32())}
+    bolas = bolas_de_mascaras(parte.mascaras)
+    for i, coluna in enumerate(COLUNAS_BOLAS):
+        colunas[coluna] = pa.array(bolas[:, i], type=pa.uint8())
+    return pa.table(colunas)
+
+def escrever_csv(partes, arquivo):
+    """CSV com ; e data DD/MM/AAAA, no formato de importação do sistema"""
+    try:
+        import pyarrow.compute as pc
+        import pyarrow.csv as pcsv
+    except ImportError:
+        pcsv = None
+    arquivo.write((';'.join(COLUNAS) + '\n').encode('utf-8'))
+    for parte in partes:
+        if pcsv is not None:
+            tabela = tabela_arrow(parte)
+            tabela = tabela.set_column(1, 'Data Sorteio', pc.strftime(tabela['Data Sorteio'], format='%d/%m/%Y'))
+            pcsv.write_csv(tabela, arquivo, pcsv.WriteOptions(include_header=False, delimiter=';',
+                                                             quoting_style='none'))
+        else:
+            parte.para_dataframe().to_csv(arquivo, sep=';', index=False, header=False, encoding='utf-8')
+
+def escrever_parquet(partes, caminho):
+    import pyarrow.parquet as pq
+
+    escritor = None
+    try:
+        for parte in partes:
+            tabela = tabela_arrow(parte)
+            if escritor is None:
+                escritor = pq.ParquetWriter(caminho, tabela.schema, compression='zstd')
+            escritor.write_table(tabela)
+        if escritor is None:
+            # Histórico vazio: grava só o esquema
+            tabela = tabela_arrow(BaseSorteios.vazia())
+            escritor = pq.ParquetWriter(caminho, tabela.schema, compression='zstd')
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+def escrever(caminho, quantidade, semente=None, formato=None, **opcoes):
+    """Grava o histórico sintético em CSV ou Parquet (pela extensão), bloco a bloco
+
+    A escrita vai para um arquivo temporário trocado no fim (os.replace).
+    """
+    try:
+        from Sistema.armazenamento import substituir_atomico
+    except ImportError:
+        from armazenamento import substituir_atomico
+
+    formato = formato or ('parquet' if caminho.lower().endswith('.parquet') else 'csv')
+    partes = blocos(quantidade, semente, **opcoes)
+    if formato == 'parquet':
+        substituir_atomico(caminho, lambda tmp: escrever_parquet(partes, tmp))
+    else:
+        def gravar(temporario):
+            with open(temporario, 'wb') as f:
+                escrever_csv(partes, f)
+        substituir_atomico(caminho, gravar)
+    return caminho
+
+def ler_mistura(texto):
+    """'10x5:35,9x6:30' -> [((10, 5), 35.0), ((9, 6), 30.0)]; 'uniforme' -> None"""
+    if texto.strip().lower() in ('uniforme', 'none'):
+        return None
+    mistura = []
+    for item in texto.split(','):
+        dist, _, peso = item.strip().partition(':')
+        melhores, _, piores = dist.lower().replace('m', '').replace('p', '').partition('x')
+        mistura.append(((int(melhores), int(piores)), float(peso or 1)))
+    return mistura
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Sistema.sintetico',
+                                     description='Gera históricos sintéticos da Lotofácil (CSV ou Parquet)')
+    parser.add_argument('--concursos', type=int, required=True)
+    parser.add_argument('--saida', required=True, help='arquivo .csv ou .parquet')
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--mistura', default='10x5:35,9x6:30,8x7:20,11x4:10,7x8:5',
+                        help='distribuições MxP:peso separadas por vírgula, ou "uniforme"')
+    parser.add_argument('--data-inicial', default=DATA_INICIAL)
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    escrever(args.saida, args.concursos, args.semente, mistura=ler_mistura(args.mistura),
+             data_inicial=args.data_inicial, tamanho_bloco=args.bloco)
+    print(f"{args.concursos} concursos gravados em {args.saida} "
+          f"({os.path.getsize(args.saida) / 2 ** 20:.1f} MB, {time.perf_counter() - inicio:.2f} s)", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
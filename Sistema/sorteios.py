@@ -0,0 +1,164 @@
+import numpy as np
+
+# Base compacta dos sorteios: uma máscara de 25 bits por concurso
+# (bit i-1 ligado = número i sorteado), sem dependência do Streamlit.
+# O pandas só é importado na conversão de/para DataFrame, para manter a
+# importação do núcleo de análises leve.
+
+COLUNAS_BOLAS = [f'Bola{i}' for i in range(1, 16)]
+COLUNAS = ['Concurso', 'Data Sorteio'] + COLUNAS_BOLAS
+NUMEROS = np.arange(1, 26)
+DESLOCAMENTOS = np.arange(25, dtype=np.uint32)
+FORMATO_DATA = '%d/%m/%Y'
+
+if hasattr(np, 'bitwise_count'):
+    def contar_bits(valores):
+        """Conta os bits ligados de cada máscara (popcount)"""
+        return np.bitwise_count(np.asarray(valores, dtype=np.uint32))
+else:
+    _BITS_16 = np.array([bin(i).count('1') for i in range(1 << 16)], dtype=np.uint8)
+
+    def contar_bits(valores):
+        """Conta os bits ligados de cada máscara (popcount)"""
+        valores = np.asarray(valores, dtype=np.uint32)
+        return _BITS_16[valores & 0xFFFF] + _BITS_16[valores >> 16]
+
+def mascara_de_numeros(numeros):
+    """Converte uma lista de números (1 a 25) em máscara de 25 bits"""
+    mascara = 0
+    for num in numeros:
+        mascara |= 1 << (int(num) - 1)
+    return np.uint32(mascara)
+
+def numeros_de_mascara(mascara):
+    """Converte uma máscara de 25 bits na lista ordenada de números"""
+    mascara = int(mascara)
+    return [num for num in range(1, 26) if mascara >> (num - 1) & 1]
+
+def mascaras_de_bolas(bolas):
+    """Converte uma matriz N x 15 de números em N máscaras uint32"""
+    bolas = np.asarray(bolas, dtype=np.uint32)
+    if bolas.size == 0:
+        return np.zeros(len(bolas), dtype=np.uint32)
+    return np.bitwise_or.reduce(np.uint32(1) << (bolas - 1), axis=1).astype(np.uint32)
+
+def bolas_de_mascaras(mascaras):
+    """Converte N máscaras de 15 bits ligados na matriz N x 15 de números (uint8)"""
+    incidencia = incidencia_de_mascaras(mascaras)
+    return (np.nonzero(incidencia)[1].reshape(-1, 15) + 1).astype(np.uint8)
+
+def incidencia_de_mascaras(mascaras):
+    """Expande N máscaras na matriz de incidência N x 25 (uint8)"""
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    return ((mascaras[:, None] >> DESLOCAMENTOS) & 1).astype(np.uint8)
+
+class BaseSorteios:
+    """Histórico de concursos em formato colunar (concurso, data e máscara)"""
+
+    __slots__ = ('concursos', 'datas', 'mascaras', '_incidencia')
+
+    def __init__(self, concursos, datas, mascaras):
+        self.concursos = np.asarray(concursos, dtype=np.int32)
+        self.datas = np.asarray(datas, dtype='datetime64[D]')
+        self.mascaras = np.asarray(mascaras, dtype=np.uint32)
+        self._incidencia = None
+
+    @classmethod
+    def vazia(cls):
+        return cls(np.empty(0, np.int32), np.empty(0, 'datetime64[D]'), np.empty(0, np.uint32))
+
+    @classmethod
+    def de_dataframe(cls, df):
+        """Monta a base a partir do DataFrame Concurso/Data Sorteio/Bola1..Bola15
+
+        Linhas sem 15 números distintos entre 1 e 25 ficam de fora.
+        """
+        import pandas as pd
+
+        if df is None or df.empty or 'Concurso' not in df.columns:
+            return cls.vazia()
+
+        concursos = pd.to_numeric(df['Concurso'], errors='coerce').to_numpy(dtype=float)
+        validos = ~np.isnan(concursos)
+
+        # Coluna a coluna: cada bola válida liga o seu bit na máscara
+        mascaras = np.zeros(len(df), dtype=np.uint32)
+        for coluna in COLUNAS_BOLAS:
+            if coluna not in df.columns:
+                validos[:] = False
+                break
+            valores = pd.to_numeric(df[coluna], errors='coerce').to_numpy(dtype=float)
+            dentro = (valores >= 1) & (valores <= 25)
+            validos &= dentro
+            mascaras |= np.uint32(1) << np.where(dentro, valores - 1, 0).astype(np.uint32)
+        validos &= contar_bits(mascaras) == 15
+
+        if 'Data Sorteio' in df.columns and pd.api.types.is_datetime64_any_dtype(df['Data Sorteio']):
+            datas = df['Data Sorteio'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        elif 'Data Sorteio' in df.columns:
+            datas = pd.to_datetime(df['Data Sorteio'], format=FORMATO_DATA, errors='coerce')
+            datas = datas.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        else:
+            datas = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[D]')
+
+        return cls(concursos[validos], datas[validos], mascaras[validos])
+
+    def __len__(self):
+        return len(self.mascaras)
+
+    @property
+    def empty(self):
+        return len(self.mascaras) == 0
+
+    @property
+    def incidencia(self):
+        """Matriz N x 25 (uint8): 1 se o número saiu no concurso"""
+        if self._incidencia is None or len(self._incidencia) != len(self.mascaras):
+            self._incidencia = incidencia_de_mascaras(self.mascaras)
+        return self._incidencia
+
+    @property
+    def bolas(self):
+        """Matriz N x 15 com os números de cada concurso em ordem crescente"""
+        return (np.nonzero(self.incidencia)[1].reshape(-1, 15) + 1).astype(np.uint8)
+
+    def frequencia(self):
+        """Quantidade de vezes que cada número (1 a 25) foi sorteado"""
+        return self.incidencia.sum(axis=0, dtype=np.int64)
+
+    def contem(self, numero):
+        """Vetor booleano: o número saiu em cada concurso?"""
+        return (self.mascaras >> np.uint32(numero - 1)) & 1 == 1
+
+    def acertos(self, mascara):
+        """Quantidade de números do jogo (máscara) presentes em cada concurso"""
+        return contar_bits(self.mascaras & np.uint32(mascara))
+
+    def selecionar(self, indices):
+        """Nova base com as linhas indicadas (índices, fatia ou máscara booleana)"""
+        return BaseSorteios(self.concursos[indices], self.datas[indices], self.mascaras[indices])
+
+    def ordenar(self, decrescente=False):
+        """Nova base ordenada por concurso"""
+        ordem = np.argsort(self.concursos, kind='stable')
+        if decrescente:
+            ordem = ordem[::-1]
+        return self.selecionar(ordem)
+
+    def para_dataframe(self):
+        """Reconstrói o DataFrame no formato do arquivo CSV"""
+        import pandas as pd
+
+        df = pd.DataFrame({'Concurso': self.concursos.astype(np.int64)})
+        df['Data Sorteio'] = pd.to_datetime(self.datas).strftime(FORMATO_DATA)
+        bolas = self.bolas
+        for i, coluna in enumerate(COLUNAS_BOLAS):
+            df[coluna] = bolas[:, i].astype(np.int64)
+        return df
+
+    def memoria_bytes(self):
+        """Memória ocupada pelos arrays da base"""
+        total = self.concursos.nbytes + self.datas.nbytes + self.mascaras.nbytes
+        if self._incidencia is not None:
+            total += self._incidencia.nbytes
+        return total
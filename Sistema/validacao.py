@@ -0,0 +1,243 @@
+import os
+
+import numpy as np
+
+try:
+    from Sistema.sorteios import COLUNAS, COLUNAS_BOLAS, FORMATO_DATA, BaseSorteios, contar_bits
+except ImportError:
+    from sorteios import COLUNAS, COLUNAS_BOLAS, FORMATO_DATA, BaseSorteios, contar_bits
+
+# Validação vetorizada do histórico (sem dependência do Streamlit).
+# Uma passada por coluna sobre o DataFrame inteiro marca, em um vetor de bits
+# por linha, os problemas encontrados: concurso inválido ou repetido, bolas fora
+# de 1..25 ou repetidas, data que não é DD/MM/AAAA válida e data fora de ordem
+# em relação aos concursos vizinhos. As linhas com problema vão para um
+# relatório de quarentena (CSV ao lado do armazenamento) em vez de sumirem.
+
+CONCURSO_INVALIDO = 1
+BOLAS_INVALIDAS = 2
+BOLAS_REPETIDAS = 4
+DATA_INVALIDA = 8
+CONCURSO_DUPLICADO = 16
+CONCURSO_EXISTENTE = 32
+DATA_FORA_DE_ORDEM = 64
+
+MOTIVOS = {
+    CONCURSO_INVALIDO: 'concurso ausente ou inválido',
+    BOLAS_INVALIDAS: 'bola ausente ou fora de 1 a 25',
+    BOLAS_REPETIDAS: 'números repetidos',
+    DATA_INVALIDA: 'data inválida (use DD/MM/AAAA)',
+    CONCURSO_DUPLICADO: 'concurso repetido no arquivo',
+    CONCURSO_EXISTENTE: 'concurso já cadastrado',
+    DATA_FORA_DE_ORDEM: 'data fora de ordem em relação aos concursos vizinhos',
+}
+
+PADRAO_DATA = r'^\s*(?P<dia>\d{1,2})/(?P<mes>\d{1,2})/(?P<ano>\d{4})\s*$'
+
+def caminho_quarentena(csv_path, origem='carga'):
+    """Relatório da quarentena: 'carga' (leitura do armazenamento) ou 'upload'"""
+    sufixo = '.quarentena.csv' if origem == 'carga' else f'.quarentena_{origem}.csv'
+    return os.path.splitext(csv_path)[0] + sufixo
+
+def numeros(serie):
+    """Coluna como float (NaN onde não for número)"""
+    import pandas as pd
+
+    return pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+def datas_de_partes(dias, meses, anos):
+    """datetime64[D] a partir de dia, mês e ano (NaT onde a data não existe)"""
+    dias, meses, anos = (np.asarray(x, dtype=np.int64) for x in (dias, meses, anos))
+    validos = (meses >= 1) & (meses <= 12) & (anos >= 1900)
+    inicio_mes = ((anos - 1970) * 12 + np.where(validos, meses - 1, 0)).astype('datetime64[M]')
+    dias_no_mes = ((inicio_mes + 1).astype('datetime64[D]') - inicio_mes.astype('datetime64[D]')).astype(np.int64)
+    validos &= (dias >= 1) & (dias <= dias_no_mes)
+    datas = inicio_mes.astype('datetime64[D]') + np.where(validos, dias - 1, 0)
+    return np.where(validos, datas, np.datetime64('NaT'))
+
+def converter_datas(serie):
+    """Coluna 'Data Sorteio' (texto DD/MM/AAAA ou datetime) como datetime64[D], NaT se inválida"""
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.to_numpy().astype('datetime64[D]')
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+    if pa is not None:
+        texto = pa.array(serie.astype('string'), type=pa.large_string(), from_pandas=True)
+        partes = pc.extract_regex(texto, PADRAO_DATA)
+        casou = pc.fill_null(pc.is_valid(partes), False).to_numpy(zero_copy_only=False)
+        campos = [pc.if_else(casou, pc.struct_field(partes, nome), '0') for nome in ('dia', 'mes', 'ano')]
+        dia, mes, ano = (pc.cast(campo, pa.int64()).to_numpy(zero_copy_only=False) for campo in campos)
+    else:
+        partes = serie.astype('string').str.extract(PADRAO_DATA)
+        casou = partes['dia'].notna().to_numpy()
+        dia, mes, ano = (partes[nome].fillna('0').astype(np.int64).to_numpy() for nome in ('dia', 'mes', 'ano'))
+    return np.where(casou, datas_de_partes(dia, mes, ano), np.datetime64('NaT'))
+
+def fora_de_ordem(datas):
+    """Posições (na sequência por concurso) cuja data quebra a ordem dos vizinhos
+
+    Primeiro saem os picos (data maior que a seguinte, com a anterior e a
+    seguinte em ordem entre si); no que sobra, é marcada toda data menor que a
+    anterior. Assim um único erro de digitação marca só a própria linha.
+    Datas iguais são aceitas.
+    """
+    dias = np.asarray(datas).astype(np.int64)
+    marcadas = np.zeros(len(dias), dtype=bool)
+    if len(dias) < 2:
+        return marcadas
+    anterior = np.concatenate(([np.iinfo(np.int64).min], dias[:-1]))
+    seguinte = np.concatenate((dias[1:], [np.iinfo(np.int64).max]))
+    marcadas |= (dias > seguinte) & (anterior <= seguinte)
+    restantes = np.flatnonzero(~marcadas)
+    dias = dias[restantes]
+    marcadas[restantes[1:][dias[1:] < dias[:-1]]] = True
+    return marcadas
+
+class Validacao:
+    """Resultado da validação: motivos por linha (bits) e os valores já convertidos"""
+
+    __slots__ = ('df', 'motivos', 'concursos', 'datas', 'mascaras', 'faltantes')
+
+    def __init__(self, df, motivos, concursos, datas, mascaras, faltantes):
+        self.df = df
+        self.motivos = motivos
+        self.concursos = concursos
+        self.datas = datas
+        self.mascaras = mascaras
+        self.faltantes = faltantes
+
+    @property
+    def validas(self):
+        return self.motivos == 0
+
+    @property
+    def total_invalidas(self):
+        return int(np.count_nonzero(self.motivos))
+
+    def base(self):
+        """BaseSorteios só com as linhas válidas (sem converter o DataFrame de novo)"""
+        validas = self.validas
+        return BaseSorteios(self.concursos[validas].astype(np.int32), self.datas[validas], self.mascaras[validas])
+
+    def validos(self):
+        """DataFrame com as linhas válidas"""
+        return self.df[self.validas]
+
+    def registros(self):
+        """Linhas válidas nas colunas do arquivo: concurso e bolas inteiros, data DD/MM/AAAA (bolas na ordem original)"""
+        import pandas as pd
+
+        validas = self.validas
+        df = pd.DataFrame({'Concurso': self.concursos[validas],
+                           'Data Sorteio': pd.to_datetime(self.datas[validas]).strftime(FORMATO_DATA)})
+        for coluna in COLUNAS_BOLAS:
+            df[coluna] = numeros(self.df[coluna])[validas].astype(np.int64)
+        return df
+
+    def resumo(self):
+        """{motivo: quantidade de linhas}"""
+        return {texto: int(np.count_nonzero(self.motivos & bit)) for bit, texto in MOTIVOS.items()
+                if np.any(self.motivos & bit)}
+
+    def quarentena(self):
+        """DataFrame das linhas recusadas com a linha do arquivo (cabeçalho = 1) e os motivos"""
+        import pandas as pd
+
+        posicoes = np.flatnonzero(self.motivos)
+        relatorio = self.df.iloc[posicoes].copy()
+        relatorio.insert(0, 'Linha', posicoes + 2)
+        textos = {}
+        for codigo in np.unique(self.motivos[posicoes]):
+            textos[codigo] = '; '.join(texto for bit, texto in MOTIVOS.items() if codigo & bit)
+        relatorio['Motivo'] = pd.Series(self.motivos[posicoes], index=relatorio.index).map(textos)
+        return relatorio
+
+def validar(df, historico=None, rejeitar_existentes=True):
+    """Valida o DataFrame inteiro de uma vez
+
+    `historico` (BaseSorteios em ordem de concurso) entra na checagem de ordem
+    das datas e, com `rejeitar_existentes`, recusa concursos já cadastrados.
+    """
+    n = len(df)
+    motivos = np.zeros(n, dtype=np.uint8)
+    faltantes = [coluna for coluna in COLUNAS if coluna not in df.columns]
+
+    concursos = numeros(df['Concurso']) if 'Concurso' in df.columns else np.full(n, np.nan)
+    concurso_ok = np.isfinite(concursos) & (concursos >= 1) & (concursos < 2 ** 31)
+    concurso_ok &= np.floor(np.where(concurso_ok, concursos, 0)) == np.where(concurso_ok, concursos, 0)
+    motivos[~concurso_ok] |= CONCURSO_INVALIDO
+    concursos = np.where(concurso_ok, concursos, 0).astype(np.int64)
+
+    # Bolas: cada valor válido liga o seu bit; 15 bits ligados = 15 números distintos
+    mascaras = np.zeros(n, dtype=np.uint32)
+    bolas_ok = np.ones(n, dtype=bool)
+    for coluna in COLUNAS_BOLAS:
+        if coluna not in df.columns:
+            bolas_ok[:] = False
+            continue
+        valores = numeros(df[coluna])
+        dentro = (valores >= 1) & (valores <= 25) & (np.floor(np.nan_to_num(valores)) == valores)
+        bolas_ok &= dentro
+        mascaras |= np.uint32(1) << np.where(dentro, valores - 1, 0).astype(np.uint32)
+    motivos[~bolas_ok] |= BOLAS_INVALIDAS
+    motivos[bolas_ok & (contar_bits(mascaras) != 15)] |= BOLAS_REPETIDAS
+
+    if 'Data Sorteio' in df.columns:
+        datas = converter_datas(df['Data Sorteio'])
+    else:
+        datas = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]')
+    motivos[np.isnat(datas)] |= DATA_INVALIDA
+
+    # Concurso repetido no próprio arquivo: a primeira ocorrência fica
+    ordem = np.argsort(np.where(concurso_ok, concursos, -1), kind='stable')
+    ordenados = concursos[ordem]
+    repetidos = np.zeros(n, dtype=bool)
+    repetidos[ordem[1:]] = (ordenados[1:] == ordenados[:-1]) & concurso_ok[ordem[1:]]
+    motivos[repetidos] |= CONCURSO_DUPLICADO
+
+    historico_concursos = np.empty(0, dtype=np.int64)
+    historico_datas = np.empty(0, dtype='datetime64[D]')
+    if historico is not None and not historico.empty:
+        historico_concursos = np.asarray(historico.concursos, dtype=np.int64)
+        historico_datas = np.asarray(historico.datas, dtype='datetime64[D]')
+        if rejeitar_existentes:
+            posicao = np.minimum(np.searchsorted(historico_concursos, concursos), len(historico_concursos) - 1)
+            motivos[concurso_ok & (historico_concursos[posicao] == concursos)] |= CONCURSO_EXISTENTE
+
+    # Ordem das datas: linhas ainda válidas + histórico, em ordem de concurso
+    candidatas = np.flatnonzero(motivos == 0)
+    if len(candidatas):
+        fora_historico = ~np.isin(historico_concursos, concursos[candidatas])
+        todos_concursos = np.concatenate([historico_concursos[fora_historico], concursos[candidatas]])
+        todas_datas = np.concatenate([historico_datas[fora_historico], datas[candidatas]])
+        eh_candidata = np.concatenate([np.zeros(np.count_nonzero(fora_historico), dtype=bool),
+                                       np.ones(len(candidatas), dtype=bool)])
+        origem = np.concatenate([np.full(np.count_nonzero(fora_historico), -1), candidatas])
+        ordem = np.argsort(todos_concursos, kind='stable')
+        com_data = ~np.isnat(todas_datas[ordem])
+        sequencia = ordem[com_data]
+        marcadas = fora_de_ordem(todas_datas[sequencia])
+        recusadas = origem[sequencia[marcadas & eh_candidata[sequencia]]]
+        motivos[recusadas] |= DATA_FORA_DE_ORDEM
+
+    return Validacao(df, motivos, concursos, datas.astype('datetime64[D]'), mascaras, faltantes)
+
+def gravar_quarentena(validacao, caminho):
+    """Grava o relatório das linhas recusadas (ou remove o antigo se não houver nenhuma)"""
+    try:
+        from Sistema.armazenamento import substituir_atomico
+    except ImportError:
+        from armazenamento import substituir_atomico
+
+    if validacao.total_invalidas == 0:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        return None
+    relatorio = validacao.quarentena()
+    substituir_atomico(caminho, lambda tmp: relatorio.to_csv(tmp, sep=';', index=False, encoding='utf-8'))
+    return caminho
@@ -2,10 +2,20 @@ import streamlit as st
 import pandas as pd
 import os
 import io
+from collections import deque
 from datetime import datetime
-from collections import Counter
 import numpy as np
-import random
+import altair as alt
+
+from Sistema import armazenamento, binario, cache, exportacao, medicao, nucleo, paginacao, sintetico, validacao
+from Sistema.componentes import exibir_conferencia_jogos, exibir_painel_medicao, seletor_datas, seletor_pagina
+from Sistema.sorteios import BaseSorteios, numeros_de_mascara
+from Sistema.estado import registrar_concursos
+from Sistema.janelas import JANELAS_PADRAO, comparar_janelas
+from Sistema.nucleo import calcular_distribuicao_por_grupo, intercalar_melhores_piores
+from Sistema.combinacoes import TOTAL_COMBINACOES, filtrar, padroes_combinacoes, sortear, tabela_combinacoes
+from Sistema.lotes import LIMITE_LOTE, gerar_lote
+from Sistema.avaliacao import avaliar_walk_forward, resumo_walk_forward
 
 CSV_PATH = 'dados/lotofacil.csv'
 
@@ -55,27 +65,43 @@ def verificar_estrutura():
         os.makedirs('dados', exist_ok=True)
 
 def carregar_dados():
-    """Carrega os dados do arquivo CSV"""
+    """Carrega os dados do armazenamento configurado (Parquet ou CSV)"""
     try:
-        if os.path.exists(CSV_PATH):
-            return pd.read_csv(CSV_PATH, sep=';', encoding='utf-8')
-        return pd.DataFrame()
+        return cache.obter('dados', cache.versao_dados(CSV_PATH), armazenamento.carregar, CSV_PATH)
     except Exception as e:
         st.error(f"Erro ao carregar dados: {e}")
         return pd.DataFrame()
 
 def salvar_dados(df):
-    """Salva os dados no arquivo CSV"""
+    """Salva os dados no armazenamento configurado (Parquet ou CSV)"""
     try:
-        df.to_csv(CSV_PATH, sep=';', index=False, encoding='utf-8')
+        armazenamento.salvar(df, CSV_PATH)
+        # Retrato binário regravado de forma atômica junto com o histórico
+        binario.gravar_dataframe(df, CSV_PATH)
+        cache.invalidar()
         return True
     except Exception as e:
         st.error(f"Erro ao salvar dados: {e}")
         return False
 
+def salvar_concurso(registro):
+    """Acrescenta um único concurso ao diário (sem regravar o histórico)"""
+    try:
+        versao_anterior = cache.versao_dados(CSV_PATH)
+        armazenamento.anexar(registro, CSV_PATH)
+        cache.invalidar()
+        # Análises incrementais e retrato binário: só o concurso novo é processado
+        novos = BaseSorteios.de_dataframe(pd.DataFrame([registro]))
+        binario.acrescentar(novos, CSV_PATH, versao_anterior)
+        registrar_concursos(CSV_PATH, novos, cache.versao_dados(CSV_PATH))
+        return True
+    except Exception as e:
+        st.error(f"Erro ao salvar concurso: {e}")
+        return False
+
 def criar_arquivo_base():
     """Cria um arquivo base vazio se não existir"""
-    if not os.path.exists(CSV_PATH):
+    if not armazenamento.existe_dados(CSV_PATH):
         colunas = ['Concurso', 'Data Sorteio'] + [f'Bola{i}' for i in range(1, 16)]
         df_base = pd.DataFrame(columns=colunas)
         salvar_dados(df_base)
@@ -87,34 +113,11 @@ def criar_arquivo_teste():
     try:
         os.makedirs('dados', exist_ok=True)
         
-        # Criar dados de exemplo CORRETOS
-        np.random.seed(42)
-        num_concursos = 200  # Aumentado para ter pelo menos 2000 concursos
-        
-        # Criar lista de concursos
-        concursos = []
-        
-        for i in range(1, num_concursos + 1):
-            # Gerar 15 números únicos entre 1 e 25
-            numeros = np.random.choice(range(1, 26), 15, replace=False)
-            numeros.sort()
-            
-            concurso = {
-                'Concurso': i,
-                'Data Sorteio': (datetime.now() - pd.Timedelta(days=num_concursos - i)).strftime('%d/%m/%Y')
-            }
-            
-            # Adicionar cada número em sua coluna
-            for j, num in enumerate(numeros, 1):
-                concurso[f'Bola{j}'] = num
-                
-            concursos.append(concurso)
-        
-        # Criar DataFrame
-        df = pd.DataFrame(concursos)
-        
-        # Salvar arquivo
-        df.to_csv(CSV_PATH, sep=';', index=False, encoding='utf-8')
+        # Concursos uniformes (15 de 25), um por dia até hoje, gerados de forma vetorizada
+        num_concursos = 200
+        data_inicial = (datetime.now() - pd.Timedelta(days=num_concursos - 1)).strftime('%Y-%m-%d')
+        sintetico.escrever(CSV_PATH, num_concursos, semente=42, mistura=None, data_inicial=data_inicial)
+        df = pd.read_csv(CSV_PATH, sep=';', encoding='utf-8', nrows=3)
         
         st.success(f"✅ Arquivo de teste criado com {num_concursos} concursos!")
         st.dataframe(df.head(3))
@@ -124,210 +127,54 @@ def criar_arquivo_teste():
         st.error(f"Erro ao criar arquivo de teste: {e}")
         return False
 
-def intercalar_melhores_piores(melhores_sorted, piores_sorted):
-    """Intercala elementos: melhor, pior, melhor, pior... e depois os restantes"""
-    resultado = []
-    max_len = max(len(melhores_sorted), len(piores_sorted))
-    for i in range(max_len):
-        if i < len(melhores_sorted):
-            resultado.append(melhores_sorted[i])
-        if i < len(piores_sorted):
-            resultado.append(piores_sorted[i])
-    return resultado
-
-def analisar_distribuicao_grupos(df):
-    """Analisa a distribuição dos números nos grupos de 5"""
-    # Calcular frequência de todos os números
-    todos_numeros = []
-    for i in range(1, 16):
-        coluna = f'Bola{i}'
-        if coluna in df.columns:
-            numeros_coluna = pd.to_numeric(df[coluna], errors='coerce').dropna().astype(int).tolist()
-            todos_numeros.extend(numeros_coluna)
-    
-    frequencia = Counter(todos_numeros)
-    
-    # Ordenar números por frequência (melhores = mais frequentes)
-    numeros_ordenados = sorted(range(1, 26), key=lambda x: frequencia.get(x, 0), reverse=True)
-    
-    # Dividir em grupos de 5
-    grupos_melhores = [
-        numeros_ordenados[0:5],   # Grupo 1 - Top 5 melhores
-        numeros_ordenados[5:10],  # Grupo 2 - Próximos 5 melhores  
-        numeros_ordenados[10:15]  # Grupo 3 - Últimos 5 melhores
-    ]
-    
-    grupos_piores = [
-        numeros_ordenados[15:20], # Grupo 4 - Primeiros 5 piores
-        numeros_ordenados[20:25]  # Grupo 5 - Últimos 5 piores
-    ]
-    
-    return grupos_melhores, grupos_piores, frequencia
-
-def analisar_padrao_concursos(df, grupos_melhores, grupos_piores):
-    """Analisa o padrão de distribuição nos últimos concursos"""
-    padroes = []
-    
-    for idx, row in df.iterrows():
-        # Coletar números do concurso
-        numeros_concurso = []
-        for i in range(1, 16):
-            coluna = f'Bola{i}'
-            if coluna in row and pd.notna(row[coluna]):
-                try:
-                    numeros_concurso.append(int(row[coluna]))
-                except (ValueError, TypeError):
-                    continue
-        
-        # Verificar se temos 15 números válidos
-        if len(numeros_concurso) != 15:
-            continue
-        
-        # Contar quantos números de cada grupo apareceram
-        contagem_grupos = {
-            'melhores_g1': len(set(numeros_concurso) & set(grupos_melhores[0])),
-            'melhores_g2': len(set(numeros_concurso) & set(grupos_melhores[1])),
-            'melhores_g3': len(set(numeros_concurso) & set(grupos_melhores[2])),
-            'piores_g1': len(set(numeros_concurso) & set(grupos_piores[0])),
-            'piores_g2': len(set(numeros_concurso) & set(grupos_piores[1]))
-        }
-        
-        total_melhores = contagem_grupos['melhores_g1'] + contagem_grupos['melhores_g2'] + contagem_grupos['melhores_g3']
-        total_piores = contagem_grupos['piores_g1'] + contagem_grupos['piores_g2']
-        
-        padroes.append({
-            'concurso': row['Concurso'],
-            'melhores_g1': contagem_grupos['melhores_g1'],
-            'melhores_g2': contagem_grupos['melhores_g2'],
-            'melhores_g3': contagem_grupos['melhores_g3'],
-            'piores_g1': contagem_grupos['piores_g1'],
-            'piores_g2': contagem_grupos['piores_g2'],
-            'total_melhores': total_melhores,
-            'total_piores': total_piores,
-            'distribuicao': f"{total_melhores}m x {total_piores}p"
-        })
-    
-    return padroes
-
-def calcular_media_ultimos_2000(padroes_recentes):
-    """Calcula médias reais dos últimos 2000 concursos"""
-    if len(padroes_recentes) < 2000:
-        st.warning(f"⚠️ Apenas {len(padroes_recentes)} concursos disponíveis (ideal: 2000)")
-        concursos_analisados = padroes_recentes
-    else:
-        concursos_analisados = padroes_recentes[:2000]
-    
-    # Calcular médias reais dos últimos concursos
-    media_melhores_g1 = np.mean([p['melhores_g1'] for p in concursos_analisados])
-    media_melhores_g2 = np.mean([p['melhores_g2'] for p in concursos_analisados])
-    media_melhores_g3 = np.mean([p['melhores_g3'] for p in concursos_analisados])
-    media_piores_g1 = np.mean([p['piores_g1'] for p in concursos_analisados])
-    media_piores_g2 = np.mean([p['piores_g2'] for p in concursos_analisados])
-    
-    # Calcular distribuição M x P dos últimos concursos
-    dist_melhores_piores = Counter([p['distribuicao'] for p in concursos_analisados])
-    distribuicoes_mais_comuns = dist_melhores_piores.most_common(10)  # Mostrar mais distribuições
-    
-    # Calcular total para verificação
-    total_concursos = sum(dist_melhores_piores.values())
-    
-    return {
-        'media_melhores_g1': media_melhores_g1,
-        'media_melhores_g2': media_melhores_g2,
-        'media_melhores_g3': media_melhores_g3,
-        'media_piores_g1': media_piores_g1,
-        'media_piores_g2': media_piores_g2,
-        'distribuicoes_mais_comuns': distribuicoes_mais_comuns,
-        'total_concursos': total_concursos,
-        'concursos_analisados': len(concursos_analisados)
-    }
+def calcular_media_ultimos(somas, n=2000):
+    """Calcula médias reais dos últimos N concursos (None = todos) pelas somas acumuladas"""
+    if n is not None and len(somas) < n:
+        st.warning(f"⚠️ Apenas {len(somas)} concursos disponíveis (ideal: {n})")
+    
+    # Médias e distribuições M x P da janela em O(1) / O(distribuições)
+    return nucleo.calcular_media_ultimos(somas, n)
 
-def calcular_distribuicao_por_grupo(distribuicao):
-    """Calcula a distribuição por grupo baseada na distribuição M x P"""
-    try:
-        partes = distribuicao.replace('m', '').replace('p', '').split(' x ')
-        m_count = int(partes[0])
-        p_count = int(partes[1])
-    except:
-        m_count = 10
-        p_count = 5
-    
-    # Distribuição inteligente baseada na experiência
-    if m_count == 10 and p_count == 5:
-        # 10M x 5P: Distribuição mais comum
-        return (4, 3, 3, 3, 2)  # G1, G2, G3, P1, P2
-    elif m_count == 9 and p_count == 6:
-        # 9M x 6P: Distribuição equilibrada
-        return (3, 3, 3, 3, 3)  # G1, G2, G3, P1, P2
-    elif m_count == 8 and p_count == 7:
-        # 8M x 7P: Mais números dos piores
-        return (3, 3, 2, 4, 3)  # G1, G2, G3, P1, P2
-    elif m_count == 11 and p_count == 4:
-        # 11M x 4P: Mais números dos melhores
-        return (4, 4, 3, 2, 2)  # G1, G2, G3, P1, P2
-    elif m_count == 7 and p_count == 8:
-        # 7M x 8P: Predominância dos piores
-        return (3, 2, 2, 4, 4)  # G1, G2, G3, P1, P2
-    else:
-        # Distribuição genérica para outros casos
-        return (
-            max(1, min(5, (m_count + 1) // 3)),
-            max(1, min(5, m_count // 3)),
-            max(1, min(5, m_count - ((m_count + 1) // 3) - (m_count // 3))),
-            max(1, min(5, (p_count + 1) // 2)),
-            max(1, min(5, p_count - ((p_count + 1) // 2)))
-        )
+def rotulo_janela(n):
+    return "Todos os" if n is None else f"Últimos {n}"
 
-def gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, padroes_recentes):
-    """Gera 6 sugestões baseadas nas 3 distribuições mais comuns dos últimos 2000 concursos"""
-    sugestoes = []
-    
-    # Analisar os últimos 2000 concursos
-    analise_2000 = calcular_media_ultimos_2000(padroes_recentes)
+def gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, somas, n=2000):
+    """Gera 6 sugestões baseadas nas 3 distribuições mais comuns dos últimos N concursos"""
+    # Cálculo no núcleo (sem Streamlit); aqui só a exibição
+    analise_janela, distribuicoes, sugestoes = nucleo.gerar_sugestoes(grupos_melhores, grupos_piores, somas, n)
     
-    st.write(f"📊 **Análise dos Últimos {analise_2000['concursos_analisados']} Concursos:**")
+    st.write(f"📊 **Análise dos Últimos {analise_janela['concursos_analisados']} Concursos:**")
     
     # Mostrar distribuições mais comuns
     st.write("**🎯 Distribuições Mais Comuns:**")
-    distribuicoes_mais_comuns = analise_2000['distribuicoes_mais_comuns']
+    distribuicoes_mais_comuns = analise_janela['distribuicoes_mais_comuns']
     
     for i, (distribuicao, count) in enumerate(distribuicoes_mais_comuns[:5], 1):  # Mostrar apenas top 5
         st.write(f"{i}º - {distribuicao}: {count} vezes")
     
     # Mostrar total para verificação
     total_exibido = sum(count for _, count in distribuicoes_mais_comuns[:5])
-    outros = analise_2000['total_concursos'] - total_exibido
+    outros = analise_janela['total_concursos'] - total_exibido
     if outros > 0:
         st.write(f"• Outras distribuições: {outros} vezes")
     
-    st.write(f"**📈 Médias por grupo (últimos 2000):**")
-    st.write(f"• Melhores G1: {analise_2000['media_melhores_g1']:.2f}")
-    st.write(f"• Melhores G2: {analise_2000['media_melhores_g2']:.2f}")
-    st.write(f"• Melhores G3: {analise_2000['media_melhores_g3']:.2f}")
-    st.write(f"• Piores G1: {analise_2000['media_piores_g1']:.2f}")
-    st.write(f"• Piores G2: {analise_2000['media_piores_g2']:.2f}")
+    st.write(f"**📈 Médias por grupo ({rotulo_janela(n).lower()} concursos):**")
+    st.write(f"• Melhores G1: {analise_janela['media_melhores_g1']:.2f}")
+    st.write(f"• Melhores G2: {analise_janela['media_melhores_g2']:.2f}")
+    st.write(f"• Melhores G3: {analise_janela['media_melhores_g3']:.2f}")
+    st.write(f"• Piores G1: {analise_janela['media_piores_g1']:.2f}")
+    st.write(f"• Piores G2: {analise_janela['media_piores_g2']:.2f}")
     
     # Verificar se temos pelo menos 3 distribuições
     if len(distribuicoes_mais_comuns) < 3:
         st.error(f"❌ Apenas {len(distribuicoes_mais_comuns)} distribuições distintas encontradas (necessário: 3)")
         return []
     
-    # Gerar 2 jogos para cada uma das 3 distribuições mais comuns
-    for dist_idx, (distribuicao, count) in enumerate(distribuicoes_mais_comuns[:3], 1):
+    for info in distribuicoes:
+        distribuicao = info['distribuicao']
+        target_melhores_g1, target_melhores_g2, target_melhores_g3, target_piores_g1, target_piores_g2 = info['alvos']
         st.write(f"---")
-        st.write(f"🎯 **Gerando 2 jogos para: {distribuicao}** ({dist_idx}ª distribuição mais comum - {count} vezes)")
-        
-        # Calcular distribuição por grupos
-        target_melhores_g1, target_melhores_g2, target_melhores_g3, target_piores_g1, target_piores_g2 = calcular_distribuicao_por_grupo(distribuicao)
-        
-        # Extrair totais
-        try:
-            partes = distribuicao.replace('m', '').replace('p', '').split(' x ')
-            total_melhores = int(partes[0])
-            total_piores = int(partes[1])
-        except:
-            total_melhores = target_melhores_g1 + target_melhores_g2 + target_melhores_g3
-            total_piores = target_piores_g1 + target_piores_g2
+        st.write(f"🎯 **Gerando 2 jogos para: {distribuicao}** ({info['posicao']}ª distribuição mais comum - {info['ocorrencias']} vezes)")
         
         st.write(f"📋 **Distribuição por grupos:**")
         st.write(f"• Melhores G1: {target_melhores_g1} números")
@@ -335,72 +182,215 @@ def gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, padroes_recente
         st.write(f"• Melhores G3: {target_melhores_g3} números")
         st.write(f"• Piores G1: {target_piores_g1} números")
         st.write(f"• Piores G2: {target_piores_g2} números")
-        st.write(f"• **Total: {total_melhores}M + {total_piores}P = 15 números**")
-        
-        # Validar se os grupos têm números suficientes
-        for i, (grupo, qtd) in enumerate([
-            (grupos_melhores[0], target_melhores_g1),
-            (grupos_melhores[1], target_melhores_g2),
-            (grupos_melhores[2], target_melhores_g3),
-            (grupos_piores[0], target_piores_g1),
-            (grupos_piores[1], target_piores_g2)
-        ], 1):
-            if len(grupo) < qtd:
-                st.error(f"❌ Grupo {i} tem apenas {len(grupo)} números, mas precisa de {qtd}")
-                return []
-        
-        # Gerar 2 jogos para esta distribuição
-        jogos_gerados = 0
-        tentativas = 0
-        max_tentativas = 1000
-        
-        with st.spinner(f"Gerando 2 jogos para {distribuicao}..."):
-            while jogos_gerados < 2 and tentativas < max_tentativas:
-                tentativas += 1
-                
-                try:
-                    # Selecionar números de cada grupo conforme as metas
-                    selecao_melhores_g1 = random.sample(grupos_melhores[0], target_melhores_g1)
-                    selecao_melhores_g2 = random.sample(grupos_melhores[1], target_melhores_g2)
-                    selecao_melhores_g3 = random.sample(grupos_melhores[2], target_melhores_g3)
-                    selecao_piores_g1 = random.sample(grupos_piores[0], target_piores_g1)
-                    selecao_piores_g2 = random.sample(grupos_piores[1], target_piores_g2)
-                    
-                    # Combinar todas as seleções
-                    jogo = (selecao_melhores_g1 + selecao_melhores_g2 + selecao_melhores_g3 + 
-                            selecao_piores_g1 + selecao_piores_g2)
-                    
-                    # Verificar se temos exatamente 15 números únicos
-                    if len(jogo) == 15 and len(set(jogo)) == 15:
-                        jogo_ordenado = sorted(jogo)
-                        chave = tuple(jogo_ordenado)
-                        
-                        # Verificar se já não geramos esta combinação
-                        if not any(s['chave'] == chave for s in sugestoes):
-                            sugestoes.append({
-                                'chave': chave,
-                                'jogo': jogo_ordenado,
-                                'melhores_g1': selecao_melhores_g1,
-                                'melhores_g2': selecao_melhores_g2,
-                                'melhores_g3': selecao_melhores_g3,
-                                'piores_g1': selecao_piores_g1,
-                                'piores_g2': selecao_piores_g2,
-                                'total_melhores': total_melhores,
-                                'total_piores': total_piores,
-                                'distribuicao_origem': distribuicao,
-                                'posicao_distribuicao': dist_idx
-                            })
-                            jogos_gerados += 1
-                
-                except ValueError:
-                    # Log silencioso para erros de sample
-                    continue
-            
-            if jogos_gerados < 2:
-                st.warning(f"⚠️ Apenas {jogos_gerados} jogo(s) gerado(s) para {distribuicao}")
+        st.write(f"• **Total: {sum(info['alvos'][:3])}M + {sum(info['alvos'][3:])}P = 15 números**")
+        
+        if info['jogos'] < 2:
+            st.warning(f"⚠️ Apenas {info['jogos']} jogo(s) gerado(s) para {distribuicao}: o padrão admite {info['espaco']} jogo(s) com os grupos atuais")
     
     return sugestoes
 
+def exibir_geracao_lote(grupos_melhores, grupos_piores, somas, n=2000):
+    """Gera milhares de jogos de uma vez, repartidos entre as K distribuições mais comuns"""
+    distribuicoes_mais_comuns = calcular_media_ultimos(somas, n)['distribuicoes_mais_comuns']
+    if not distribuicoes_mais_comuns:
+        st.info("Sem distribuições na janela escolhida")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        quantidade = st.number_input("Quantidade de jogos", min_value=1000, max_value=LIMITE_LOTE, value=10000, step=1000, key='lote_quantidade')
+    with col2:
+        top_k = st.slider("Distribuições (top K)", 1, len(distribuicoes_mais_comuns), min(3, len(distribuicoes_mais_comuns)), key='lote_top_k')
+    with col3:
+        semente = st.number_input("Semente (0 = aleatória)", min_value=0, value=0, step=1, key='lote_semente')
+
+    if st.button("📦 Gerar Lote", key='lote_gerar', use_container_width=True):
+        # Peso de cada distribuição = frequência histórica na janela
+        distribuicoes = [(dist, calcular_distribuicao_por_grupo(dist), count) for dist, count in distribuicoes_mais_comuns[:top_k]]
+        lote = gerar_lote(grupos_melhores + grupos_piores, distribuicoes, quantidade, int(semente) or None)
+        st.session_state['lote'] = lote
+
+    lote = st.session_state.get('lote')
+    if lote is None:
+        return
+    # Compara com o pedido do lote gerado, não com o valor atual do campo
+    if len(lote) < lote.quantidade:
+        st.warning(f"⚠️ Os padrões escolhidos admitem apenas {len(lote)} jogos distintos")
+    st.success(f"✅ {len(lote)} jogos distintos gerados (semente {lote.semente})")
+    st.dataframe(
+        pd.DataFrame(lote.resumo()).rename(columns={
+            'distribuicao': 'Distribuição', 'grupos': 'G1, G2, G3, P1, P2',
+            'peso': 'Ocorrências', 'espaco': 'Jogos Possíveis', 'jogos': 'Jogos Gerados'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    # Só uma amostra vai para a tela; o lote completo só é serializado no clique do download
+    st.dataframe(lote.para_dataframe(limite=100), use_container_width=True, hide_index=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("📥 Baixar Lote (CSV)", lote.para_csv, file_name=f"lote_{len(lote)}_jogos.csv",
+                           mime="text/csv", key='lote_csv', use_container_width=True)
+    with col2:
+        if armazenamento.pq is not None:
+            st.download_button("📥 Baixar Lote (Parquet)", lote.para_parquet, file_name=f"lote_{len(lote)}_jogos.parquet",
+                               mime="application/octet-stream", key='lote_parquet', use_container_width=True)
+
+def exibir_walk_forward(base, n=2000):
+    """Avalia a estratégia de grupos concurso a concurso, só com o passado de cada um"""
+    st.write("Em cada concurso, grupos e distribuições são recalculados só com os concursos anteriores; "
+             "os jogos gerados são conferidos contra o concurso seguinte e comparados com duas referências.")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        # O número do concurso vira a posição na base (em ordem de concurso); o primeiro não tem passado
+        primeiro, ultimo = int(base.concursos[min(1, len(base) - 1)]), int(base.concursos[-1])
+        concurso_inicial = st.number_input("Começar no concurso nº", min_value=primeiro, max_value=max(primeiro, ultimo), value=int(base.concursos[min(100, len(base) - 1)]), key='wf_inicio')
+        inicio = max(1, int(np.searchsorted(base.concursos, concurso_inicial, side='left')))
+    with col2:
+        jogos_por_concurso = st.number_input("Jogos por concurso", min_value=1, max_value=1000, value=6, key='wf_jogos')
+    with col3:
+        passo = st.number_input("Passo (concursos)", min_value=1, max_value=100, value=1, key='wf_passo')
+    with col4:
+        semente = st.number_input("Semente (0 = aleatória)", min_value=0, value=0, step=1, key='wf_semente')
+
+    if st.button("📈 Rodar Avaliação", key='wf_rodar', use_container_width=True):
+        with st.spinner("Avaliando concurso a concurso..."):
+            inicio_tempo = datetime.now()
+            resultados, semente_usada = avaliar_walk_forward(
+                base.mascaras, inicio=int(inicio), passo=int(passo), jogos_por_concurso=int(jogos_por_concurso),
+                janela=n, semente=int(semente) or None
+            )
+            segundos = (datetime.now() - inicio_tempo).total_seconds()
+        st.session_state['walk_forward'] = (resumo_walk_forward(resultados), semente_usada, segundos)
+
+    if 'walk_forward' in st.session_state:
+        resumo, semente_usada, segundos = st.session_state['walk_forward']
+        st.dataframe(resumo, use_container_width=True, hide_index=True)
+        st.caption(f"Semente {semente_usada} · {segundos:.1f} s")
+
+def exibir_explorador_combinacoes(grupos_melhores, grupos_piores, somas, n=2000):
+    """Filtra e sorteia jogos direto na tabela com todas as C(25,15) combinações"""
+    st.write(f"Consulta vetorial sobre as {TOTAL_COMBINACOES:,} combinações possíveis".replace(',', '.'))
+
+    distribuicoes = [dist for dist, _ in calcular_media_ultimos(somas, n)['distribuicoes_mais_comuns'][:5]]
+    col1, col2 = st.columns(2)
+    with col1:
+        distribuicao = st.selectbox("Distribuição por grupos", ["Qualquer"] + distribuicoes, key='explorador_distribuicao')
+        faixa_soma = st.slider("Soma dos números", 120, 270, (170, 220), key='explorador_soma')
+    with col2:
+        faixa_impares = st.slider("Quantidade de ímpares", 3, 13, (6, 9), key='explorador_impares')
+        faixa_primos = st.slider("Quantidade de primos", 0, 9, (4, 6), key='explorador_primos')
+
+    with st.spinner("Carregando tabela de combinações..."):
+        tabela = tabela_combinacoes()
+    alvos = None if distribuicao == "Qualquer" else calcular_distribuicao_por_grupo(distribuicao)
+    padroes = padroes_combinacoes(tabela, grupos_melhores, grupos_piores) if alvos else None
+    indices = filtrar(tabela, padroes, alvos, soma=faixa_soma, impares=faixa_impares, primos=faixa_primos)
+
+    if alvos:
+        st.write(f"**Grupos (G1, G2, G3, P1, P2):** {alvos}")
+    st.metric("🎯 Combinações que atendem aos filtros", f"{len(indices):,}".replace(',', '.'))
+
+    quantidade = st.number_input("Jogos a sortear", min_value=1, max_value=50, value=10, key='explorador_quantidade')
+    if st.button("🎲 Sortear Jogos Filtrados", key='explorador_sortear', use_container_width=True):
+        mascaras = sortear(tabela, indices, int(quantidade))
+        if len(mascaras) == 0:
+            st.warning("⚠️ Nenhuma combinação atende aos filtros escolhidos")
+            return
+        linhas = tabela[np.searchsorted(tabela['mascara'], mascaras)]
+        st.dataframe(
+            pd.DataFrame({
+                'Jogo': [" - ".join(f"{num:02d}" for num in numeros_de_mascara(m)) for m in mascaras],
+                'Soma': linhas['soma'],
+                'Ímpares': linhas['impares'],
+                'Primos': linhas['primos']
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+def exibir_coocorrencia(analise):
+    """Heatmap dos pares que saem juntos e ranking de pares e trios"""
+    coocorrencia = analise.coocorrencia()
+    st.write(f"Contagens sobre {coocorrencia.n} concursos "
+             f"(esperado em sorteios uniformes: {coocorrencia.esperado(2):.0f} por par, "
+             f"{coocorrencia.esperado(3):.0f} por trio)")
+
+    medida = st.radio("Cor do mapa", ["Vezes juntos", "Desvio do esperado (%)"], horizontal=True,
+                      key='coocorrencia_medida')
+    pares = pd.DataFrame(coocorrencia.tabela_pares())
+    esperado = max(coocorrencia.esperado(2), 1)
+    pares['desvio'] = (100 * (pares['vezes'] - esperado) / esperado).round(2)
+    campo = 'vezes' if medida == "Vezes juntos" else 'desvio'
+    escala = alt.Scale(scheme='blues') if campo == 'vezes' else alt.Scale(scheme='redblue', domainMid=0, reverse=True)
+
+    mapa = alt.Chart(pares).mark_rect().encode(
+        x=alt.X('numero_b:O', title='Número'),
+        y=alt.Y('numero_a:O', title='Número'),
+        color=alt.Color(f'{campo}:Q', scale=escala, title='Vezes' if campo == 'vezes' else 'Desvio %'),
+        tooltip=['numero_a', 'numero_b', 'vezes', 'percentual', 'desvio']
+    ).properties(height=500)
+    st.altair_chart(mapa, use_container_width=True)
+
+    def tabela(itens):
+        return pd.DataFrame({'Números': [" - ".join(f"{num:02d}" for num in nums) for nums, _ in itens],
+                             'Vezes': [vezes for _, vezes in itens]})
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.write("**🔝 Pares mais frequentes**")
+        st.dataframe(tabela(coocorrencia.mais_frequentes(10, 'pares')), use_container_width=True, hide_index=True)
+    with col2:
+        st.write("**🔝 Trios mais frequentes**")
+        st.dataframe(tabela(coocorrencia.mais_frequentes(10, 'trios')), use_container_width=True, hide_index=True)
+    with col3:
+        st.write("**🔻 Trios menos frequentes**")
+        st.dataframe(tabela(coocorrencia.mais_frequentes(10, 'trios', menos=True)), use_container_width=True,
+                     hide_index=True)
+
+def exibir_atrasos(analise):
+    """Atraso atual, maior atraso e histograma de ausências de cada número"""
+    concursos = analise.base.concursos
+    primeiro, ultimo = int(concursos[0]), int(concursos[-1])
+    concurso = st.number_input("Situação logo após o concurso", min_value=primeiro, max_value=ultimo, value=ultimo,
+                               step=1, key='atrasos_concurso')
+    atrasos = analise.atrasos(int(concurso))
+
+    tabela = pd.DataFrame([{
+        'Número': item['numero'],
+        'Último Concurso': item['ultimo_concurso'],
+        'Atraso Atual': item['atraso'],
+        'Maior Atraso': item['maior_atraso'],
+        'Ausência Média': round(sum(g * v for g, v in item['histograma'].items())
+                                / max(sum(item['histograma'].values()), 1), 2)
+    } for item in atrasos]).sort_values(['Atraso Atual', 'Número'], ascending=[False, True])
+    st.dataframe(tabela, use_container_width=True, hide_index=True)
+
+    numero = st.selectbox("Histograma de ausências do número", list(range(1, 26)), key='atrasos_numero')
+    histograma = atrasos[numero - 1]['histograma']
+    if histograma:
+        grafico = alt.Chart(pd.DataFrame({'Concursos sem sair': list(histograma.keys()),
+                                          'Vezes': list(histograma.values())})).mark_bar().encode(
+            x=alt.X('Concursos sem sair:O'),
+            y=alt.Y('Vezes:Q'),
+            tooltip=['Concursos sem sair', 'Vezes']
+        )
+        st.altair_chart(grafico, use_container_width=True)
+    else:
+        st.info("Nenhuma ausência encerrada até este concurso")
+
+def exibir_quarentena(resultado, caminho):
+    """Resumo das linhas recusadas na validação, com a tabela e o relatório para download"""
+    validacao.gravar_quarentena(resultado, caminho)
+    st.warning(f"⚠️ {resultado.total_invalidas} linha(s) em quarentena (fora das análises)")
+    for motivo, quantidade in resultado.resumo().items():
+        st.write(f"- {motivo}: {quantidade}")
+    relatorio = resultado.quarentena()
+    st.dataframe(relatorio.head(100), use_container_width=True, hide_index=True)
+    st.download_button("📥 Baixar Relatório da Quarentena", relatorio.to_csv(sep=';', index=False).encode('utf-8'),
+                       file_name=os.path.basename(caminho), mime="text/csv")
+
 def exibir_secao_upload():
     st.info("""
     ### 📋 Para começar, faça upload do arquivo CSV com os dados da Lotofácil
@@ -430,24 +420,30 @@ def exibir_secao_upload():
             content = uploaded_file.getvalue().decode('utf-8')
             df = pd.read_csv(io.StringIO(content), sep=';')
             
-            # Validar colunas básicas
-            colunas_necessarias = ['Concurso', 'Data Sorteio']
-            colunas_bolas = [f'Bola{i}' for i in range(1, 16)]
-            colunas_validas = all(col in df.columns for col in colunas_necessarias)
+            # Validar o arquivo inteiro; linhas com problema ficam no relatório de quarentena
+            resultado = validacao.validar(df)
             
-            if colunas_validas:
-                # Criar diretório se não existir
-                os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
-                
-                # Salvar arquivo
-                with open(CSV_PATH, 'wb') as f:
-                    f.write(uploaded_file.getvalue())
-                
+            if resultado.faltantes:
+                st.error(f"❌ Arquivo inválido. Colunas faltantes: {', '.join(resultado.faltantes)}")
+                return
+            
+            # Criar diretório se não existir
+            os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
+            
+            # Salvar arquivo (as linhas recusadas são separadas na carga)
+            with open(CSV_PATH, 'wb') as f:
+                f.write(uploaded_file.getvalue())
+            cache.invalidar()
+            
+            if resultado.total_invalidas:
+                st.success(f"✅ Arquivo carregado: {len(df) - resultado.total_invalidas} concursos válidos.")
+                exibir_quarentena(resultado, validacao.caminho_quarentena(CSV_PATH, 'upload'))
+                if st.button("▶️ Continuar", type="primary"):
+                    st.rerun()
+            else:
                 st.success("✅ Arquivo carregado com sucesso!")
                 st.balloons()
                 st.rerun()
-            else:
-                st.error("❌ Arquivo inválido. Verifique as colunas necessárias.")
                 
         except Exception as e:
             st.error(f"❌ Erro ao processar arquivo: {str(e)}")
@@ -459,7 +455,7 @@ def exibir_jogo():
     st.header("📊 Análise de Jogos - Lotofácil")
     
     # Se arquivo não existe, mostrar opções
-    if not os.path.exists(CSV_PATH):
+    if not armazenamento.existe_dados(CSV_PATH):
         st.warning("📁 Arquivo de dados não encontrado")
         
         col1, col2 = st.columns(2)
@@ -478,19 +474,33 @@ def exibir_jogo():
     
     # Se arquivo existe, carregar e mostrar análise
     try:
-        df = pd.read_csv(CSV_PATH, sep=';', encoding='utf-8')
+        # Dados e análises (núcleo sem Streamlit) ficam em cache enquanto o conteúdo dos arquivos não mudar
+        with medicao.etapa('carregar_dados'):
+            analise = nucleo.carregar_analise(CSV_PATH)
+            base = analise.base
+        
+        if base.empty:
+            st.warning("📝 Nenhum concurso válido no arquivo de dados.")
+            return
         
-        # Ordenar por concurso (mais recentes primeiro)
-        df = df.sort_values('Concurso', ascending=False).reset_index(drop=True)
+        # Linhas recusadas na carga (relatório gravado junto do retrato binário)
+        caminho_quarentena = validacao.caminho_quarentena(CSV_PATH)
+        if os.path.exists(caminho_quarentena):
+            relatorio = pd.read_csv(caminho_quarentena, sep=';', dtype=str)
+            with st.expander(f"⚠️ {len(relatorio)} linha(s) do arquivo em quarentena (fora das análises)"):
+                st.dataframe(relatorio.head(100), use_container_width=True, hide_index=True)
+                st.download_button("📥 Baixar Relatório da Quarentena", relatorio.to_csv(sep=';', index=False).encode('utf-8'),
+                                   file_name=os.path.basename(caminho_quarentena), mime="text/csv",
+                                   key='quarentena_carga')
         
         # Informações básicas
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("📈 Total de Concursos", len(df))
+            st.metric("📈 Total de Concursos", len(base))
         with col2:
-            st.metric("🎯 Primeiro Concurso", df['Concurso'].min())
+            st.metric("🎯 Primeiro Concurso", int(base.concursos.min()))
         with col3:
-            st.metric("🔥 Último Concurso", df['Concurso'].max())
+            st.metric("🔥 Último Concurso", int(base.concursos.max()))
         
         st.markdown("---")
         
@@ -498,7 +508,10 @@ def exibir_jogo():
         st.subheader("🎯 Análise Avançada por Grupos de 5")
         
         # Calcular grupos
-        grupos_melhores, grupos_piores, frequencia = analisar_distribuicao_grupos(df)
+        # Estado incremental: contagens, grupos e padrões só processam concursos novos
+        with medicao.etapa('analise_grupos'):
+            grupos_melhores, grupos_piores = analise.grupos()
+            frequencia = analise.frequencia()
         
         # Exibir grupos
         col1, col2 = st.columns(2)
@@ -516,12 +529,23 @@ def exibir_jogo():
                 st.write(f"**Grupo {i+3}:** {', '.join(numeros_com_freq)}")
         
         # Analisar padrões recentes
-        padroes_recentes = analisar_padrao_concursos(df, grupos_melhores, grupos_piores)
+        with medicao.etapa('analise_padroes'):
+            padroes_recentes = analise.padroes()
+            
+            # Somas acumuladas: qualquer janela sai em O(1) sem recalcular os padrões
+            somas = analise.somas
         
         # Mostrar análise dos últimos concursos
         st.markdown("---")
         st.subheader("📊 Análise dos Últimos Concursos")
         
+        janela = st.selectbox(
+            "Janela de análise",
+            JANELAS_PADRAO,
+            index=JANELAS_PADRAO.index(2000),
+            format_func=lambda n: "Todos os concursos" if n is None else f"Últimos {n} concursos"
+        )
+        
         if padroes_recentes:
             # Criar DataFrame para exibição (últimos 30 para visualização)
             df_padroes = pd.DataFrame(padroes_recentes[:30])
@@ -544,47 +568,70 @@ def exibir_jogo():
                 height=400
             )
             
-            # Estatísticas dos últimos 2000
-            if len(padroes_recentes) >= 2000:
-                analise_2000 = calcular_media_ultimos_2000(padroes_recentes)
+            # Estatísticas da janela escolhida
+            if janela is None or len(somas) >= janela:
+                with medicao.etapa('estatisticas'):
+                    analise_janela = calcular_media_ultimos(somas, janela)
                 
-                st.write("**📈 Estatísticas dos Últimos 2000 Concursos:**")
+                st.write(f"**📈 Estatísticas - {rotulo_janela(janela)} Concursos:**")
                 
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.write(f"**Total de concursos analisados: {analise_2000['total_concursos']}**")
+                    st.write(f"**Total de concursos analisados: {analise_janela['total_concursos']}**")
                     
                     st.write("**Distribuições mais comuns:**")
-                    for dist, count in analise_2000['distribuicoes_mais_comuns'][:5]:  # Mostrar apenas top 5
+                    for dist, count in analise_janela['distribuicoes_mais_comuns'][:5]:  # Mostrar apenas top 5
                         st.write(f"• {dist}: {count} vezes")
                     
                     # Mostrar outras distribuições se houver
-                    outros = analise_2000['total_concursos'] - sum(count for _, count in analise_2000['distribuicoes_mais_comuns'][:5])
+                    outros = analise_janela['total_concursos'] - sum(count for _, count in analise_janela['distribuicoes_mais_comuns'][:5])
                     if outros > 0:
                         st.write(f"• **Outras distribuições: {outros} vezes**")
                 
                 with col2:
                     st.write("**Médias por grupo:**")
-                    st.write(f"• Melhores G1: {analise_2000['media_melhores_g1']:.2f}")
-                    st.write(f"• Melhores G2: {analise_2000['media_melhores_g2']:.2f}")
-                    st.write(f"• Melhores G3: {analise_2000['media_melhores_g3']:.2f}")
-                    st.write(f"• Piores G1: {analise_2000['media_piores_g1']:.2f}")
-                    st.write(f"• Piores G2: {analise_2000['media_piores_g2']:.2f}")
+                    st.write(f"• Melhores G1: {analise_janela['media_melhores_g1']:.2f}")
+                    st.write(f"• Melhores G2: {analise_janela['media_melhores_g2']:.2f}")
+                    st.write(f"• Melhores G3: {analise_janela['media_melhores_g3']:.2f}")
+                    st.write(f"• Piores G1: {analise_janela['media_piores_g1']:.2f}")
+                    st.write(f"• Piores G2: {analise_janela['media_piores_g2']:.2f}")
             else:
-                st.warning(f"⚠️ Apenas {len(padroes_recentes)} concursos disponíveis (ideal: 2000 para análise completa)")
+                st.warning(f"⚠️ Apenas {len(padroes_recentes)} concursos disponíveis (ideal: {janela} para análise completa)")
+            
+            # Comparativo entre janelas
+            with st.expander("📐 Comparar Janelas (100 / 500 / 2000 / Todos)"):
+                with medicao.etapa('estatisticas'):
+                    comparativo = comparar_janelas(somas)
+                st.dataframe(
+                    pd.DataFrame(comparativo).rename(
+                        columns={
+                            'janela': 'Janela',
+                            'concursos': 'Concursos',
+                            'melhores_g1': 'M-G1',
+                            'melhores_g2': 'M-G2',
+                            'melhores_g3': 'M-G3',
+                            'piores_g1': 'P-G1',
+                            'piores_g2': 'P-G2',
+                            'mais_comum': 'Mais Comum'
+                        }
+                    ),
+                    use_container_width=True,
+                    hide_index=True
+                )
         
         # SUGESTÕES INTELIGENTES
         st.markdown("---")
-        st.subheader("💡 Sugestões Inteligentes Baseadas nas 3 Distribuições Mais Comuns dos Últimos 2000 Concursos")
+        st.subheader(f"💡 Sugestões Inteligentes Baseadas nas 3 Distribuições Mais Comuns - {rotulo_janela(janela)} Concursos")
         
         if st.button("🎯 Gerar 6 Sugestões (2 para cada das 3 distribuições mais comuns)", type="primary", use_container_width=True):
             if not padroes_recentes:
                 st.error("❌ Não há dados suficientes para análise")
             else:
-                sugestoes = gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, padroes_recentes)
+                with medicao.etapa('sugestoes'):
+                    sugestoes = gerar_sugestoes_inteligentes(grupos_melhores, grupos_piores, somas, janela)
                 
                 if sugestoes:
-                    st.success(f"🎉 {len(sugestoes)} sugestões geradas com base nas 3 distribuições mais comuns dos últimos 2000 concursos!")
+                    st.success(f"🎉 {len(sugestoes)} sugestões geradas com base nas 3 distribuições mais comuns ({rotulo_janela(janela).lower()} concursos)!")
                     
                     # Resumo das sugestões geradas
                     st.write("---")
@@ -653,14 +700,46 @@ def exibir_jogo():
                 else:
                     st.error("❌ Não foi possível gerar sugestões com os padrões atuais")
         
+        # Geração em lote (arquivo com milhares de jogos)
+        st.markdown("---")
+        with st.expander("📦 Geração em Lote (1.000 a 100.000 jogos)"):
+            exibir_geracao_lote(grupos_melhores, grupos_piores, somas, janela)
+
+        # Conferência dos jogos contra todo o histórico
+        st.markdown("---")
+        with st.expander("🧪 Conferência de Jogos no Histórico (11 a 15 pontos)"):
+            lote = st.session_state.get('lote')
+            exibir_conferencia_jogos(base, None if lote is None else lote.mascaras, "📦 Último lote gerado",
+                                     "Gere um lote na seção 📦 Geração em Lote ou envie um arquivo CSV")
+
+        # Avaliação walk-forward contra as referências
+        st.markdown("---")
+        with st.expander("📈 Avaliação Walk-Forward (grupos x aleatório x frequência)"):
+            exibir_walk_forward(base, janela)
+
+        # Explorador de combinações (tabela pré-calculada de todos os jogos)
+        st.markdown("---")
+        with st.expander("🔎 Explorador de Combinações (filtros por grupo, soma, ímpares e primos)"):
+            exibir_explorador_combinacoes(grupos_melhores, grupos_piores, somas, janela)
+
+        # Pares e trios que saem juntos (atualizados a cada concurso cadastrado)
+        st.markdown("---")
+        with st.expander("🔗 Pares e Trios (coocorrência)"):
+            exibir_coocorrencia(analise)
+
+        # Atrasos por número (consultáveis em qualquer concurso do histórico)
+        st.markdown("---")
+        with st.expander("⏳ Atrasos por Número"):
+            exibir_atrasos(analise)
+
         # Botão para recarregar arquivo
         st.markdown("---")
         col_rec1, col_rec2, col_rec3 = st.columns([1, 1, 1])
         
         with col_rec2:
             if st.button("🔄 Carregar Novo Arquivo CSV", use_container_width=True):
-                if os.path.exists(CSV_PATH):
-                    os.remove(CSV_PATH)
+                armazenamento.remover_dados(CSV_PATH)
+                cache.invalidar()
                 st.rerun()
             
     except Exception as e:
@@ -676,7 +755,8 @@ def tela_atualizacao_dados():
     verificar_estrutura()
     criar_arquivo_base()
     
-    df = carregar_dados()
+    with medicao.etapa('carregar_dados'):
+        df = carregar_dados()
     
     # Informações atuais
     col1, col2, col3 = st.columns(3)
@@ -740,30 +820,20 @@ def tela_atualizacao_dados():
         submitted = st.form_submit_button("💾 Salvar Concurso", type="primary", use_container_width=True)
         
         if submitted:
-            # Validações
-            erros = []
-            if not df.empty and numero_concurso in df['Concurso'].values:
-                erros.append(f"Concurso {numero_concurso} já existe!")
-            if len(numeros) != 15:
-                erros.append("São necessários 15 números!")
-            if len(numeros) != len(set(numeros)):
-                erros.append("Números devem ser únicos!")
-            if any(num < 1 or num > 25 for num in numeros):
-                erros.append("Números devem estar entre 1 e 25!")
+            novo_concurso = {'Concurso': numero_concurso, 'Data Sorteio': data_sorteio.strftime('%d/%m/%Y')}
+            for i, num in enumerate(numeros, 1):
+                novo_concurso[f'Bola{i}'] = num
+            
+            # Validações: as mesmas da carga (bolas, data e ordem em relação ao histórico)
+            with medicao.etapa('validacao'):
+                historico = nucleo.carregar_analise(CSV_PATH).base
+                erros = list(validacao.validar(pd.DataFrame([novo_concurso]), historico).resumo())
             
             if not erros:
-                novo_concurso = {'Concurso': numero_concurso, 'Data Sorteio': data_sorteio.strftime('%d/%m/%Y')}
-                for i, num in enumerate(numeros, 1):
-                    novo_concurso[f'Bola{i}'] = num
-                
-                if df.empty:
-                    df = pd.DataFrame([novo_concurso])
-                else:
-                    df = pd.concat([df, pd.DataFrame([novo_concurso])], ignore_index=True)
-                
-                df = df.sort_values('Concurso').reset_index(drop=True)
-                
-                if salvar_dados(df):
+                # Acréscimo no diário: custo fixo, independente do tamanho do histórico
+                with medicao.etapa('gravacao'):
+                    salvo = salvar_concurso(novo_concurso)
+                if salvo:
                     st.success(f"✅ Concurso {numero_concurso} salvo com sucesso!")
                     st.balloons()
                     
@@ -774,7 +844,7 @@ def tela_atualizacao_dados():
                         st.write(f"**Números:** {', '.join(map(str, sorted(numeros)))}")
             else:
                 for erro in erros:
-                    st.error(f"❌ {erro}")
+                    st.error(f"❌ Concurso {numero_concurso}: {erro}")
 
 def exibir_dados_loto():
     """Exibe os dados cadastrados"""
@@ -782,12 +852,13 @@ def exibir_dados_loto():
     
     verificar_estrutura()
     
-    if not os.path.exists(CSV_PATH):
+    if not armazenamento.existe_dados(CSV_PATH):
         st.warning("📝 Arquivo não encontrado.")
         st.info("Vá para 'Atualizar Dados' para criar o arquivo.")
         return
     
-    df = carregar_dados()
+    with medicao.etapa('carregar_dados'):
+        df = carregar_dados()
     
     if df.empty:
         st.warning("📝 Nenhum concurso cadastrado.")
@@ -814,45 +885,48 @@ def exibir_dados_loto():
     
     # Filtros
     st.subheader("🔍 Filtros")
-    col_f1, col_f2 = st.columns(2)
+    # Índice por concurso e por data pronto por versão dos dados (intervalos por busca
+    # binária); só a página exibida é montada
+    with medicao.etapa('indice_dados'):
+        versao = cache.versao_dados(CSV_PATH)
+        visao = cache.obter('visao_dados', versao, paginacao.VisaoPaginada, df)
+    col_f1, col_f2, col_f3 = st.columns(3)
     
     with col_f1:
-        if not df.empty:
-            min_conc = int(df['Concurso'].min())
-            max_conc = int(df['Concurso'].max())
-            concursos_range = st.slider(
-                "Intervalo de Concursos",
-                min_conc, max_conc, (min_conc, max_conc)
-            )
-            
-            df_filtrado = df[
-                (df['Concurso'] >= concursos_range[0]) & 
-                (df['Concurso'] <= concursos_range[1])
-            ]
-        else:
-            df_filtrado = df
+        min_conc, max_conc = visao.limites_concursos()
+        concursos_range = st.slider(
+            "Intervalo de Concursos",
+            min_conc, max_conc, (min_conc, max_conc)
+        )
     
     with col_f2:
+        data_inicio, data_fim = seletor_datas(visao)
+    
+    with col_f3:
         linhas_por_pagina = st.selectbox(
             "Linhas por página",
             [10, 25, 50, 100],
             index=0
         )
     
+    with medicao.etapa('filtro'):
+        posicoes = visao.filtrar(concursos_range[0], concursos_range[1], data_inicio=data_inicio,
+                                 data_fim=data_fim)
+    
     st.markdown("---")
     
     # Tabela de dados
     st.subheader("📋 Concursos Cadastrados")
-    st.write(f"**Mostrando {len(df_filtrado)} de {len(df)} concursos**")
+    st.write(f"**Mostrando {len(posicoes)} de {len(df)} concursos**")
     
-    if not df_filtrado.empty:
-        # Formatar a exibição
-        df_display = df_filtrado.copy()
+    if len(posicoes):
+        pagina_atual = seletor_pagina(paginacao.total_paginas(len(posicoes), linhas_por_pagina))
+        df_display = visao.pagina(posicoes, pagina_atual, linhas_por_pagina)
         if 'Data Sorteio' in df_display.columns:
             df_display = df_display[['Concurso', 'Data Sorteio'] + [f'Bola{i}' for i in range(1, 16)]]
         
         st.dataframe(
-            df_display.head(linhas_por_pagina),
+            df_display,
             use_container_width=True,
             hide_index=True,
             height=400
@@ -861,12 +935,17 @@ def exibir_dados_loto():
         # Download
         st.markdown("---")
         st.subheader("💾 Exportar Dados")
-        csv_data = df_filtrado.to_csv(index=False, sep=';', encoding='utf-8')
+        # Gerado só no clique, em cache por versão dos dados, intervalos e formato
+        formato = st.radio("Formato", exportacao.formatos_disponiveis(),
+                           format_func=lambda f: exportacao.FORMATOS[f]['rotulo'], horizontal=True,
+                           key='formato_exportacao')
+        inicio, fim = concursos_range
         st.download_button(
             label="📥 Baixar Dados Filtrados",
-            data=csv_data,
-            file_name=f"lotofacil_concursos_{concursos_range[0]}_{concursos_range[1]}.csv",
-            mime="text/csv",
+            data=lambda: exportacao.arquivo(versao, visao, formato, inicio, fim, data_inicio=data_inicio,
+                                            data_fim=data_fim),
+            file_name=exportacao.nome_arquivo(f"lotofacil_concursos_{inicio}_{fim}", formato),
+            mime=exportacao.FORMATOS[formato]['mime'],
             use_container_width=True
         )
     else:
@@ -879,12 +958,27 @@ opcao = st.sidebar.selectbox(
     ["📊 Análise de Jogos", "📁 Ver Dados", "🔄 Atualizar Dados", "ℹ️ Sobre"]
 )
 
+with st.sidebar.expander("🗄️ Cache de Análises"):
+    estatisticas_cache = cache.estatisticas()
+    st.caption(f"Entradas em memória: {estatisticas_cache['entradas']}")
+    for nome, contador in estatisticas_cache['artefatos'].items():
+        st.caption(f"• {nome}: {contador['acertos']} acertos / {contador['falhas']} falhas")
+    if st.button("♻️ Limpar Cache"):
+        cache.invalidar()
+
+# Tempo por etapa das telas (últimos reruns da sessão; painel opcional no fim da página)
+painel_medicao = st.sidebar.toggle("⏱️ Painel de Desempenho", key='painel_medicao')
+medicoes = st.session_state.setdefault('medicoes', deque(maxlen=medicao.MAX_HISTORICO))
+
 if opcao == "📊 Análise de Jogos":
-    exibir_jogo()  # ← FUNÇÃO PRINCIPAL COMPLETA
+    with medicao.rerun('exibir_jogo', medicoes):
+        exibir_jogo()  # ← FUNÇÃO PRINCIPAL COMPLETA
 elif opcao == "📁 Ver Dados":
-    exibir_dados_loto()
+    with medicao.rerun('exibir_dados_loto', medicoes):
+        exibir_dados_loto()
 elif opcao == "🔄 Atualizar Dados":
-    tela_atualizacao_dados()
+    with medicao.rerun('tela_atualizacao_dados', medicoes):
+        tela_atualizacao_dados()
 elif opcao == "ℹ️ Sobre":
     st.info("""
     ### 📋 Sobre o App:
@@ -892,7 +986,7 @@ elif opcao == "ℹ️ Sobre":
     **Lotofácil Analyzer**
     
     **Funcionalidades:**
-    - 📊 Análise avançada de jogos e estatísticas (últimos 2000 concursos)
+    - 📊 Análise avançada de jogos e estatísticas (janela de 100, 500, 2000 ou todos os concursos)
     - 🎯 6 sugestões inteligentes (2 para cada das 3 distribuições mais comuns)
     - 📁 Visualização completa de dados históricos  
     - 🔄 Atualização de dados via formulário
@@ -905,9 +999,15 @@ elif opcao == "ℹ️ Sobre":
     
     **Análises disponíveis:**
     - Frequência de números por grupos
-    - Padrões dos últimos 2000 concursos
+    - Padrões por janela de concursos (padrão: últimos 2000)
     - Distribuição Melhores x Piores
     - 6 sugestões baseadas nas 3 distribuições mais comuns
+    - Explorador das 3.268.760 combinações (grupo, soma, ímpares e primos)
+    - Geração em lote de 1.000 a 100.000 jogos com semente, exportados em CSV ou Parquet
+    - Conferência de lotes de jogos contra todo o histórico (11 a 15 pontos)
+    - Avaliação walk-forward da estratégia de grupos contra jogos aleatórios e por frequência
+    - Pares e trios que mais saem juntos (mapa de calor de coocorrência)
+    - Atraso atual, maior atraso e histograma de ausências de cada número, em qualquer concurso
     
     **Formato dos dados:**
     - Concurso, Data Sorteio, Bola1 a Bola15
@@ -915,6 +1015,9 @@ elif opcao == "ℹ️ Sobre":
     - Encoding: UTF-8
     """)
 
+if painel_medicao:
+    exibir_painel_medicao(medicoes)
+
 # Executar o aplicativo
 if __name__ == "__main__":
     # O app já está rodando via Streamlit, esta parte é para execução direta
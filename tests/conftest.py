@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+
+# Os testes importam os módulos sem Streamlit do pacote Sistema a partir da raiz
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Sistema.sorteios import BaseSorteios, mascaras_de_bolas  # noqa: E402
+
+def sortear_mascaras(quantidade, semente=0):
+    """Máscaras de `quantidade` concursos aleatórios (15 números distintos entre 1 e 25)"""
+    rng = np.random.default_rng(semente)
+    bolas = np.argsort(rng.random((quantidade, 25)), axis=1)[:, :15] + 1
+    return mascaras_de_bolas(bolas)
+
+def base_aleatoria(quantidade, semente=0, primeiro=1):
+    """BaseSorteios com concursos consecutivos e um sorteio por semana"""
+    concursos = np.arange(primeiro, primeiro + quantidade, dtype=np.int32)
+    datas = np.datetime64('2003-09-29') + 7 * (concursos - primeiro).astype('timedelta64[D]')
+    return BaseSorteios(concursos, datas, sortear_mascaras(quantidade, semente))
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from conftest import base_aleatoria
+from Sistema import armazenamento
+
+pytestmark = pytest.mark.skipif(not armazenamento.usa_parquet(), reason='exige o modo Parquet (pyarrow)')
+
+def test_salvar_regrava_o_csv_exportado(tmp_path):
+    csv_path = str(tmp_path / 'lotofacil.csv')
+    df = base_aleatoria(40, semente=41).para_dataframe()
+    armazenamento.salvar(df, csv_path)
+
+    pd.testing.assert_frame_equal(armazenamento.ler_csv(csv_path), df)
+    with open(csv_path, 'rb') as f:
+        assert f.read().startswith(b'\xef\xbb\xbfConcurso;Data Sorteio')
+    # A exportação não é tomada por um CSV novo a migrar
+    assert not armazenamento.migrar_csv(csv_path)
+    pd.testing.assert_frame_equal(armazenamento.carregar(csv_path), df, check_dtype=False)
+
+def test_compactar_atualiza_o_csv(tmp_path):
+    csv_path = str(tmp_path / 'lotofacil.csv')
+    df = base_aleatoria(45, semente=42).para_dataframe()
+    armazenamento.salvar(df.iloc[:40], csv_path)
+    armazenamento.anexar_lote(df.iloc[40:], csv_path)
+    assert len(armazenamento.ler_csv(csv_path)) == 40
+
+    assert armazenamento.compactar(csv_path)
+    pd.testing.assert_frame_equal(armazenamento.ler_csv(csv_path), df)
+    assert not armazenamento.migrar_csv(csv_path)
+
+def test_csv_com_datas_do_parquet(tmp_path):
+    csv_path = str(tmp_path / 'lotofacil.csv')
+    df = base_aleatoria(5, semente=43).para_dataframe()
+    datas = df.assign(**{'Data Sorteio': pd.to_datetime(df['Data Sorteio'], format='%d/%m/%Y')})
+    armazenamento.escrever_csv(datas, csv_path)
+    pd.testing.assert_frame_equal(armazenamento.ler_csv(csv_path), df)
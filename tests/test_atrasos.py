@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from conftest import sortear_mascaras
+from Sistema.atrasos import PASSO, IndiceAtrasos
+
+def situacao_forca_bruta(mascaras, posicao):
+    """Atraso atual, maior atraso e histograma de cada número varrendo os concursos 0..posicao"""
+    ultimo = np.full(25, -1)
+    maximo = np.zeros(25, dtype=np.int64)
+    histograma = [dict() for _ in range(25)]
+    for t in range(posicao + 1):
+        for j in range(25):
+            if int(mascaras[t]) >> j & 1:
+                if ultimo[j] >= 0:
+                    atraso = t - ultimo[j] - 1
+                    histograma[j][atraso] = histograma[j].get(atraso, 0) + 1
+                    maximo[j] = max(maximo[j], atraso)
+                ultimo[j] = t
+    atraso = np.where(ultimo >= 0, posicao - ultimo, posicao + 1)
+    return ultimo, atraso, np.maximum(maximo, atraso), histograma
+
+def conferir(situacao, esperado):
+    ultimo, atraso, maximo, histograma = esperado
+    np.testing.assert_array_equal(situacao['ultimo'], ultimo)
+    np.testing.assert_array_equal(situacao['atraso'], atraso)
+    np.testing.assert_array_equal(situacao['maximo'], maximo)
+    for j in range(25):
+        linha = situacao['histograma'][j]
+        assert {g: int(v) for g, v in enumerate(linha) if v} == histograma[j]
+
+# Posições em volta dos pontos de controle (a cada PASSO concursos)
+POSICOES = [0, 1, PASSO - 2, PASSO - 1, PASSO, PASSO + 1, 2 * PASSO - 1, 2 * PASSO, 2 * PASSO + 1, 2 * PASSO + 500]
+
+@pytest.fixture(scope='module')
+def historico():
+    # O número 25 é apagado de 97% dos concursos: atrasos longos, que atravessam os pontos de controle
+    mascaras = sortear_mascaras(2 * PASSO + 600, semente=11)
+    raros = np.random.default_rng(1).random(len(mascaras)) < 0.97
+    return np.where(raros, mascaras & np.uint32(~(1 << 24) & 0xFFFFFFFF), mascaras).astype(np.uint32)
+
+@pytest.mark.parametrize('posicao', POSICOES)
+def test_situacao_nos_pontos_de_controle(historico, posicao):
+    indice = IndiceAtrasos.de_mascaras(historico)
+    conferir(indice.situacao(historico, posicao), situacao_forca_bruta(historico, posicao))
+
+def test_ultimo_concurso(historico):
+    indice = IndiceAtrasos.de_mascaras(historico)
+    conferir(indice.situacao(historico), situacao_forca_bruta(historico, len(historico) - 1))
+
+@pytest.mark.parametrize('tamanhos', [[PASSO - 1, 1, 1, PASSO + 3], [PASSO, PASSO], [7] * 50 + [PASSO * 2]])
+def test_acrescentar_atravessando_pontos(historico, tamanhos):
+    completo = IndiceAtrasos.de_mascaras(historico)
+    indice = IndiceAtrasos()
+    inicio = 0
+    for tamanho in tamanhos:
+        indice.acrescentar(historico[inicio:inicio + tamanho])
+        inicio += tamanho
+    indice.acrescentar(historico[inicio:])
+
+    assert indice.n == completo.n == len(historico)
+    assert len(indice.pontos_ultimo) == len(completo.pontos_ultimo) == len(historico) // PASSO + 1
+    np.testing.assert_array_equal(indice.pontos_ultimo, completo.pontos_ultimo)
+    np.testing.assert_array_equal(indice.pontos_maximo, completo.pontos_maximo)
+    for posicao in POSICOES:
+        conferir(indice.situacao(historico, posicao), situacao_forca_bruta(historico, posicao))
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+
+from conftest import base_aleatoria
+from Sistema import armazenamento, binario, cache
+from Sistema.sorteios import BaseSorteios
+
+def conferir_base(base, esperada):
+    np.testing.assert_array_equal(base.concursos, esperada.concursos)
+    np.testing.assert_array_equal(base.datas, esperada.datas)
+    np.testing.assert_array_equal(base.mascaras, esperada.mascaras)
+
+def test_cabecalho_e_registros(tmp_path):
+    base = base_aleatoria(500, semente=8)
+    base.datas[10] = np.datetime64('NaT')
+    caminho = str(tmp_path / 'lotofacil.bin')
+    binario.escrever(binario.registros_de_base(base), caminho, 'parquet-abc123')
+
+    assert os.path.getsize(caminho) == binario.TAMANHO_CABECALHO + 500 * binario.TIPO_REGISTRO.itemsize
+    assert binario.ler_cabecalho(caminho) == {'quantidade': 500, 'versao_dados': 'parquet-abc123'}
+    cabecalho, registros = binario.mapear(caminho)
+    assert isinstance(registros, np.memmap)
+    conferir_base(binario.base_de_registros(registros), base)
+
+def test_base_vazia(tmp_path):
+    caminho = str(tmp_path / 'lotofacil.bin')
+    binario.escrever(binario.registros_de_base(BaseSorteios.vazia()), caminho, 'v')
+    cabecalho, registros = binario.mapear(caminho)
+    assert cabecalho['quantidade'] == 0 and len(registros) == 0
+
+def test_retrato_invalido(tmp_path):
+    caminho = str(tmp_path / 'lotofacil.bin')
+    assert binario.ler_cabecalho(caminho) is None
+    binario.escrever(binario.registros_de_base(base_aleatoria(10)), caminho, 'v')
+    # Tamanho em desacordo com o cabeçalho (gravação interrompida)
+    with open(caminho, 'ab') as f:
+        f.write(b'\0' * 5)
+    assert binario.ler_cabecalho(caminho) is None
+    # Assinatura de outro formato
+    with open(caminho, 'r+b') as f:
+        f.write(b'OUTRO   ')
+    assert binario.mapear(caminho) == (None, None)
+
+def test_acrescentar_concursos(tmp_path):
+    csv_path = str(tmp_path / 'lotofacil.csv')
+    base = base_aleatoria(300, semente=12)
+    armazenamento.salvar(base.selecionar(slice(0, 297)).para_dataframe(), csv_path)
+    cache.invalidar()
+    versao_anterior = cache.versao_dados(csv_path)
+    conferir_base(binario.carregar_base(csv_path, versao_anterior), base.selecionar(slice(0, 297)))
+
+    novos = base.selecionar(slice(297, 300))
+    armazenamento.salvar(base.para_dataframe(), csv_path)
+    cache.invalidar()
+    assert binario.acrescentar(novos, csv_path, versao_anterior)
+
+    versao = cache.versao_dados(csv_path)
+    assert binario.ler_cabecalho(binario.caminho_binario(csv_path)) == {'quantidade': 300, 'versao_dados': versao}
+    conferir_base(binario.carregar_base(csv_path, versao), base)
+    # Concursos repetidos ou retrato de outra versão não são acrescentados
+    assert not binario.acrescentar(novos, csv_path, versao)
+    assert not binario.acrescentar(novos, csv_path, versao_anterior)
@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from conftest import base_aleatoria
+from Sistema import armazenamento, cli
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = str(tmp_path / 'historico.csv')
+    armazenamento.escrever_csv(base_aleatoria(1200, semente=31).para_dataframe(), caminho)
+    return caminho
+
+def executar(arquivo, saida, *extras):
+    assert cli.main(['--arquivo', arquivo, '--saida', str(saida), *extras]) == 0
+
+def test_json_reprodutivel_pela_semente(arquivo, tmp_path):
+    for nome in ('a.json', 'b.json'):
+        executar(arquivo, tmp_path / nome, '--jogos', '300', '--semente', '7')
+    texto = (tmp_path / 'a.json').read_text(encoding='utf-8')
+    assert texto == (tmp_path / 'b.json').read_text(encoding='utf-8')
+
+    documento = json.loads(texto)
+    assert documento['concursos'] == 1200 and documento['ultimo_concurso'] == 1200
+    assert set(cli.SECOES) <= set(documento)
+    sugestoes = documento['sugestoes']
+    assert sugestoes['semente'] == 7
+    assert len(sugestoes['jogos']) == 300 == sum(d['jogos'] for d in sugestoes['distribuicoes'])
+    assert len({tuple(jogo) for jogo in sugestoes['jogos']}) == 300
+
+    executar(arquivo, tmp_path / 'c.json', '--jogos', '300', '--semente', '8')
+    assert json.loads((tmp_path / 'c.json').read_text(encoding='utf-8'))['sugestoes']['jogos'] != sugestoes['jogos']
+
+def test_secoes_e_parquet(arquivo, tmp_path):
+    pasta = tmp_path / 'resultado'
+    executar(arquivo, pasta, '--formato', 'parquet', '--secoes', 'grupos,sugestoes', '--semente', '1')
+    assert sorted(os.listdir(pasta)) == ['grupos.parquet', 'sugestoes.parquet']
+
+@pytest.mark.parametrize('argumentos', [['--secoes', 'grupos,outra'], ['--jogos', '0'], ['--formato', 'parquet']])
+def test_argumentos_invalidos(arquivo, argumentos):
+    with pytest.raises(SystemExit):
+        cli.main(['--arquivo', arquivo, *argumentos])
@@ -0,0 +1,51 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from conftest import sortear_mascaras
+from Sistema.coocorrencia import TRIOS, Coocorrencia, contar_pares, contar_trios
+from Sistema.sorteios import numeros_de_mascara
+
+def contar_forca_bruta(mascaras):
+    """Pares (matriz 25 x 25, diagonal = frequência) e trios (na ordem de TRIOS) concurso a concurso"""
+    pares = np.zeros((25, 25), dtype=np.int64)
+    trios = {}
+    for mascara in mascaras:
+        numeros = numeros_de_mascara(mascara)
+        for a in numeros:
+            for b in numeros:
+                pares[a - 1, b - 1] += 1
+        for trio in combinations(numeros, 3):
+            trios[trio] = trios.get(trio, 0) + 1
+    return pares, np.array([trios.get(tuple(int(x) for x in trio), 0) for trio in TRIOS])
+
+@pytest.mark.parametrize('quantidade', [0, 1, 31, 32, 33, 700])
+def test_contagens_iguais_a_forca_bruta(quantidade):
+    mascaras = sortear_mascaras(quantidade, semente=quantidade)
+    pares, trios = contar_forca_bruta(mascaras)
+    np.testing.assert_array_equal(contar_pares(mascaras), pares)
+    np.testing.assert_array_equal(contar_trios(mascaras), trios)
+
+def test_pares_em_blocos():
+    mascaras = sortear_mascaras(1000, semente=2)
+    np.testing.assert_array_equal(contar_pares(mascaras, linhas_por_bloco=64), contar_pares(mascaras))
+
+def test_acrescentar_igual_ao_historico_inteiro():
+    mascaras = sortear_mascaras(900, semente=4)
+    coocorrencia = Coocorrencia()
+    for inicio in range(0, len(mascaras), 250):
+        coocorrencia.acrescentar(mascaras[inicio:inicio + 250])
+    pares, trios = contar_forca_bruta(mascaras)
+    assert coocorrencia.n == len(mascaras)
+    np.testing.assert_array_equal(coocorrencia.pares, pares)
+    np.testing.assert_array_equal(coocorrencia.trios, trios)
+    np.testing.assert_array_equal(coocorrencia.frequencia(), np.diagonal(pares))
+
+def test_mais_frequentes():
+    mascaras = sortear_mascaras(300, semente=6)
+    coocorrencia = Coocorrencia.de_mascaras(mascaras)
+    _, trios = contar_forca_bruta(mascaras)
+    (trio, vezes), = coocorrencia.mais_frequentes(1)
+    assert vezes == trios.max()
+    assert trios[[tuple(int(x) for x in t) for t in TRIOS].index(trio)] == vezes
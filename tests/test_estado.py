@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from conftest import base_aleatoria
+from Sistema.analise import dividir_grupos
+from Sistema.estado import EstadoAnalise
+from Sistema.sorteios import numeros_de_mascara
+
+def recalcular(mascaras):
+    """Contagens, ranking e padrões por força bruta, sem nada do estado incremental"""
+    contagens = np.zeros(25, dtype=np.int64)
+    for mascara in mascaras:
+        for numero in numeros_de_mascara(mascara):
+            contagens[numero - 1] += 1
+    ranking = sorted(range(1, 26), key=lambda numero: (-contagens[numero - 1], numero))
+    melhores, piores = dividir_grupos(np.array(ranking))
+    grupos = [set(grupo) for grupo in melhores + piores]
+    padroes = np.array([[len(grupo & set(numeros_de_mascara(m))) for grupo in grupos] for m in mascaras])
+    return contagens, np.array(ranking), padroes
+
+@pytest.mark.parametrize('tamanhos', [[3000], [1, 1, 998, 1000, 1000], [2999, 1], [500] * 6])
+def test_incremental_igual_ao_recalculo(tamanhos):
+    base = base_aleatoria(sum(tamanhos), semente=7)
+    estado = EstadoAnalise(capacidade=16)
+    inicio = 0
+    for tamanho in tamanhos:
+        estado.acrescentar(base.concursos[inicio:inicio + tamanho], base.mascaras[inicio:inicio + tamanho])
+        inicio += tamanho
+
+    contagens, ranking, padroes = recalcular(base.mascaras)
+    completo = EstadoAnalise.de_base(base)
+    for resultado in (estado, completo):
+        assert len(resultado) == len(base)
+        np.testing.assert_array_equal(resultado.concursos, base.concursos)
+        np.testing.assert_array_equal(resultado.contagens, contagens)
+        np.testing.assert_array_equal(resultado.ranking, ranking)
+        np.testing.assert_array_equal(resultado.contagens_grupos, padroes)
+    assert estado.e_prefixo_de(base)
+
+def test_derivados_acompanham_os_novos_concursos():
+    base = base_aleatoria(2500, semente=3)
+    estado = EstadoAnalise.de_base(base.selecionar(slice(0, 1200)))
+    coocorrencia, atrasos = estado.coocorrencia(), estado.atrasos()
+    estado.acrescentar(base.concursos[1200:], base.mascaras[1200:])
+
+    completo = EstadoAnalise.de_base(base)
+    np.testing.assert_array_equal(coocorrencia.pares, completo.coocorrencia().pares)
+    np.testing.assert_array_equal(coocorrencia.trios, completo.coocorrencia().trios)
+    assert atrasos.n == completo.atrasos().n == len(base)
+    np.testing.assert_array_equal(atrasos.situacao(base.mascaras)['atraso'],
+                                  completo.atrasos().situacao(base.mascaras)['atraso'])
+
+def test_salvar_e_carregar(tmp_path):
+    base = base_aleatoria(1500, semente=5)
+    estado = EstadoAnalise.de_base(base)
+    estado.coocorrencia()
+    estado.atrasos()
+    caminho = str(tmp_path / 'lotofacil.analise.npz')
+    estado.salvar(caminho)
+
+    carregado = EstadoAnalise.carregar(caminho)
+    np.testing.assert_array_equal(carregado.contagens, estado.contagens)
+    np.testing.assert_array_equal(carregado.contagens_grupos, estado.contagens_grupos)
+    np.testing.assert_array_equal(carregado.coocorrencia().trios, estado.coocorrencia().trios)
+    np.testing.assert_array_equal(carregado.atrasos().situacao(base.mascaras, 700)['maximo'],
+                                  estado.atrasos().situacao(base.mascaras, 700)['maximo'])
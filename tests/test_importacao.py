@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from conftest import base_aleatoria
+from Sistema import importacao
+from Sistema.importacao import IGNORAR, INSERIR, SOBRESCREVER, mesclar
+from Sistema.sorteios import BaseSorteios
+
+def bases():
+    """Histórico 1..10 sem o concurso 7; importação com o 3 idêntico, o 5 diferente, o 7 e o 11 novos"""
+    completa = base_aleatoria(11, semente=9)
+    existentes = completa.selecionar((completa.concursos != 7) & (completa.concursos <= 10))
+    novos = completa.selecionar(np.isin(completa.concursos, [3, 5, 7, 11]))
+    novos.mascaras[1] = existentes.mascaras[4] ^ np.uint32(0b11)  # concurso 5 com outros números
+    return existentes, novos
+
+def mascara_de(base, concurso):
+    return base.mascaras[np.flatnonzero(base.concursos == concurso)[0]]
+
+@pytest.mark.parametrize('politica', list(importacao.POLITICAS))
+def test_conflitos_e_insercoes(politica):
+    existentes, novos = bases()
+    mesclagem = mesclar(existentes, novos, politica)
+    assert not mesclagem.cauda
+    assert mesclagem.iguais == 1
+    np.testing.assert_array_equal(existentes.concursos[mesclagem.atuais], [5])
+    np.testing.assert_array_equal(novos.concursos[mesclagem.importados], [5])
+    np.testing.assert_array_equal(novos.concursos[mesclagem.inseridos], [7, 11])
+
+def test_ignorar_mantem_os_atuais():
+    existentes, novos = bases()
+    mesclagem = mesclar(existentes, novos, IGNORAR)
+    base = mesclagem.base()
+    np.testing.assert_array_equal(base.concursos, np.arange(1, 12))
+    assert mascara_de(base, 5) == mascara_de(existentes, 5)
+    assert mascara_de(base, 7) == mascara_de(novos, 7)
+    assert mesclagem.alteracoes == 2 and mesclagem.sobrescritos == 0 and not mesclagem.recusada
+
+def test_sobrescrever_fica_o_importado():
+    existentes, novos = bases()
+    mesclagem = mesclar(existentes, novos, SOBRESCREVER)
+    base = mesclagem.base()
+    np.testing.assert_array_equal(base.concursos, np.arange(1, 12))
+    assert mascara_de(base, 5) == mascara_de(novos, 5)
+    assert mascara_de(base, 3) == mascara_de(existentes, 3)
+    assert mesclagem.alteracoes == 3 and mesclagem.sobrescritos == 1
+
+def test_inserir_recusa_com_conflito():
+    existentes, novos = bases()
+    mesclagem = mesclar(existentes, novos, INSERIR)
+    assert mesclagem.recusada
+    assert mesclagem.alteracoes == 0
+    assert mesclagem.resumo()['inseridos'] == 0
+
+def test_inserir_aceita_sem_conflito():
+    existentes, novos = bases()
+    sem_conflito = novos.selecionar(novos.concursos != 5)
+    mesclagem = mesclar(existentes, sem_conflito, INSERIR)
+    assert not mesclagem.recusada
+    assert mesclagem.alteracoes == 2
+    np.testing.assert_array_equal(mesclagem.base().concursos, np.arange(1, 12))
+
+def test_cauda_sem_ordenar():
+    completa = base_aleatoria(20, semente=1)
+    mesclagem = mesclar(completa.selecionar(slice(0, 15)), completa.selecionar(slice(15, 20)), IGNORAR)
+    assert mesclagem.cauda
+    np.testing.assert_array_equal(mesclagem.ordem, np.arange(20))
+    np.testing.assert_array_equal(mesclagem.base().mascaras, completa.mascaras)
+
+def test_historico_vazio():
+    novos = base_aleatoria(5, semente=2)
+    mesclagem = mesclar(BaseSorteios.vazia(), novos, INSERIR)
+    assert mesclagem.cauda and mesclagem.alteracoes == 5
+
+def test_politica_desconhecida():
+    existentes, novos = bases()
+    with pytest.raises(ValueError):
+        mesclar(existentes, novos, 'apagar')
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import base_aleatoria
+from Sistema import nucleo
+from Sistema.sorteios import mascara_de_numeros
+
+RAIZ = nucleo.__file__.rsplit('Sistema', 1)[0]
+
+@pytest.mark.parametrize('modulo', ['Sistema.nucleo', 'Sistema.cli'])
+def test_importa_sem_streamlit(modulo):
+    codigo = f"import sys, {modulo}; print(','.join(m for m in ('streamlit', 'pandas') if m in sys.modules))"
+    saida = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == ''
+
+def test_grupos_e_frequencia():
+    base = base_aleatoria(800, semente=21)
+    analise = nucleo.analise_de_base(base)
+    frequencia = analise.frequencia()
+    assert sum(frequencia.values()) == 15 * len(base)
+    grupos_melhores, grupos_piores = analise.grupos()
+    grupos = grupos_melhores + grupos_piores
+    assert sorted(num for grupo in grupos for num in grupo) == list(range(1, 26))
+    # Cada grupo dos melhores tem frequência maior ou igual à de qualquer grupo seguinte
+    for anterior, seguinte in zip(grupos, grupos[1:]):
+        assert min(frequencia[num] for num in anterior) >= max(frequencia[num] for num in seguinte)
+
+def test_padroes_do_mais_recente_ao_mais_antigo():
+    base = base_aleatoria(50, semente=22)
+    padroes = nucleo.analise_de_base(base).padroes()
+    assert len(padroes) == 50
+    assert padroes[0]['concurso'] == 50 and padroes[-1]['concurso'] == 1
+
+def sugestoes(semente):
+    analise = nucleo.analise_de_base(base_aleatoria(1500, semente=23))
+    grupos_melhores, grupos_piores = analise.grupos()
+    return nucleo.gerar_sugestoes(grupos_melhores, grupos_piores, analise.somas, n=500, top=3,
+                                  jogos_por_distribuicao=20, semente=semente)
+
+def test_sugestoes_reprodutiveis_pela_semente():
+    _, distribuicoes, jogos = sugestoes(7)
+    _, distribuicoes_de_novo, jogos_de_novo = sugestoes(7)
+    assert distribuicoes == distribuicoes_de_novo
+    assert [s['jogo'] for s in jogos] == [s['jogo'] for s in jogos_de_novo]
+    assert [s['jogo'] for s in jogos] != [s['jogo'] for s in sugestoes(8)[2]]
+
+def test_sugestoes_seguem_a_distribuicao():
+    _, distribuicoes, jogos = sugestoes(9)
+    assert len({s['chave'] for s in jogos}) == len(jogos) == sum(d['jogos'] for d in distribuicoes)
+    for s in jogos:
+        alvos = distribuicoes[s['posicao_distribuicao'] - 1]['alvos']
+        partes = [s['melhores_g1'], s['melhores_g2'], s['melhores_g3'], s['piores_g1'], s['piores_g2']]
+        assert [len(parte) for parte in partes] == list(alvos)
+        assert mascara_de_numeros(s['jogo']) == mascara_de_numeros([num for parte in partes for num in parte])
+        assert len(s['jogo']) == 15 and np.all(np.diff(s['jogo']) > 0)